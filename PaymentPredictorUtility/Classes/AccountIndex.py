@@ -0,0 +1,189 @@
+#  Copyright (C) 2022-2023 - Willem van der Schans - All Rights Reserved.
+#
+#  THE CONTENTS OF THIS PROJECT ARE PROPRIETARY AND CONFIDENTIAL.
+#  UNAUTHORIZED COPYING, TRANSFERRING OR REPRODUCTION OF THE CONTENTS OF THIS PROJECT, VIA ANY MEDIUM IS STRICTLY PROHIBITED.
+#  The receipt or possession of the source code and/or any parts thereof does not convey or imply any right to use them
+#  for any purpose other than the purpose for which they were provided to you.
+#
+#  The software is provided "AS IS", without warranty of any kind, express or implied, including but not limited to
+#  the warranties of merchantability, fitness for a particular purpose and non infringement.
+#  In no event shall the authors or copyright holders be liable for any claim, damages or other liability,
+#  whether in an action of contract, tort or otherwise, arising from, out of or in connection with the software
+#  or the use or other dealings in the software.
+#
+#  The above copyright notice and this permission notice shall be included in all copies or substantial portions of the Software.
+
+import time
+
+import numpy as np
+
+
+class AccountIndex:
+
+    def __init__(self, dataframe, keyColumn="acctrefno", sortColumn="payment_number", verbose=False):
+
+        """
+    The __init__ function builds the row index of a dataframe once. The row positions are sorted by acctrefno and
+    payment_number with a stable sort, so the rows of every account form one contiguous run in the sorted positions.
+    Only the start and stop offset of each run is stored, which means a lookup afterwards costs a binary search and
+    a slice instead of a boolean mask over the whole dataframe.
+
+    Args:
+        self: Represent the instance of the class
+        dataframe: Pass the dataframe that needs to be indexed
+        keyColumn: Specify the column that identifies the account
+        sortColumn: Specify the column the rows of an account are sorted by
+        verbose: Print out the time it takes to build the index
+
+    Returns:
+        Nothing
+
+    Doc Author:
+        Willem van der Schans, Trelent AI
+    """
+        __startTime = time.time()
+
+        keys = dataframe[keyColumn].to_numpy()
+        self.__positions = np.lexsort((dataframe[sortColumn].to_numpy(), keys))
+        self.__accounts, self.__starts, counts = np.unique(keys[self.__positions], return_index=True,
+                                                           return_counts=True)
+        self.__stops = self.__starts + counts
+
+        if verbose:
+            print(f"Index on {keyColumn} built in {round(time.time() - __startTime, 2)} seconds")
+
+    def __contains__(self, acctrefno):
+        """
+    The __contains__ function checks if an account is present in the index.
+
+    Args:
+        self: Represent the instance of the class
+        acctrefno: Identify the customer
+
+    Returns:
+        True if the account has rows in the indexed dataframe
+
+    Doc Author:
+        Willem van der Schans, Trelent AI
+    """
+        return self.__locate(acctrefno) is not None
+
+    def __len__(self):
+        """
+    The __len__ function returns the number of accounts in the index.
+
+    Args:
+        self: Represent the instance of the class
+
+    Returns:
+        The number of unique accounts
+
+    Doc Author:
+        Willem van der Schans, Trelent AI
+    """
+        return len(self.__accounts)
+
+    def getAccounts(self):
+        """
+    The getAccounts function returns every account in the index in ascending order.
+
+    Args:
+        self: Represent the instance of the class
+
+    Returns:
+        A numpy array of acctrefno values
+
+    Doc Author:
+        Willem van der Schans, Trelent AI
+    """
+        return self.__accounts
+
+    def getPositions(self, acctrefno):
+        """
+    The getPositions function returns the row positions of one account sorted by ascending payment_number. The
+    positions can be passed to iloc on the indexed dataframe or on any dataframe that shares its row order.
+
+    Args:
+        self: Represent the instance of the class
+        acctrefno: Identify the customer
+
+    Returns:
+        A numpy array of row positions, empty if the account is not in the index
+
+    Doc Author:
+        Willem van der Schans, Trelent AI
+    """
+        location = self.__locate(acctrefno)
+        if location is None:
+            return self.__positions[:0]
+        return self.__positions[self.__starts[location]:self.__stops[location]]
+
+    def getRangePositions(self, firstAcctrefno, lastAcctrefno):
+        """
+    The getRangePositions function returns the row positions of every account between two acctrefno values,
+    both included. Because the accounts are stored in sorted order this is a single contiguous slice, which makes it
+    cheap to split the dataframe into shards of whole accounts.
+
+    Args:
+        self: Represent the instance of the class
+        firstAcctrefno: Set the first account of the range
+        lastAcctrefno: Set the last account of the range
+
+    Returns:
+        A numpy array of row positions in their original row order
+
+    Doc Author:
+        Willem van der Schans, Trelent AI
+    """
+        first = np.searchsorted(self.__accounts, firstAcctrefno, side="left")
+        last = np.searchsorted(self.__accounts, lastAcctrefno, side="right")
+        if first >= last:
+            return self.__positions[:0]
+        return np.sort(self.__positions[self.__starts[first]:self.__stops[last - 1]])
+
+    def getListPositions(self, acctrefnoList):
+        """
+    The getListPositions function returns the row positions of every account in a list of accounts. The runs of the
+    accounts are looked up with one binary search for the whole list, accounts that are not in the index are
+    skipped, also when they do not fit the compacted type of the acctrefno column.
+
+    Args:
+        self: Represent the instance of the class
+        acctrefnoList: Pass the accounts that need to be looked up
+
+    Returns:
+        A numpy array of row positions in their original row order
+
+    Doc Author:
+        Willem van der Schans, Trelent AI
+    """
+        # Both sides are compared as int64, a compacted index can not hold every acctrefno that can be asked for
+        accounts = self.__accounts.astype(np.int64, copy=False)
+        accountArr = np.unique(np.asarray(acctrefnoList, dtype=np.int64))
+        location = np.searchsorted(accounts, accountArr)
+        found = location < len(accounts)
+        found[found] = accounts[location[found]] == accountArr[found]
+        location = location[found]
+
+        counts = self.__stops[location] - self.__starts[location]
+        offsets = np.repeat(self.__starts[location] - np.cumsum(counts) + counts, counts) + np.arange(counts.sum())
+        return np.sort(self.__positions[offsets])
+
+    def __locate(self, acctrefno):
+        """
+    The __locate function finds where an account sits in the sorted list of accounts.
+
+    Args:
+        self: Represent the instance of the class
+        acctrefno: Identify the customer
+
+    Returns:
+        The location of the account or None if the account is not in the index
+
+    Doc Author:
+        Willem van der Schans, Trelent AI
+    """
+        location = np.searchsorted(self.__accounts, acctrefno)
+        if location < len(self.__accounts) and self.__accounts[location] == acctrefno:
+            return location
+        return None
@@ -0,0 +1,449 @@
+#  Copyright (C) 2022-2023 - Willem van der Schans - All Rights Reserved.
+#
+#  THE CONTENTS OF THIS PROJECT ARE PROPRIETARY AND CONFIDENTIAL.
+#  UNAUTHORIZED COPYING, TRANSFERRING OR REPRODUCTION OF THE CONTENTS OF THIS PROJECT, VIA ANY MEDIUM IS STRICTLY PROHIBITED.
+#  The receipt or possession of the source code and/or any parts thereof does not convey or imply any right to use them
+#  for any purpose other than the purpose for which they were provided to you.
+#
+#  The software is provided "AS IS", without warranty of any kind, express or implied, including but not limited to
+#  the warranties of merchantability, fitness for a particular purpose and non infringement.
+#  In no event shall the authors or copyright holders be liable for any claim, damages or other liability,
+#  whether in an action of contract, tort or otherwise, arising from, out of or in connection with the software
+#  or the use or other dealings in the software.
+#
+#  The above copyright notice and this permission notice shall be included in all copies or substantial portions of the Software.
+
+import datetime
+import hashlib
+import json
+import os
+import time
+from pathlib import Path
+
+import pandas as pd
+
+from PaymentPredictorUtility.Classes.DataPrep import DataCleaner, dataMLPrep
+from PaymentPredictorUtility.Classes.ModelCreation import dataScaler, machineLearner
+from PaymentPredictorUtility.Classes.dataFrameLoader import dataFrameLoader
+from PaymentPredictorUtility.Classes.modelLoader import modelLoader
+from PaymentPredictorUtility.Functions.Fingerprint import fileFingerprint
+
+
+class ArtifactGraph:
+
+    def __init__(self, docPath, verbose=False):
+
+        """
+    The __init__ function sets up the dependency graph of the files in the Data folder. tblXmain_transactions is
+    cleaned into dfClean, dfClean is encoded into dfDummy, dfTarget and the encoder registry, dfDummy is used to fit
+    the scaler and the scaled dfDummy and dfTarget are used to train the model. Every stage writes a manifest to the
+    Data/Manifests folder with the files it created and the content hash of every input file and its parameters. A
+    stage is out of date when one of those hashes changed or when one of its files is missing. Files that were
+    created outside of the graph, by hand or from the menu, are adopted with the inputs they have at that moment, and
+    a csv input that was converted to parquet counts as unchanged. File hashes are cached by size and modification
+    time, so a start without changes only reads the directory.
+
+    Args:
+        self: Represent the instance of the class
+        docPath: Specify the AvidPaymentPredictor folder
+        verbose: Print out the stages that are rebuilt and the time they take
+
+    Returns:
+        Nothing
+
+    Doc Author:
+        Willem van der Schans, Trelent AI
+    """
+        self.__dataPath = Path(docPath).joinpath("Data")
+        self.__manifestPath = self.__dataPath.joinpath("Manifests")
+        self.__docPath = Path(docPath)
+        self.__verbose = verbose
+        self.__scaledDf = None
+
+        self.__stageDict = {"dfClean": {"inputs": ["tblXmain_transactions"], "outputs": ["dfClean"]},
+                            "dfDummy": {"inputs": ["dfClean"], "outputs": ["dfDummy", "dfTarget", "encoder"]},
+                            "scaler": {"inputs": ["dfDummy"], "outputs": ["scaler"]},
+                            "model": {"inputs": ["dfDummy", "dfTarget", "scaler"], "outputs": ["model"]}}
+
+        os.makedirs(self.__manifestPath, exist_ok=True)
+        self.__hashCache = self.__readJson(self.__manifestPath.joinpath("FileHashes.json")) or {}
+
+    def staleStages(self, paramGrid=None):
+        """
+    The staleStages function lists the stages that are out of date. A stage that depends on an out of date stage is
+    listed as well, even though the build can still skip it when the rebuilt files turn out to be identical.
+
+    Args:
+        self: Represent the instance of the class
+        paramGrid: Pass the parameter grid the model should be trained with, None accepts the current model
+
+    Returns:
+        A list of stage names in build order
+
+    Doc Author:
+        Willem van der Schans, Trelent AI
+    """
+        staleList = []
+        for stage in self.__stageDict.keys():
+            if self.__isStale(stage, paramGrid, staleList):
+                staleList.append(stage)
+
+        self.__writeHashCache()
+        return staleList
+
+    def build(self, paramGrid=None, force=False):
+        """
+    The build function rebuilds every out of date stage in order. Each stage is checked again right before it would
+    run, so a stage whose inputs came out of the upstream rebuild unchanged is skipped. With force every stage is
+    rebuilt.
+
+    Args:
+        self: Represent the instance of the class
+        paramGrid: Pass optimal, fast or a dictionary with the parameter grid, None reuses the grid of the current
+            model
+        force: Rebuild every stage, also the stages that are up to date
+
+    Returns:
+        A list of the stages that were rebuilt
+
+    Doc Author:
+        Willem van der Schans, Trelent AI
+    """
+        rebuiltList = []
+        for stage in self.__stageDict.keys():
+            if not force and not self.__isStale(stage, paramGrid):
+                continue
+
+            __startTime = time.time()
+            params = self.__buildStage(stage, paramGrid)
+            self.__recordStage(stage, params)
+            rebuiltList.append(stage)
+
+            if self.__verbose:
+                print(f"Stage {stage} rebuilt in {round(time.time() - __startTime, 2)} seconds")
+
+        self.__scaledDf = None
+        self.__writeHashCache()
+        return rebuiltList
+
+    def artifactKey(self, fileNameList, *params):
+        """
+    The artifactKey function identifies a set of files in the Data folder by their names and content hashes. The
+    hashes come from the same cache the stages use, so files that did not change since they were last hashed are not
+    read again.
+
+    Args:
+        self: Represent the instance of the class
+        fileNameList: Pass the names of the files in the Data folder
+        *params: Pass any settings that belong to the key as well
+
+    Returns:
+        A hexadecimal sha256 string
+
+    Doc Author:
+        Willem van der Schans, Trelent AI
+    """
+        keyList = [f"{fileName}:{self.__fileHash(fileName)}" for fileName in fileNameList]
+        self.__writeHashCache()
+        return hashlib.sha256("|".join(keyList + [str(param) for param in params]).encode()).hexdigest()
+
+    def __isStale(self, stage, paramGrid=None, staleList=()):
+        """
+    The __isStale function checks one stage against its manifest. A stage without a manifest, or whose latest files
+    are not the files in its manifest, is out of date when one of its inputs is newer than one of its files and is
+    adopted as up to date otherwise. Files that were only converted from csv to parquet count as the same files.
+
+    Args:
+        self: Represent the instance of the class
+        stage: Specify the stage
+        paramGrid: Pass the parameter grid the model should be trained with
+        staleList: Pass the stages that are already known to be out of date
+
+    Returns:
+        True if the stage needs to be rebuilt
+
+    Doc Author:
+        Willem van der Schans, Trelent AI
+    """
+        outputDict = {name: self.__latestFile(name) for name in self.__stageDict[stage]["outputs"]}
+        if None in outputDict.values():
+            return True
+        if any(name in staleList for name in self.__stageDict[stage]["inputs"]):
+            return True
+
+        manifest = self.__readJson(self.__manifestPath.joinpath(f"{stage}.json"))
+        if manifest is None or any(value["file"] != outputDict.get(name) and
+                                   not self.__isConverted(value["file"], outputDict.get(name))
+                                   for name, value in manifest["outputs"].items()):
+            if self.__isNewer(stage):
+                return True
+            self.__recordStage(stage, {"paramGrid": None} if stage == "model" else {})
+            return False
+
+        inputDict = self.__inputHashes(stage)
+        for name, fileHash in inputDict.items():
+            if manifest["inputs"].get(name) != fileHash and \
+                    not self.__isConverted(manifest.get("inputFiles", {}).get(name), self.__latestFile(name)):
+                return True
+        if stage == "model" and paramGrid is not None and manifest["params"]["paramGrid"] != paramGrid:
+            return True
+
+        if inputDict != manifest["inputs"] or \
+                {name: value["file"] for name, value in manifest["outputs"].items()} != outputDict:
+            self.__recordStage(stage, manifest["params"])
+        return False
+
+    def __buildStage(self, stage, paramGrid):
+        """
+    The __buildStage function runs one stage on the latest input files. The scaled dfDummy of the scaler stage is kept
+    for the model stage of the same build.
+
+    Args:
+        self: Represent the instance of the class
+        stage: Specify the stage
+        paramGrid: Pass the parameter grid of the model stage
+
+    Returns:
+        The parameters of the stage
+
+    Doc Author:
+        Willem van der Schans, Trelent AI
+    """
+        runStamp = datetime.datetime.today().strftime('%m%d%Y_%H%M%S')
+
+        if stage == "dfClean":
+            DataCleaner(self.__latestFile("tblXmain_transactions"), f"dfClean{runStamp}.parquet", "Data",
+                        path=self.__docPath, verbose=self.__verbose)
+            return {}
+
+        elif stage == "dfDummy":
+            dataMLPrep(self.__latestFile("dfClean"), f"dfDummy{runStamp}.parquet", f"dfTarget{runStamp}.parquet",
+                       "Data", self.__docPath, verbose=self.__verbose, exportEncoderName=f"encoder{runStamp}.sav")
+            return {}
+
+        elif stage == "scaler":
+            scalerObj = dataScaler(self.__latestFile("dfDummy"), f"scaler{runStamp}.sav", self.__docPath, "Data")
+            self.__scaledDf = scalerObj.scaledDf
+            return {}
+
+        if paramGrid is None:
+            manifest = self.__readJson(self.__manifestPath.joinpath("model.json"))
+            paramGrid = "fast" if manifest is None or manifest["params"]["paramGrid"] is None \
+                else manifest["params"]["paramGrid"]
+
+        if self.__scaledDf is None:
+            dfDummy = dataFrameLoader(self.__latestFile("dfDummy"), self.__docPath, "Data", memoryMap=True).getDf()
+            scaler = modelLoader(self.__latestFile("scaler"), self.__docPath, "Data").getModel()
+            self.__scaledDf = pd.DataFrame(data=scaler.transform(dfDummy), columns=list(dfDummy.keys()))
+
+        machineLearner(self.__scaledDf, self.__latestFile("dfTarget"), f"model{runStamp}.sav", self.__docPath,
+                       ParamGrid=paramGrid, Folder="Data")
+        return {"paramGrid": paramGrid}
+
+    def __isNewer(self, stage):
+        """
+    The __isNewer function checks if the latest file of an input of a stage was created or changed after one of the
+    files of the stage. The later of the creation and the modification time counts, so a file that was copied into
+    the Data folder with an old modification time still counts as new.
+
+    Args:
+        self: Represent the instance of the class
+        stage: Specify the stage
+
+    Returns:
+        True if an input is newer than a file of the stage
+
+    Doc Author:
+        Willem van der Schans, Trelent AI
+    """
+        inputTimes = [self.__fileTime(self.__latestFile(name)) for name in self.__stageDict[stage]["inputs"]
+                      if self.__latestFile(name) is not None]
+        outputTimes = [self.__fileTime(self.__latestFile(name)) for name in self.__stageDict[stage]["outputs"]]
+        return len(inputTimes) > 0 and max(inputTimes) > min(outputTimes)
+
+    def __fileTime(self, fileName):
+        """
+    The __fileTime function returns the later of the creation and the modification time of a file in the Data
+    folder.
+
+    Args:
+        self: Represent the instance of the class
+        fileName: Specify the file
+
+    Returns:
+        The time in seconds
+
+    Doc Author:
+        Willem van der Schans, Trelent AI
+    """
+        fileStat = os.stat(self.__dataPath.joinpath(fileName))
+        return max(fileStat.st_ctime, fileStat.st_mtime)
+
+    def __recordStage(self, stage, params):
+        """
+    The __recordStage function writes the manifest of a stage with its latest files, the hashes of its inputs and its
+    parameters.
+
+    Args:
+        self: Represent the instance of the class
+        stage: Specify the stage
+        params: Pass the parameters the stage was built with
+
+    Returns:
+        Nothing
+
+    Doc Author:
+        Willem van der Schans, Trelent AI
+    """
+        outputDict = {}
+        for name in self.__stageDict[stage]["outputs"]:
+            fileName = self.__latestFile(name)
+            outputDict[name] = {"file": fileName, "hash": self.__fileHash(fileName)}
+
+        manifest = {"stage": stage,
+                    "built": datetime.datetime.now().strftime('%m%d%Y_%H%M%S'),
+                    "inputs": self.__inputHashes(stage),
+                    "inputFiles": {name: self.__latestFile(name) for name in self.__stageDict[stage]["inputs"]},
+                    "params": params,
+                    "outputs": outputDict}
+
+        self.__writeJson(self.__manifestPath.joinpath(f"{stage}.json"), manifest)
+
+    def __inputHashes(self, stage):
+        """
+    The __inputHashes function hashes the latest file of every input of a stage.
+
+    Args:
+        self: Represent the instance of the class
+        stage: Specify the stage
+
+    Returns:
+        A dictionary with the hash of every input, None for a missing input
+
+    Doc Author:
+        Willem van der Schans, Trelent AI
+    """
+        return {name: self.__fileHash(self.__latestFile(name)) for name in self.__stageDict[stage]["inputs"]}
+
+    def __fileHash(self, fileName):
+        """
+    The __fileHash function returns the content hash of a file in the Data folder. The hash is only computed when the
+    size or the modification time of the file changed since it was last hashed.
+
+    Args:
+        self: Represent the instance of the class
+        fileName: Specify the file
+
+    Returns:
+        A hexadecimal sha256 string or None when there is no file
+
+    Doc Author:
+        Willem van der Schans, Trelent AI
+    """
+        if fileName is None:
+            return None
+
+        fileStat = os.stat(self.__dataPath.joinpath(fileName))
+        cacheKey = [fileStat.st_size, fileStat.st_mtime_ns]
+        if fileName not in self.__hashCache or self.__hashCache[fileName][:2] != cacheKey:
+            self.__hashCache[fileName] = cacheKey + [fileFingerprint(self.__dataPath.joinpath(fileName))]
+
+        return self.__hashCache[fileName][2]
+
+    @staticmethod
+    def __isConverted(previousFile, currentFile):
+        """
+    The __isConverted function checks if an input or output only changed because its csv file was converted to a
+    parquet file with the same name. The conversion keeps the data, so it does not make the stage out of date.
+
+    Args:
+        previousFile: Pass the file in the manifest
+        currentFile: Pass the latest file
+
+    Returns:
+        True if currentFile is the parquet version of previousFile
+
+    Doc Author:
+        Willem van der Schans, Trelent AI
+    """
+        if previousFile is None or currentFile is None:
+            return False
+        return Path(previousFile).suffix == ".csv" and Path(previousFile).with_suffix(".parquet").name == currentFile
+
+    def __latestFile(self, name):
+        """
+    The __latestFile function returns the latest file in the Data folder that contains name, the same file the
+    directoryScanner picks when manual inputs are skipped. A parquet data set that is stored as a folder of parts
+    counts as a file.
+
+    Args:
+        self: Represent the instance of the class
+        name: Specify the name to search for
+
+    Returns:
+        The name of the latest matching file or None
+
+    Doc Author:
+        Willem van der Schans, Trelent AI
+    """
+        fileList = [(file.stat().st_ctime, file.name) for file in os.scandir(self.__dataPath)
+                    if (file.is_file() or file.name.endswith(".parquet")) and name.lower() in file.name.lower()]
+        if len(fileList) == 0:
+            return None
+        return max(fileList)[1]
+
+    def __writeHashCache(self):
+        """
+    The __writeHashCache function saves the file hash cache and drops the entries of files that no longer exist.
+
+    Args:
+        self: Represent the instance of the class
+
+    Returns:
+        Nothing
+
+    Doc Author:
+        Willem van der Schans, Trelent AI
+    """
+        self.__hashCache = {key: value for key, value in self.__hashCache.items()
+                            if self.__dataPath.joinpath(key).exists()}
+        self.__writeJson(self.__manifestPath.joinpath("FileHashes.json"), self.__hashCache)
+
+    @staticmethod
+    def __readJson(filePath):
+        """
+    The __readJson function reads a json file and returns None when it does not exist or cannot be read.
+
+    Args:
+        filePath: Specify the json file
+
+    Returns:
+        The content of the file or None
+
+    Doc Author:
+        Willem van der Schans, Trelent AI
+    """
+        try:
+            with open(filePath, "r") as jsonFile:
+                return json.load(jsonFile)
+        except (OSError, ValueError):
+            return None
+
+    @staticmethod
+    def __writeJson(filePath, content):
+        """
+    The __writeJson function writes a json file under a temporary name and renames it when it is complete.
+
+    Args:
+        filePath: Specify the json file
+        content: Pass the content of the file
+
+    Returns:
+        Nothing
+
+    Doc Author:
+        Willem van der Schans, Trelent AI
+    """
+        with open(f"{filePath}.tmp", "w") as jsonFile:
+            json.dump(content, jsonFile, indent=4)
+        os.replace(f"{filePath}.tmp", filePath)
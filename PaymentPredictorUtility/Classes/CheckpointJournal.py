@@ -0,0 +1,141 @@
+#  Copyright (C) 2022-2023 - Willem van der Schans - All Rights Reserved.
+#
+#  THE CONTENTS OF THIS PROJECT ARE PROPRIETARY AND CONFIDENTIAL.
+#  UNAUTHORIZED COPYING, TRANSFERRING OR REPRODUCTION OF THE CONTENTS OF THIS PROJECT, VIA ANY MEDIUM IS STRICTLY PROHIBITED.
+#  The receipt or possession of the source code and/or any parts thereof does not convey or imply any right to use them
+#  for any purpose other than the purpose for which they were provided to you.
+#
+#  The software is provided "AS IS", without warranty of any kind, express or implied, including but not limited to
+#  the warranties of merchantability, fitness for a particular purpose and non infringement.
+#  In no event shall the authors or copyright holders be liable for any claim, damages or other liability,
+#  whether in an action of contract, tort or otherwise, arising from, out of or in connection with the software
+#  or the use or other dealings in the software.
+#
+#  The above copyright notice and this permission notice shall be included in all copies or substantial portions of the Software.
+
+import os
+from pathlib import Path
+
+
+class CheckpointJournal:
+
+    def __init__(self, outputPath, fingerprint, runStamp, chunkSize):
+
+        """
+    The __init__ function opens the checkpoint journal of a full run. The journal is a small text file in the
+    Output/Checkpoints folder named after the fingerprint of the data and the model. Its first line holds the
+    runStamp and chunkSize of the run and every following line the number of a batch whose results are on disk.
+    When a journal for the same fingerprint exists and the folder of its run is still there, the journal is resumed
+    and its runStamp and chunkSize replace the ones that were passed in. Otherwise a new journal is started.
+
+    Args:
+        self: Represent the instance of the class
+        outputPath: Specify the output folder
+        fingerprint: Identify the data and the model of the run
+        runStamp: Set the runStamp of a new run
+        chunkSize: Set the number of accounts in one batch of a new run
+
+    Returns:
+        Nothing
+
+    Doc Author:
+        Willem van der Schans, Trelent AI
+    """
+        self.runStamp = runStamp
+        self.chunkSize = chunkSize
+        self.completedSet = set()
+        self.resumed = False
+
+        self.__journalPath = Path(outputPath).joinpath("Checkpoints").joinpath(f"Journal{fingerprint[:32]}.txt")
+        os.makedirs(self.__journalPath.parent, exist_ok=True)
+
+        if self.__journalPath.exists():
+            self.__readJournal(Path(outputPath))
+
+        if not self.resumed:
+            with open(self.__journalPath, "w") as journalFile:
+                journalFile.write(f"{self.runStamp},{self.chunkSize}\n")
+                journalFile.flush()
+                os.fsync(journalFile.fileno())
+
+    def isComplete(self, batchNumber):
+        """
+    The isComplete function checks if the results of a batch were already written by an earlier attempt of the run.
+
+    Args:
+        self: Represent the instance of the class
+        batchNumber: Identify the batch
+
+    Returns:
+        True if the batch can be skipped
+
+    Doc Author:
+        Willem van der Schans, Trelent AI
+    """
+        return batchNumber in self.completedSet
+
+    def record(self, batchNumber):
+        """
+    The record function appends a completed batch to the journal. The line is synced to disk before the function
+    returns, so a batch is never recorded before its results are on disk and never lost after.
+
+    Args:
+        self: Represent the instance of the class
+        batchNumber: Identify the batch
+
+    Returns:
+        Nothing
+
+    Doc Author:
+        Willem van der Schans, Trelent AI
+    """
+        with open(self.__journalPath, "a") as journalFile:
+            journalFile.write(f"{batchNumber}\n")
+            journalFile.flush()
+            os.fsync(journalFile.fileno())
+        self.completedSet.add(batchNumber)
+
+    def close(self):
+        """
+    The close function removes the journal once the run has finished, so the next run starts from scratch.
+
+    Args:
+        self: Represent the instance of the class
+
+    Returns:
+        Nothing
+
+    Doc Author:
+        Willem van der Schans, Trelent AI
+    """
+        if self.__journalPath.exists():
+            os.remove(self.__journalPath)
+
+    def __readJournal(self, outputPath):
+        """
+    The __readJournal function reads an existing journal. A line that was cut off by a crash is ignored, the batch it
+    belonged to is simply scored again.
+
+    Args:
+        self: Represent the instance of the class
+        outputPath: Check if the folder of the journaled run still exists
+
+    Returns:
+        Nothing
+
+    Doc Author:
+        Willem van der Schans, Trelent AI
+    """
+        with open(self.__journalPath, "r") as journalFile:
+            lineList = journalFile.read().split("\n")
+
+        header = lineList[0].split(",")
+        if len(header) != 2 or not header[1].isdigit():
+            return
+        if not outputPath.joinpath(f"Full{header[0]}").exists():
+            return
+
+        self.runStamp = header[0]
+        self.chunkSize = int(header[1])
+        self.completedSet = {int(line) for line in lineList[1:-1] if line.isdigit()}
+        self.resumed = True
@@ -0,0 +1,89 @@
+#  Copyright (C) 2022-2023 - Willem van der Schans - All Rights Reserved.
+#
+#  THE CONTENTS OF THIS PROJECT ARE PROPRIETARY AND CONFIDENTIAL.
+#  UNAUTHORIZED COPYING, TRANSFERRING OR REPRODUCTION OF THE CONTENTS OF THIS PROJECT, VIA ANY MEDIUM IS STRICTLY PROHIBITED.
+#  The receipt or possession of the source code and/or any parts thereof does not convey or imply any right to use them
+#  for any purpose other than the purpose for which they were provided to you.
+#
+#  The software is provided "AS IS", without warranty of any kind, express or implied, including but not limited to
+#  the warranties of merchantability, fitness for a particular purpose and non infringement.
+#  In no event shall the authors or copyright holders be liable for any claim, damages or other liability,
+#  whether in an action of contract, tort or otherwise, arising from, out of or in connection with the software
+#  or the use or other dealings in the software.
+#
+#  The above copyright notice and this permission notice shall be included in all copies or substantial portions of the Software.
+
+import numpy as np
+
+from PaymentPredictorUtility.Classes.PortfolioScorer import PortfolioScorer
+
+
+class CustomerResult:
+    __slots__ = ("acctrefno", "accuracy", "certainty", "paymentPrediction", "nextPaymentProbability",
+                 "paymentCodes")
+
+    def __init__(self, acctrefno, dfClean, dfTarget, dfDummies, Model, Scaler, cleanIndex=None, dummyIndex=None):
+
+        """
+    The __init__ function scores a single customer and keeps only the result. The rows of the customer are taken by
+    position and scored with the PortfolioScorer, so a single account gets exactly the accuracy, certainty,
+    paymentPrediction, nextPaymentProbability and paymentCodes of a full run. The shared dataframes are only read,
+    so the record can be created from several threads on the same dataframes.
+
+    Args:
+        self: Represent the instance of the class
+        acctrefno: Identify the customer
+        dfClean: Get the payment numbers and payment codes of the customer
+        dfTarget: Get the target dataframe
+        dfDummies: Get the dummy variables of the customer
+        Model: Pass the model that is used to predict
+        Scaler: Scale the data
+        cleanIndex: Look up the rows of the customer in dfClean without scanning the whole dataframe
+        dummyIndex: Look up the rows of the customer in dfDummies without scanning the whole dataframe
+
+    Returns:
+        Nothing
+
+    Doc Author:
+        Willem van der Schans, Trelent AI
+    """
+        self.acctrefno = acctrefno
+
+        if cleanIndex is not None:
+            cleanPositions = np.sort(cleanIndex.getPositions(acctrefno))
+        else:
+            cleanPositions = np.flatnonzero(dfClean["acctrefno"].to_numpy() == acctrefno)
+        if dummyIndex is not None:
+            dummyPositions = np.sort(dummyIndex.getPositions(int(acctrefno)))
+        else:
+            dummyPositions = np.flatnonzero(dfDummies["acctrefno"].to_numpy() == int(acctrefno))
+
+        if len(dummyPositions) == 0:
+            raise ValueError(f"No dummy rows found for acctrefno {acctrefno}")
+
+        scorerObj = PortfolioScorer(dfClean.iloc[cleanPositions], dfTarget, dfDummies.iloc[dummyPositions], Model,
+                                    Scaler)
+        if acctrefno in scorerObj.ErrorDict:
+            raise scorerObj.ErrorDict[acctrefno]
+        if acctrefno not in scorerObj.customerDict:
+            raise ValueError(f"Acctrefno {acctrefno} not found in database")
+
+        (self.accuracy, self.certainty, self.paymentPrediction, self.nextPaymentProbability,
+         self.paymentCodes) = scorerObj.customerDict[acctrefno]
+
+    def toList(self):
+        """
+    The toList function returns the result in the layout of a row of the customerDict, the Accuracy, Certainty,
+    Prediction, Payment Probability and Payment Codes of the customer.
+
+    Args:
+        self: Represent the instance of the class
+
+    Returns:
+        A list with the result of the customer
+
+    Doc Author:
+        Willem van der Schans, Trelent AI
+    """
+        return [self.accuracy, self.certainty, self.paymentPrediction, self.nextPaymentProbability,
+                self.paymentCodes]
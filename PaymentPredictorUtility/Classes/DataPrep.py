@@ -13,21 +13,39 @@
 #
 #  The above copyright notice and this permission notice shall be included in all copies or substantial portions of the Software.
 
+import numpy as np
 import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+from pyarrow import csv
+import pickle
 import time
-from sklearn.preprocessing import LabelEncoder
-from PaymentPredictorUtility.Functions.Func import dateConvert
+from pathlib import Path
+from PaymentPredictorUtility.Classes.modelLoader import modelLoader
+from PaymentPredictorUtility.Functions.Func import appendFrame, dateConvert, partPaths, readFrame, writeFrame
 
 
 class DataCleaner:
 
-    def __init__(self, inputFileName, ExportFileName, folder=None, path=None, verbose=False):
+    stageList = ["selection", "types", "dates", "nullColumns", "nullRows", "compaction", "export"]
+    keyColumns = ["acctrefno", "payment_number", "transaction_code"]
+
+    def __init__(self, inputFileName, ExportFileName, folder=None, path=None, verbose=False, chunkSize=None,
+                 stageList=None, previousName=None):
 
         """
     The __init__ function is the first function that runs when an object of this class is created.
     It takes in a file name, and exports a cleaned version of the dataframe to another csv file.
     The __init__ function also has optional parameters for folder and path, which are used if you want to specify where
     the inputFileName is located or where you want your output CSV file to be saved.
+    The cleaning runs as a pipeline of the stages in stageList, every stage is timed and its rows and memory are
+    counted in stageDf. With chunkSize the input file is cleaned in chunks of that many rows instead of being read
+    as a whole, the cleaned dataframe is the same.
+    With previousName the cleaning is incremental: only the selected payments whose keyColumns are not in the
+    previous dfClean are cleaned, with the columns of the previous dfClean, and they are appended to it as a new part
+    saved under ExportFileName. df then holds only the new rows. Rows that changed or disappeared are not updated.
 
     Args:
         self: Represent the instance of the class
@@ -35,7 +53,10 @@ class DataCleaner:
         ExportFileName: Specify the name of the file that will be exported
         folder: Specify the folder in which the input file is located
         path: Specify the path to the folder containing the data
-        verbose: Print the number of rows and columns deleted at each step
+        verbose: Print the stage report and the memory every stage uses
+        chunkSize: Set the number of rows that are read at once, defaults to reading the whole file
+        stageList: Specify the order of the cleaning stages, defaults to DataCleaner.stageList
+        previousName: Specify the dfClean file the new rows are appended to, defaults to cleaning every row
 
     Returns:
         Nothing
@@ -45,6 +66,27 @@ class DataCleaner:
     """
         self.__exportFileName = ExportFileName
         self.__folder = folder
+        self.__verbose = verbose
+        self.__selectorList = [('transaction_code', [204, 206]),
+                               ('transaction_description', ["P+I Principal Payment", "P+I Interest Payment"])]
+        self.__nullThreshold = 0.1
+        self.__stageDict = {"selection": self.__selectionStage,
+                            "nullColumns": self.__nullColumnStage,
+                            "types": self.__typeStage,
+                            "dates": self.__dateStage,
+                            "nullRows": self.__nullRowStage,
+                            "compaction": self.__compactionStage,
+                            "export": self.__exportStage}
+        self.__stageLog = {}
+        self.__keepList = None
+        self.__typeDict = None
+        self.__keyLevels = None
+        self.__previousPath = None
+        self.schema = None
+
+        if stageList is None:
+            stageList = DataCleaner.stageList
+        self.__stageChecker(stageList)
 
         if path is not None:
             self.__Path = str(path) + "/"
@@ -52,106 +94,295 @@ class DataCleaner:
             self.__Path = ""
 
         if folder is not None:
-            self.df = pd.read_csv(f"{self.__Path}{folder}/{inputFileName}", low_memory=False)
+            inputPath = f"{self.__Path}{folder}/{inputFileName}"
         else:
-            self.df = pd.read_csv(f"{self.__Path}{inputFileName}", low_memory=False)
+            inputPath = f"{self.__Path}{inputFileName}"
 
-        __timestart = time.time()
-        __counter = 1
+        self.__datasetOpener(inputPath)
 
-        if verbose:
-            __sizeSave = self.df.shape
-            self.__dataSelector('transaction_code', [204, 206])
-            print(f"{abs(__sizeSave[0] - self.df.shape[0])} rows have been deleted in payment selection")
+        if previousName is not None:
+            if folder is not None:
+                self.__previousPath = f"{self.__Path}{folder}/{previousName}"
+            else:
+                self.__previousPath = f"{self.__Path}{previousName}"
+            self.__keyIndexer(readFrame(self.__previousPath, columns=DataCleaner.keyColumns))
+            previousColumns = pq.read_schema(partPaths(Path(self.__previousPath).with_suffix(".parquet"))[0]).names
+            self.__keepList = [colName for colName in self.__dataset.schema.names if colName in previousColumns]
+
+        if chunkSize is not None:
+            self.df = self.__streamCleaner(stageList, max(int(chunkSize), 1))
         else:
-            self.__dataSelector('transaction_code', [204, 206])
+            data = None
+            for stageName in stageList:
+                data = self.__stageRunner(stageName, data)
+            self.df = data
+
+        self.stageDf = pd.DataFrame.from_dict(self.__stageLog, orient="index",
+                                              columns=["Seconds", "Rows In", "Rows Out", "Memory In (MB)",
+                                                       "Memory Out (MB)"])
+        self.stageDf["Memory Delta (MB)"] = self.stageDf["Memory Out (MB)"] - self.stageDf["Memory In (MB)"]
+        self.stageDf.index.name = "Stage"
 
         if verbose:
-            __sizeSave = self.df.shape
-            self.__dataSelector('transaction_description', ["P+I Principal Payment", "P+I Interest Payment"])
-            print(f"{abs(__sizeSave[0] - self.df.shape[0])} rows have been deleted in payment cleaning")
+            print(self.stageDf.round(2).to_string())
+
+    def __stageChecker(self, stageList):
+        """
+    The __stageChecker function checks that a stage order can run. The selection reads the file and has to come
+    first, the types stage converts the scanned table to a dataframe and has to come before the stages that need
+    one, and the compaction and export stages work on the whole cleaned dataframe and have to come last. The null
+    column stage works on both and can run anywhere after the selection.
+
+    Args:
+        self: Represent the instance of the class
+        stageList: Pass the order of the cleaning stages
+
+    Returns:
+        Nothing, a ValueError is raised for an order that cannot run
+
+    Doc Author:
+        Willem van der Schans, Trelent AI
+    """
+        unknownList = [stageName for stageName in stageList if stageName not in self.__stageDict]
+        if unknownList:
+            raise ValueError(f"Unknown cleaning stages {unknownList}, choose from {list(self.__stageDict)}")
+
+        if len(set(stageList)) != len(stageList):
+            raise ValueError(f"Every cleaning stage can only run once, got {stageList}")
+
+        if len(stageList) == 0 or stageList[0] != "selection" or "types" not in stageList:
+            raise ValueError(f"The cleaning stages have to start with selection and include types, got {stageList}")
+
+        for stageName in ["dates", "nullRows", "compaction", "export"]:
+            if stageName in stageList and stageList.index(stageName) < stageList.index("types"):
+                raise ValueError(f"The {stageName} stage needs a dataframe and has to come after types")
+
+        frameList = [stageName for stageName in stageList if stageName in ["compaction", "export"]]
+        if stageList[len(stageList) - len(frameList):] != frameList:
+            raise ValueError("The compaction and export stages have to come after all other cleaning stages")
+
+    def __stageRunner(self, stageName, data):
+        """
+    The __stageRunner function runs one cleaning stage on data and adds its wall time, rows in and out and memory in
+    and out to the stage log. The memory of text columns can only be measured by visiting every value, so it is
+    only measured in verbose mode and outside of the stage time.
+
+    Args:
+        self: Represent the instance of the class
+        stageName: Specify the stage that runs
+        data: Pass the scanned table or the dataframe the stage works on, None for the selection
+
+    Returns:
+        The table or dataframe the stage returns
+
+    Doc Author:
+        Willem van der Schans, Trelent AI
+    """
+        if data is None and self.__verbose:
+            rowsIn = self.__dataset.count_rows()
         else:
-            self.__dataSelector('transaction_description', ["P+I Principal Payment", "P+I Interest Payment"])
+            rowsIn = self.__rowCounter(data)
+        memoryIn = self.__memoryCounter(data)
 
-        if verbose:
-            self.df = dateConvert(self.df)
-            print("dates successfully converted from string to datetime format")
+        startTime = time.time()
+        data = self.__stageDict[stageName](data)
+        stageTime = time.time() - startTime
+
+        self.__stageLogger(stageName, stageTime, rowsIn, self.__rowCounter(data), memoryIn,
+                           self.__memoryCounter(data))
+
+        return data
+
+    def __stageLogger(self, stageName, stageTime, rowsIn, rowsOut, memoryIn, memoryOut):
+        """
+    The __stageLogger function adds the numbers of one run of a stage to the stage log. A stage that runs once for
+    every chunk adds up over the chunks.
+
+    Args:
+        self: Represent the instance of the class
+        stageName: Specify the stage that ran
+        stageTime: Pass the wall time of the run in seconds
+        rowsIn: Pass the number of rows that went in
+        rowsOut: Pass the number of rows that came out
+        memoryIn: Pass the memory of the data that went in in MB
+        memoryOut: Pass the memory of the data that came out in MB
+
+    Returns:
+        Nothing
+
+    Doc Author:
+        Willem van der Schans, Trelent AI
+    """
+        valueList = [stageTime, rowsIn, rowsOut, memoryIn, memoryOut]
+        if stageName in self.__stageLog:
+            self.__stageLog[stageName] = [logged + value for logged, value in zip(self.__stageLog[stageName],
+                                                                                   valueList)]
         else:
-            self.df = dateConvert(self.df)
+            self.__stageLog[stageName] = valueList
 
-        if verbose:
-            x = self.df.shape
-            self.__nullColumnDropper(0.1)
-            print(f"{abs(x[1] - self.df.shape[1])} columns have been deleted while dropping columns containing Null "
-                  f"values")
+    @staticmethod
+    def __rowCounter(data):
+        """
+    The __rowCounter function counts the rows of a scanned table or a dataframe.
+
+    Args:
+        data: Pass the table or dataframe
+
+    Returns:
+        The number of rows, NaN when there is no data yet
+
+    Doc Author:
+        Willem van der Schans, Trelent AI
+    """
+        if data is None:
+            return np.nan
+        elif isinstance(data, pa.Table):
+            return data.num_rows
         else:
-            self.__nullColumnDropper(0.1)
+            return len(data)
 
-        if verbose:
-            __sizeSave = self.df.shape
-            self.__nullRowDropper()
-            print(f"{abs(__sizeSave[0] - self.df.shape[0])} rows have been deleted while dropping rows containing "
-                  f"null values")
+    def __memoryCounter(self, data):
+        """
+    The __memoryCounter function measures the memory of a scanned table or a dataframe in MB, including the text
+    values of object columns. Outside of verbose mode it returns NaN.
+
+    Args:
+        self: Represent the instance of the class
+        data: Pass the table or dataframe
+
+    Returns:
+        The memory of the data in MB
+
+    Doc Author:
+        Willem van der Schans, Trelent AI
+    """
+        if not self.__verbose:
+            return np.nan
+        elif data is None:
+            return 0
+        elif isinstance(data, pa.Table):
+            return data.nbytes / 1024 ** 2
         else:
-            self.__nullRowDropper()
+            return data.memory_usage(index=False, deep=True).sum() / 1024 ** 2
 
-        if verbose:
-            self.__dataToCSV(self.df, self.__exportFileName, self.__folder, self.__Path)
-            print("Cleaned Dataframe saved")
+    def __selectionStage(self, data):
+        """
+    The __selectionStage function reads the selected payments with the dataset scanner. The rows of other
+    transactions are filtered out batch by batch while the file is decoded on multiple threads, so they never end up
+    in the table. In an incremental cleaning only the new rows are kept.
+
+    Args:
+        self: Represent the instance of the class
+        data: Not used, the selection reads the data
+
+    Returns:
+        The scanned table of the selected payments
+
+    Doc Author:
+        Willem van der Schans, Trelent AI
+    """
+        return self.__newRowFilter(self.__dataset.to_table(filter=self.__rowFilter, use_threads=True))
+
+    def __nullColumnStage(self, data):
+        """
+    The __nullColumnStage function drops the columns in which the share of null values reaches the null threshold.
+    In chunks the columns are chosen from the null counts of the whole file, otherwise from the data itself. It
+    works on the scanned table as well as on the dataframe, on the table the dropped columns are never converted.
+
+    Args:
+        self: Represent the instance of the class
+        data: Pass the table or dataframe
+
+    Returns:
+        The table or dataframe without the dropped columns
+
+    Doc Author:
+        Willem van der Schans, Trelent AI
+    """
+        if self.__keepList is not None:
+            keepList = self.__keepList
+        elif isinstance(data, pa.Table):
+            keepList = self.__nullColumnSelector({colName: data.column(colName).null_count
+                                                  for colName in data.column_names}, data.num_rows)
         else:
-            self.__dataToCSV(self.df, self.__exportFileName, self.__folder, self.__Path)
+            keepList = self.__nullColumnSelector(data.isnull().sum().to_dict(), len(data))
 
-   
-    def __dataSelector(self, columnName, valueList):
+        if isinstance(data, pa.Table):
+            return data.select(keepList)
+        else:
+            return data[keepList]
+
+    def __nullColumnSelector(self, nullCounts, rowCount):
         """
-    The __dataSelector function takes in a column name and a list of values.
-    It then filters the dataframe to only include rows where the value in that column is one of those values.
+    The __nullColumnSelector function returns the columns in which the share of null values stays below the null
+    threshold. Without rows every column is kept.
 
     Args:
-        self: Allow an object to refer to itself inside of a method
-        columnName: Select a column in the dataframe
-        valueList: Select the values that are in the columnname parameter
+        self: Represent the instance of the class
+        nullCounts: Pass the number of null values per column
+        rowCount: Pass the number of rows
 
     Returns:
-        A dataframe with the columnname and valuelist specified
+        The list of columns that are kept
 
     Doc Author:
         Willem van der Schans, Trelent AI
     """
-        self.df = self.df[(self.df[columnName].isin(valueList))]
+        return [colName for colName, nullCount in nullCounts.items()
+                if rowCount == 0 or nullCount / rowCount < self.__nullThreshold]
 
-    def __nullColumnDropper(self, threshold):
+    def __typeStage(self, data):
         """
-    The __nullColumnDropper function takes a threshold as an argument and drops columns that have more than the
-    threshold percentage of null values. The function is called by the dropNullColumns method, which takes a threshold
-    as an argument and calls __nullColumnDropper with that value.
+    The __typeStage function converts the scanned table to a dataframe. Every text column gets the first type from
+    __typeResolver, in chunks the type that fits the whole file.
 
     Args:
-        self: Make the function a method of the class
-        threshold: Determine the percentage of null values in a column that would trigger it to be dropped
+        self: Represent the instance of the class
+        data: Pass the scanned table
 
     Returns:
-        A list of columns that are to be dropped
+        A dataframe
 
     Doc Author:
         Willem van der Schans, Trelent AI
     """
-        dropList = []
-        for col in self.df.columns:
-            if self.df[col].isnull().sum() / len(self.df) >= threshold:
-                dropList.append(col)
+        columnList = []
+        for colName in data.column_names:
+            if self.__typeDict is not None:
+                typeList = self.__typeDict[colName]
             else:
-                pass
+                typeList = self.__typeResolver(data.column(colName))
 
-        self.df = self.df.drop(columns=dropList)
+            if typeList:
+                columnList.append(pc.cast(data.column(colName), typeList[0]))
+            else:
+                columnList.append(data.column(colName))
 
-    def __nullRowDropper(self):
+        return pa.table(columnList, names=data.column_names).to_pandas()
+
+    @staticmethod
+    def __dateStage(data):
         """
-    The __nullRowDropper function drops all rows that contain null values.
-        It is called by the __nullColumnDropper function, which in turn is called by the cleanData method.
+    The __dateStage function converts the date columns from string to datetime format with dateConvert.
 
     Args:
-        self: Allow an object to refer to itself inside of a method
+        data: Pass the dataframe
+
+    Returns:
+        The dataframe with datetime columns
+
+    Doc Author:
+        Willem van der Schans, Trelent AI
+    """
+        return dateConvert(data)
+
+    @staticmethod
+    def __nullRowStage(data):
+        """
+    The __nullRowStage function drops all rows that contain null values.
+
+    Args:
+        data: Pass the dataframe
 
     Returns:
         A dataframe with all rows that contain null values removed
@@ -159,13 +390,326 @@ class DataCleaner:
     Doc Author:
         Willem van der Schans, Trelent AI
     """
-        self.df = self.df.dropna(axis=0).reset_index(drop=True)
+        data = data.dropna(axis=0)
+        data.index = pd.RangeIndex(len(data))
+        return data
+
+    def __compactionStage(self, data):
+        """
+    The __compactionStage function compacts the column types of the cleaned dataframe with the dataCompactor and
+    keeps the schema that is saved next to the file.
+
+    Args:
+        self: Represent the instance of the class
+        data: Pass the cleaned dataframe
+
+    Returns:
+        The compacted dataframe
+
+    Doc Author:
+        Willem van der Schans, Trelent AI
+    """
+        compactorObj = dataCompactor(data, verbose=self.__verbose)
+        self.schema = compactorObj.schema
+        return compactorObj.df
+
+    def __exportStage(self, data):
+        """
+    The __exportStage function saves the cleaned dataframe with the schema of the compaction stage. In an
+    incremental cleaning the dataframe is appended to the previous dfClean with appendFrame.
+
+    Args:
+        self: Represent the instance of the class
+        data: Pass the cleaned dataframe
+
+    Returns:
+        The cleaned dataframe
+
+    Doc Author:
+        Willem van der Schans, Trelent AI
+    """
+        if self.__previousPath is not None:
+            appendFrame(data, Path(self.__previousPath).with_name(self.__exportFileName), self.__previousPath,
+                        schema=self.schema)
+        else:
+            self.__dataToFile(data, self.__exportFileName, self.__folder, self.__Path, schema=self.schema)
+        if self.__verbose:
+            print("Cleaned Dataframe saved")
+
+        return data
+
+    def __datasetOpener(self, inputPath):
+        """
+    The __datasetOpener function opens the input file as a pyarrow dataset. Every column is scanned as text except
+    the columns of the payment selection, the other columns get their type from the rows that are kept. Empty column
+    names are named Unnamed like pandas does. The payment selection is turned into a filter expression, so it can be
+    pushed down into the scan of the file.
+
+    Args:
+        self: Represent the instance of the class
+        inputPath: Specify the path of the file to be cleaned
+
+    Returns:
+        Nothing
+
+    Doc Author:
+        Willem van der Schans, Trelent AI
+    """
+        columnNames = list(pd.read_csv(inputPath, nrows=0).columns)
+        selectorTypes = {'transaction_code': pa.int64(), 'transaction_description': pa.string()}
+        schema = pa.schema([(colName, selectorTypes.get(colName, pa.string())) for colName in columnNames])
+        fileFormat = ds.CsvFileFormat(read_options=csv.ReadOptions(column_names=columnNames, skip_rows=1),
+                                      convert_options=csv.ConvertOptions(strings_can_be_null=True))
+
+        self.__inputPath = inputPath
+        self.__dataset = ds.dataset(inputPath, schema=schema, format=fileFormat)
+        self.__rowFilter = None
+        for colName, valueList in self.__selectorList:
+            if self.__rowFilter is None:
+                self.__rowFilter = ds.field(colName).isin(valueList)
+            else:
+                self.__rowFilter = self.__rowFilter & ds.field(colName).isin(valueList)
+
+    def __streamCleaner(self, stageList, chunkSize):
+        """
+    The __streamCleaner function cleans the input file in chunks of chunkSize rows, so the memory it needs is
+    bounded by the chunk size and the cleaned rows instead of the whole raw table. The first pass collects the
+    column types and null counts of the selected payments with __streamStatistics and is logged as the statistics
+    stage. The columns the null column stage drops are then not read at all in the second pass, which runs the
+    stages up to the compaction on every chunk. The compaction and export stages run once on the cleaned
+    dataframe. Every chunk gets the column types of all the selected rows, so the result is the same dataframe the
+    whole file produces.
+
+    Args:
+        self: Represent the instance of the class
+        stageList: Pass the order of the cleaning stages
+        chunkSize: Set the number of rows that are read at once
+
+    Returns:
+        The cleaned dataframe
+
+    Doc Author:
+        Willem van der Schans, Trelent AI
+    """
+        dateNulls = "nullColumns" in stageList and "dates" in stageList and \
+            stageList.index("dates") < stageList.index("nullColumns")
+
+        startTime = time.time()
+        self.__typeDict, nullCounts, rowCount, selectCount = self.__streamStatistics(chunkSize, dateNulls)
+        self.__stageLogger("statistics", time.time() - startTime, rowCount, selectCount, np.nan, np.nan)
+
+        if "nullColumns" not in stageList or self.__previousPath is not None:
+            pass
+        elif "nullRows" in stageList and stageList.index("nullRows") < stageList.index("nullColumns"):
+            self.__keepList = list(nullCounts)
+        else:
+            self.__keepList = self.__nullColumnSelector(nullCounts, selectCount)
+
+        chunkStageList = [stageName for stageName in stageList[1:] if stageName not in ["compaction", "export"]]
+        chunkList = []
+
+        startTime = time.time()
+        for rowsRead, table in self.__batchReader(chunkSize, self.__keepList):
+            self.__stageLogger("selection", time.time() - startTime, rowsRead, table.num_rows,
+                               self.__memoryCounter(None), self.__memoryCounter(table))
+            for stageName in chunkStageList:
+                table = self.__stageRunner(stageName, table)
+            chunkList.append(table)
+            startTime = time.time()
+
+        if len(chunkList) == 0:
+            table = self.__dataset.schema.empty_table()
+            if self.__keepList is not None:
+                table = table.select(self.__keepList)
+            for stageName in chunkStageList:
+                table = self.__stageDict[stageName](table)
+            chunkList.append(table)
+
+        data = pd.concat(chunkList, ignore_index=True)
+        for stageName in stageList[1 + len(chunkStageList):]:
+            data = self.__stageRunner(stageName, data)
+
+        return data
+
+    def __streamStatistics(self, chunkSize, dateNulls=False):
+        """
+    The __streamStatistics function is the first pass of __streamCleaner. It scans the selected payments chunk by
+    chunk, counts the null values per column and narrows down the types every text column can be converted to,
+    a type is kept only when the values of every chunk can be converted to it. With dateNulls the null columns are
+    chosen after the dates stage, so the date columns that stay text are counted after the datetime conversion of
+    dateConvert, which turns values like NaT into null values as well.
+
+    Args:
+        self: Represent the instance of the class
+        chunkSize: Set the number of rows that are read at once
+        dateNulls: Count the null values of the date columns after the datetime conversion
+
+    Returns:
+        The types every column can be converted to, the null count per column, the number of rows in the file and
+        the number of selected rows
+
+    Doc Author:
+        Willem van der Schans, Trelent AI
+    """
+        typeDict = {colName: None for colName in self.__dataset.schema.names}
+        nullCounts = {colName: 0 for colName in self.__dataset.schema.names}
+        if dateNulls:
+            dateNullCounts = {colName: 0 for colName in self.__dataset.schema.names
+                              if ("date" in colName or "next" in colName) and
+                              pa.types.is_string(self.__dataset.schema.field(colName).type)}
+        else:
+            dateNullCounts = {}
+        rowCount = 0
+        selectCount = 0
+
+        for rowsRead, table in self.__batchReader(chunkSize):
+            rowCount += rowsRead
+            selectCount += table.num_rows
+            for colName in typeDict:
+                nullCounts[colName] += table.column(colName).null_count
+                typeDict[colName] = self.__typeResolver(table.column(colName), typeDict[colName])
+            for colName in dateNullCounts:
+                dateNullCounts[colName] += pd.to_datetime(table.column(colName).to_pandas(),
+                                                          errors="coerce").isnull().sum()
+
+        # A date column that is converted to a number first keeps its null values in the dates stage
+        for colName in dateNullCounts:
+            if not typeDict[colName]:
+                nullCounts[colName] = dateNullCounts[colName]
+
+        return typeDict, nullCounts, rowCount, selectCount
+
+    def __batchReader(self, chunkSize, columns=None):
+        """
+    The __batchReader function reads the input file in blocks of about chunkSize rows with the streaming csv reader
+    of pyarrow and yields the number of rows read and the selected payments of every block, in an incremental
+    cleaning only the new rows of them. The block size in bytes is estimated from the rows at
+    the start of the file. The reader runs on a single thread and reads the next block only when it is asked for it,
+    unlike the dataset scanner that reads ahead of the batches that are cleaned, so only one block is held in memory.
+
+    Args:
+        self: Represent the instance of the class
+        chunkSize: Set the number of rows that are read at once
+        columns: Specify the columns that are returned, defaults to all columns
+
+    Returns:
+        A generator of the number of rows read and the selected payments per block
+
+    Doc Author:
+        Willem van der Schans, Trelent AI
+    """
+        schema = self.__dataset.schema
+        if columns is None:
+            columns = schema.names
+
+        with open(self.__inputPath, "rb") as file:
+            sample = file.read(65536)
+        blockSize = max(int(chunkSize * len(sample) / max(sample.count(b"\n"), 1)), 65536)
+
+        readColumns = columns + [colName for colName, _ in self.__selectorList if colName not in columns]
+        reader = csv.open_csv(self.__inputPath,
+                              read_options=csv.ReadOptions(column_names=schema.names, skip_rows=1,
+                                                           block_size=blockSize, use_threads=False),
+                              convert_options=csv.ConvertOptions(column_types=schema, strings_can_be_null=True,
+                                                                 include_columns=readColumns))
+
+        for batch in reader:
+            yield batch.num_rows, self.__newRowFilter(pa.Table.from_batches([batch]).filter(self.__rowFilter)
+                                                      .select(columns))
+
+    def __keyIndexer(self, previousKeys):
+        """
+    The __keyIndexer function indexes the keyColumns of the previous dfClean for __newRowFilter. Every key column
+    gets an index of its values and every combination of the key columns up to that column an index of its packed
+    codes, so the packed codes are renumbered after every column and can never overflow.
+
+    Args:
+        self: Represent the instance of the class
+        previousKeys: Pass the key columns of the previous dfClean
+
+    Returns:
+        Nothing
+
+    Doc Author:
+        Willem van der Schans, Trelent AI
+    """
+        self.__keyLevels = []
+        codeArray = np.zeros(len(previousKeys), dtype="int64")
+        for colName in DataCleaner.keyColumns:
+            valueArray = previousKeys[colName].to_numpy(dtype="float64")
+            valueIndex = pd.Index(pd.unique(valueArray))
+            packedArray = codeArray * len(valueIndex) + valueIndex.get_indexer(valueArray)
+            packedIndex = pd.Index(pd.unique(packedArray))
+            codeArray = packedIndex.get_indexer(packedArray)
+            self.__keyLevels.append((valueIndex, packedIndex))
+
+    def __newRowFilter(self, table):
+        """
+    The __newRowFilter function keeps only the rows of a scanned table whose keyColumns are not in the previous
+    dfClean. The key columns are looked up in the indexes of __keyIndexer one after the other, a row whose value or
+    combination of values is missing from an index is new, so the previous keys are only indexed once and every
+    table is matched in a single pass. Outside of an incremental cleaning the table is returned as it is.
+
+    Args:
+        self: Represent the instance of the class
+        table: Pass the scanned table of selected payments
+
+    Returns:
+        The table with only the new rows
+
+    Doc Author:
+        Willem van der Schans, Trelent AI
+    """
+        if self.__keyLevels is None:
+            return table
+
+        codeArray = np.zeros(table.num_rows, dtype="int64")
+        for colName, (valueIndex, packedIndex) in zip(DataCleaner.keyColumns, self.__keyLevels):
+            valueCodes = valueIndex.get_indexer(pc.cast(table.column(colName), pa.float64()).to_numpy())
+            packedCodes = packedIndex.get_indexer(codeArray * len(valueIndex) + valueCodes)
+            codeArray = np.where((codeArray < 0) | (valueCodes < 0), -1, packedCodes)
+
+        return table.filter(pa.array(codeArray < 0))
+
+    @staticmethod
+    def __typeResolver(column, typeList=None):
+        """
+    The __typeResolver function returns the types of typeList, integer, float and boolean by default, that all
+    values of a column scanned as text can be converted to. Integer columns with null values become float columns
+    when they are converted to pandas, the same types a pandas read of the rows would give. Columns that are not
+    text keep their type.
+
+    Args:
+        column: Pass the scanned column
+        typeList: Pass the types that are still possible for the column
+
+    Returns:
+        The list of types the column can be converted to, an empty list keeps the column as text
+
+    Doc Author:
+        Willem van der Schans, Trelent AI
+    """
+        if not pa.types.is_string(column.type):
+            return []
+
+        if typeList is None:
+            typeList = [pa.int64(), pa.float64(), pa.bool_()]
+
+        resolvedList = []
+        for dataType in typeList:
+            try:
+                pc.cast(column, dataType)
+                resolvedList.append(dataType)
+            except (pa.ArrowInvalid, pa.ArrowNotImplementedError):
+                pass
+
+        return resolvedList
 
     @staticmethod
-    def __dataToCSV(dataframe, filename, folder=None, path=None):
+    def __dataToFile(dataframe, filename, folder=None, path=None, schema=None):
         """
-    The __dataToCSV function takes in a dataframe, filename, folder (optional), and path (optional)
-    and saves the dataframe as a CSV file. If no folder is specified, it will save to the current working directory.
+    The __dataToFile function takes in a dataframe, filename, folder (optional), and path (optional)
+    and saves the dataframe in the format of the file extension, parquet or csv. If no folder is specified, it will save to the current working directory.
     If no path is specified, it will save to the current working directory.
 
     Args:
@@ -173,22 +717,24 @@ class DataCleaner:
         filename: Specify the name of the file that will be created
         folder: Specify a folder to save the file in
         path: Specify the path to the folder where you want to save your file
+        schema: Pass the column types of the dataframe that are saved next to the file
 
     Returns:
-        A csv file
+        A parquet or csv file
 
     Doc Author:
         Willem van der Schans, Trelent AI
     """
         if folder is not None:
-            dataframe.to_csv(f"{path}{folder}/{filename}")
+            writeFrame(dataframe, f"{path}{folder}/{filename}", schema=schema)
         else:
-            dataframe.to_csv(f"{path}{filename}")
+            writeFrame(dataframe, f"{path}{filename}", schema=schema)
 
 
 class dataMLPrep:
 
-    def __init__(self, inputFileName, exportDummyName, exportTargetName, folder=None, path=None, verbose=False):
+    def __init__(self, inputFileName, exportDummyName, exportTargetName, folder=None, path=None, verbose=False,
+                 encoderName=None, exportEncoderName=None, previousDummyName=None, previousTargetName=None):
 
         """
     The __init__ function is the first function that gets called when an object of this class is created.
@@ -196,6 +742,12 @@ class dataMLPrep:
     The folder parameter allows you to specify which folder your input file is located in, if it's not in the same directory as this script.
     The path parameter allows you to specify where your output files will be saved (if different from where they are being read).
     If verbose=True then some print statements will appear during execution.
+    The label encodings are kept in an encoderRegistry. With encoderName the saved registry of an earlier preparation
+    is loaded and only the rows of the input file are encoded with its codes, without the history they were fitted
+    on. With exportEncoderName the registry is saved next to the scaler.
+    With the previous dfDummy and dfTarget files the preparation is incremental: only the last part of the input
+    data set, the new rows an incremental DataCleaner appended to it, is prepared with the registry of encoderName
+    and the rows are appended to the previous dfDummy and dfTarget as new parts with appendFrame.
 
     Args:
         self: Refer to the object itself
@@ -205,6 +757,10 @@ class dataMLPrep:
         folder: Specify the folder where the input file is located
         path: Set the path of the folder where all files are located
         verbose: Print out the progress of the function
+        encoderName: Specify the encoder registry file that is used to encode, defaults to fitting a new registry
+        exportEncoderName: Specify the name of the file the encoder registry is saved to
+        previousDummyName: Specify the dfDummy file the new rows are appended to
+        previousTargetName: Specify the dfTarget file the new rows are appended to
 
     Returns:
         Nothing
@@ -214,16 +770,32 @@ class dataMLPrep:
     """
         self.dummyDf = None
         self.targetDf = None
+        self.newRows = None
+        self.__folder = folder
+
+        previousList = [previousDummyName, previousTargetName]
+        if any(name is not None for name in previousList):
+            if None in previousList or encoderName is None:
+                raise ValueError("An incremental preparation needs the previous dfDummy and dfTarget files and the "
+                                 "encoder registry they were encoded with")
 
         if path is not None:
             self.__path = str(path) + "/"
         else:
             self.__path = ""
 
-        if folder is not None:
-            self.df = pd.read_csv(f"{self.__path}{folder}/{inputFileName}", index_col=0)
+        if previousDummyName is not None:
+            self.df = readFrame(partPaths(self.__filePath(inputFileName))[-1])
+            self.newRows = len(self.df)
+            if verbose:
+                print(f"{self.newRows} new rows found")
+        else:
+            self.df = readFrame(self.__filePath(inputFileName))
+
+        if encoderName is not None:
+            self.encoderObj = modelLoader(encoderName, self.__path, folder).getModel()
         else:
-            self.df = pd.read_csv(f"{self.__path}{inputFileName}", index_col=0)
+            self.encoderObj = encoderRegistry()
 
         self.__targetVariableCreator("paid")
         if verbose:
@@ -236,19 +808,57 @@ class dataMLPrep:
         else:
             self.__dataEncoder("paid")
 
-        self.__dataToCSV(self.dummyDf, exportDummyName, folder, path=self.__path)
+        compactorObj = dataCompactor(self.dummyDf, verbose=verbose)
+        self.dummyDf = compactorObj.df
+        if previousDummyName is not None:
+            appendFrame(self.dummyDf, self.__filePath(exportDummyName), self.__filePath(previousDummyName),
+                        schema=compactorObj.schema)
+        else:
+            self.__dataToFile(self.dummyDf, exportDummyName, folder, path=self.__path, schema=compactorObj.schema)
         if verbose:
             print("Dummy Dataframe saved")
 
-        self.__dataToCSV(self.targetDf, exportTargetName, folder, path=self.__path)
+        if isinstance(self.targetDf, pd.Series):
+            self.targetDf = self.targetDf.to_frame()
+        compactorObj = dataCompactor(self.targetDf, verbose=verbose)
+        self.targetDf = compactorObj.df
+        if previousTargetName is not None:
+            appendFrame(self.targetDf, self.__filePath(exportTargetName), self.__filePath(previousTargetName),
+                        schema=compactorObj.schema)
+        else:
+            self.__dataToFile(self.targetDf, exportTargetName, folder, path=self.__path, schema=compactorObj.schema)
         if verbose:
             print("Target Dataframe saved")
 
+        if exportEncoderName is not None:
+            pickle.dump(self.encoderObj, open(self.__filePath(exportEncoderName), "wb"))
+            if verbose:
+                print("Encoder Registry saved")
+
    
+    def __filePath(self, fileName):
+        """
+    The __filePath function returns the path of a file in the folder of the preparation.
+
+    Args:
+        self: Represent the instance of the class
+        fileName: Specify the name of the file
+
+    Returns:
+        The path of the file
+
+    Doc Author:
+        Willem van der Schans, Trelent AI
+    """
+        if self.__folder is not None:
+            return f"{self.__path}{self.__folder}/{fileName}"
+        else:
+            return f"{self.__path}{fileName}"
+
     def __dataEncoder(self, targetVar):
         """
     The __dataEncoder function takes in a target variable and performs the following steps:
-        1. Label encodes all categorical variables
+        1. Label encodes all categorical variables with the encoder registry
         2. Removes the target variable from the dataframe
         3. Dummy encodes all categorical variables (including those that were label encoded)
 
@@ -262,10 +872,8 @@ class dataMLPrep:
     Doc Author:
         Willem van der Schans, Trelent AI
     """
-        labelEncoder = LabelEncoder()
-        colList = list(self.df.select_dtypes(include=['object']).columns)
-        for col in colList:
-            self.df[col] = labelEncoder.fit_transform(self.df[col])
+        colList = list(self.df.select_dtypes(include=['object', 'category', 'datetime']).columns)
+        self.df = self.encoderObj.encode(self.df, colList)
 
        
         dfTarget = self.df[str(targetVar)]
@@ -280,51 +888,220 @@ class dataMLPrep:
     def __targetVariableCreator(self, targetName):
         """
     The __targetVariableCreator function takes in a targetName and creates a new column in the dataframe with that name.
-    The values of this column are determined by comparing the date_due and transaction_date columns. If date_due is less than or equal to
-    transaction_date, then 1 is appended to the list, otherwise 0 is appended to the list. The function then drops both date columns from
-    the dataframe and adds on our newly created target variable.
+    The values of this column are determined by comparing the date_due and transaction_date columns as whole columns. If date_due is less
+    than or equal to transaction_date the value is 1, otherwise 0. The function then drops both date columns from the dataframe and adds on
+    our newly created target variable.
 
     Args:
         self: Allow an object to refer to itself inside of a method
         targetName: Name the target variable column
 
     Returns:
-        A list of 1's and 0's
+        A column of 1's and 0's
 
     Doc Author:
         Willem van der Schans, Trelent AI
     """
-        target_list = []
-        for row in range(len(self.df)):
-            if self.df.date_due[row] <= self.df.transaction_date[row]:
-                target_list.append(1)
-            else:
-                target_list.append(0)
+        targetSeries = (self.df['date_due'] <= self.df['transaction_date']).astype("int64")
 
         self.df = self.df.drop(['date_due', 'transaction_date'], axis=1)
 
-        self.df[targetName] = target_list
+        self.df[targetName] = targetSeries
 
     @staticmethod
-    def __dataToCSV(dataframe, filename, folder=None, path=None):
+    def __dataToFile(dataframe, filename, folder=None, path=None, schema=None):
         """
-    The __dataToCSV function takes in a dataframe, filename, folder (optional), and path (optional)
-    and saves the dataframe as a CSV file. If no folder is specified, it will save to the current working directory.
+    The __dataToFile function takes in a dataframe, filename, folder (optional), and path (optional)
+    and saves the dataframe in the format of the file extension, parquet or csv. If no folder is specified, it will save to the current working directory.
     If no path is specified, it will save to the current working directory.
 
     Args:
-        dataframe: Store the dataframe that is to be saved as a csv file
+        dataframe: Store the dataframe that is to be saved
         filename: Name the file that is being created
         folder: Specify the folder where the file will be saved
         path: Specify the path to where you want to save your file
+        schema: Pass the column types of the dataframe that are saved next to the file
 
     Returns:
-        A csv file in the specified folder
+        A parquet or csv file in the specified folder
 
     Doc Author:
         Willem van der Schans, Trelent AI
     """
         if folder is not None:
-            dataframe.to_csv(f"{path}{folder}/{filename}")
+            writeFrame(dataframe, f"{path}{folder}/{filename}", schema=schema)
+        else:
+            writeFrame(dataframe, f"{path}{filename}", schema=schema)
+
+
+class dataCompactor:
+
+    def __init__(self, dataframe, categoryThreshold=0.5, verbose=False):
+
+        """
+    The __init__ function gives every column of a dataframe the smallest type that holds its values without changing
+    them. Integers are downcast to the smallest integer type that fits their minimum and maximum, floats become
+    float32 when every value survives the conversion and text columns with fewer unique values than categoryThreshold
+    times the number of rows become categoricals. The chosen type and the memory before and after every column are
+    kept in schema, which is saved next to the data set so a reload gets the same types back.
+
+    Args:
+        self: Represent the instance of the class
+        dataframe: Pass the dataframe that needs to be compacted
+        categoryThreshold: Set the share of unique values below which a text column becomes a categorical
+        verbose: Print out the memory that is saved per column
+
+    Returns:
+        Nothing
+
+    Doc Author:
+        Willem van der Schans, Trelent AI
+    """
+        self.df = dataframe.copy(deep=False)
+        self.schema = {}
+        self.__categoryThreshold = categoryThreshold
+
+        for colName in self.df.columns:
+            bytesBefore = int(self.df[colName].memory_usage(index=False, deep=True))
+            self.df[colName] = self.__columnCompactor(self.df[colName])
+            bytesAfter = int(self.df[colName].memory_usage(index=False, deep=True))
+
+            self.schema[str(colName)] = {"dtype": str(self.df[colName].dtype),
+                                         "bytesBefore": bytesBefore,
+                                         "bytesAfter": bytesAfter}
+            if isinstance(self.df[colName].dtype, pd.CategoricalDtype):
+                self.schema[str(colName)]["categories"] = self.df[colName].cat.categories.tolist()
+
+        self.savingsDf = pd.DataFrame.from_dict({colName: [value["dtype"], value["bytesBefore"], value["bytesAfter"]]
+                                                 for colName, value in self.schema.items()},
+                                                orient="index", columns=["Type", "Bytes Before", "Bytes After"])
+        self.savingsDf["Bytes Saved"] = self.savingsDf["Bytes Before"] - self.savingsDf["Bytes After"]
+
+        if verbose:
+            print(self.savingsDf.to_string())
+            print(f"Compaction saved {round(self.savingsDf['Bytes Saved'].sum() / 1024 ** 2, 2)} MB of "
+                  f"{round(self.savingsDf['Bytes Before'].sum() / 1024 ** 2, 2)} MB")
+
+    def __columnCompactor(self, series):
+        """
+    The __columnCompactor function returns a column in the smallest type that holds all of its values. A column
+    that can not be made smaller is returned as it is.
+
+    Args:
+        self: Represent the instance of the class
+        series: Pass the column that needs to be compacted
+
+    Returns:
+        The compacted column
+
+    Doc Author:
+        Willem van der Schans, Trelent AI
+    """
+        if series.dtype.kind == "i":
+            return pd.to_numeric(series, downcast="integer")
+        elif series.dtype.kind == "u":
+            return pd.to_numeric(series, downcast="unsigned")
+        elif series.dtype.kind == "f" and series.dtype.itemsize > 4:
+            compactSeries = series.astype("float32")
+            if np.array_equal(compactSeries.to_numpy(dtype="float64"), series.to_numpy(), equal_nan=True):
+                return compactSeries
+        elif series.dtype == object and len(series) > 0 and \
+                series.nunique() < self.__categoryThreshold * len(series) and \
+                pd.api.types.infer_dtype(series, skipna=True) == "string":
+            return series.astype("category")
+
+        return series
+
+
+class encoderRegistry:
+
+    def __init__(self, unknownCode=-1):
+        """
+    The __init__ function creates an empty registry of label encodings. A column the registry does not know yet is
+    fitted the first time it is encoded, the sorted values of the column are kept as its classes and every value
+    gets its position in them. These are the codes a LabelEncoder fitted on the column gives. Every later call
+    encodes the column with the kept classes, so new rows get the codes of the data the registry was fitted on
+    without encoding that data again. Values that are not in the classes of a column get unknownCode.
+
+    Args:
+        self: Represent the instance of the class
+        unknownCode: Set the code of values that are not in the classes of a column
+
+    Returns:
+        Nothing
+
+    Doc Author:
+        Willem van der Schans, Trelent AI
+    """
+        self.classDict = {}
+        self.unknownCode = unknownCode
+
+    def encode(self, dataframe, colList):
+        """
+    The encode function label encodes the columns in colList of a dataframe. Known columns are encoded with their
+    classes, the other columns are fitted and added to the registry.
+
+    Args:
+        self: Represent the instance of the class
+        dataframe: Pass the dataframe that is encoded
+        colList: Specify the columns that are encoded
+
+    Returns:
+        The dataframe with the encoded columns
+
+    Doc Author:
+        Willem van der Schans, Trelent AI
+    """
+        for colName in colList:
+            if colName in self.classDict:
+                dataframe[colName] = self.__columnTransformer(dataframe[colName], self.classDict[colName])
+            else:
+                dataframe[colName] = self.__columnFitter(dataframe[colName], colName)
+
+        return dataframe
+
+    def __columnFitter(self, series, colName):
+        """
+    The __columnFitter function fits the classes of a column and returns the codes of its values. Category columns
+    are encoded from their codes, after the categories that are not used are dropped and the rest is sorted.
+
+    Args:
+        self: Represent the instance of the class
+        series: Pass the column that is fitted
+        colName: Specify the name the classes are kept under
+
+    Returns:
+        The encoded column
+
+    Doc Author:
+        Willem van der Schans, Trelent AI
+    """
+        if isinstance(series.dtype, pd.CategoricalDtype):
+            series = series.cat.remove_unused_categories()
+            series = series.cat.reorder_categories(np.sort(series.cat.categories.to_numpy()))
+            self.classDict[colName] = series.cat.categories.to_numpy()
+            return series.cat.codes.astype("int64")
         else:
-            dataframe.to_csv(f"{path}{filename}")
+            codes, classes = pd.factorize(series, sort=True)
+            self.classDict[colName] = np.asarray(classes)
+            return pd.Series(codes, index=series.index)
+
+    def __columnTransformer(self, series, classes):
+        """
+    The __columnTransformer function encodes a column with the classes it was fitted on, values that are not in the
+    classes get the unknownCode.
+
+    Args:
+        self: Represent the instance of the class
+        series: Pass the column that is encoded
+        classes: Pass the sorted classes of the column
+
+    Returns:
+        The encoded column
+
+    Doc Author:
+        Willem van der Schans, Trelent AI
+    """
+        codes = pd.Categorical(series, categories=classes).codes.astype("int64")
+        codes[codes == -1] = self.unknownCode
+        return pd.Series(codes, index=series.index)
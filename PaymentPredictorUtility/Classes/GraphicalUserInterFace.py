@@ -26,19 +26,23 @@ warnings.filterwarnings("ignore")
 from itertools import cycle
 from pathlib import Path
 from shutil import get_terminal_size
-from threading import Thread
-from time import sleep
+from threading import Event, Thread
 
 import pandas as pd
 from colorama import Fore, init, Style
 
-from PaymentPredictorUtility.Classes.CustomerClass import Customer
+from PaymentPredictorUtility.Classes.AccountIndex import AccountIndex
+from PaymentPredictorUtility.Classes.ArtifactGraph import ArtifactGraph
+from PaymentPredictorUtility.Classes.CustomerResult import CustomerResult
 from PaymentPredictorUtility.Classes.DataPrep import DataCleaner, dataMLPrep
 from PaymentPredictorUtility.Classes.ModelCreation import dataScaler, machineLearner
+from PaymentPredictorUtility.Classes.PaymentPredictor import PaymentPredictor
+from PaymentPredictorUtility.Classes.PortfolioScorer import PortfolioScorer
+from PaymentPredictorUtility.Classes.ScoringServer import ScoringServer
 from PaymentPredictorUtility.Classes.dataFrameLoader import dataFrameLoader
 from PaymentPredictorUtility.Classes.modelLoader import modelLoader
 from PaymentPredictorUtility.Functions.ErrorCodes import ErrorProcessor
-from PaymentPredictorUtility.Functions.Func import directoryScanner
+from PaymentPredictorUtility.Functions.Func import accountListReader, directoryScanner
 
 init(autoreset=True, convert=True)
 
@@ -47,7 +51,7 @@ init(autoreset=True, convert=True)
 
 class GraphicalUserInterface:
 
-    def __init__(self):
+    def __init__(self, accountFile=None):
 
        
         """
@@ -57,6 +61,7 @@ class GraphicalUserInterface:
 
     Args:
         self: Represent the instance of the class
+        accountFile: Pass the path of an account file that the individual mode scores without asking for accounts
 
     Returns:
         Nothing
@@ -81,6 +86,10 @@ class GraphicalUserInterface:
         self.sourceObj = None
         self.targetObj = None
         self.dummyObj = None
+        self.cleanIndex = None
+        self.dummyIndex = None
+
+        self.accountFile = accountFile
 
         self.exitFlag = False
         self.printString = ""
@@ -123,6 +132,8 @@ class GraphicalUserInterface:
     The individualMethod function is used to predict the next payment of a single customer.
         The user will be prompted to input an account number, and the program will return a prediction for that specific customer.
         This function is useful when you want to test out how accurate your model is on individual customers.
+        In batch mode a whole list of account numbers is read from a file or prompt and scored in one pass.
+        When the program was started with an account file the batch mode scores that file without asking.
 
     Args:
         self: Represent the instance of the class
@@ -133,15 +144,20 @@ class GraphicalUserInterface:
     Doc Author:
         Willem van der Schans, Trelent AI
     """
+        if self.accountFile is not None or input(
+                "Do you want to score a " + Fore.CYAN + "[S]" + Style.RESET_ALL + "ingle account or a " + Fore.CYAN + "[B]" + Style.RESET_ALL + "atch of accounts?: ").lower() == "b":
+            self.__batchIndividualMethod()
+            return
+
         passFlag = False
-        uniqueList = list(map(int, self.sourceObj.getDf()['acctrefno'].unique().tolist()))
+        uniqueList = list(map(int, self.getCleanIndex().getAccounts().tolist()))
         acctrefno = 0
 
         while not passFlag:
             print(
                 "Selection of random account Numbers:" + Fore.CYAN + f" {random.sample(uniqueList, 5)}" + Style.RESET_ALL)
             acctrefno = int(input("Please input an account Number: "))
-            if acctrefno in uniqueList:
+            if acctrefno in self.getCleanIndex():
                 passFlag = True
             else:
                 print(
@@ -162,14 +178,12 @@ class GraphicalUserInterface:
         for x in range(loopLength):
 
             try:
-                customerObj = Customer(uniqueList[x], self.sourceObj.getDf(), self.targetObj.getDf(),
-                                       self.dummyObj.getDf(),
-                                       self.modelObj.getModel(), self.scalerObj.getModel(), "Data")
-
-                customerDict[uniqueList[x]] = [customerObj.accuracy, customerObj.certainty,
-                                               customerObj.paymentPrediction.values,
-                                               customerObj.nextPaymentProbability.values,
-                                               customerObj.paymentCodes.values] 
+                customerObj = CustomerResult(uniqueList[x], self.sourceObj.getDf(), self.targetObj.getDf(),
+                                             self.dummyObj.getDf(),
+                                             self.modelObj.getModel(), self.scalerObj.getModel(),
+                                             cleanIndex=self.getCleanIndex(), dummyIndex=self.getDummyIndex())
+
+                customerDict[uniqueList[x]] = customerObj.toList()
             except Exception as e:
                 ErrorDict[uniqueList[x]] = e
                 pass
@@ -215,13 +229,72 @@ class GraphicalUserInterface:
         else:
             pass
 
+    def __batchIndividualMethod(self):
+        """
+    The __batchIndividualMethod function scores a list of accounts in one pass. The account numbers are read from a
+    file, the account file the program was started with or typed as a comma separated list and scored with the scoreAccounts function of the PaymentPredictor.
+    Account numbers that are not in dfClean are reported together instead of prompting for every one of them. The
+    results, errors and unknown account numbers are saved in the Individual folder of today.
+
+    Args:
+        self: Represent the instance of the class
+
+    Returns:
+        Nothing
+
+    Doc Author:
+        Willem van der Schans, Trelent AI
+    """
+        if self.accountFile is not None:
+            accountList, invalidList = accountListReader(self.accountFile)
+        else:
+            accountList, invalidList = accountListReader(
+                input("Please input the path of an account file or a comma separated list of account numbers: "))
+
+        self.loadingAnimator = loadingAnimator(f"Scoring {len(accountList)} Accounts",
+                                               "Scoring Accounts Completed", "Scoring Accounts Failed").start()
+
+        StartingTime = time.time()
+        df, dfError, unknownList = self.getPredictor().scoreAccounts(accountList, save=True)
+        unknownList = invalidList + unknownList
+
+        self.loadingAnimator.stop()
+
+        if len(unknownList) > 0:
+            print(Fore.YELLOW + f"{len(unknownList)} of {len(accountList) + len(invalidList)} entries were not found "
+                                f"in the database: {unknownList[:20]}{' ...' if len(unknownList) > 20 else ''}" +
+                  Style.RESET_ALL)
+
+        if len(df) + len(dfError) == 0:
+            print(Fore.RED + "None of the account numbers were found." + Style.RESET_ALL)
+
+        if self.verboseFlagBool:
+            print("\n" +
+                  f"completed {len(df) + len(dfError)} accounts at {datetime.datetime.now().strftime('%d/%m/%Y %H:%M:%S')} | \n"
+                  f"total runtime = {str(datetime.timedelta(seconds=math.ceil(time.time() - StartingTime)))} | \n"
+                  f"Errors Encountered = {len(dfError)}")
+
+        print(
+            Fore.GREEN + f"Scored {len(df)} accounts, {len(dfError)} errors and {len(unknownList)} unknown account "
+                         f"numbers. Output saved in {str(self.docPath.joinpath('Output'))}/Individual"
+                         f"{datetime.datetime.today().strftime('%m%d%Y')} folder." + Style.RESET_ALL, flush=True)
+        if input("Do you want to exit the program? Y/N: ").lower() == "y":
+            self.exitFlag = True
+        else:
+            pass
+
     def fullPredictionMethod(self):
         """
     The fullPredictionMethod function is the main function of the program. It takes in all of the data from
-    the sourceObj, targetObj, dummyObj and modelObj objects and uses them to create a Customer object for each unique account number.
-    The customer object then runs through its own prediction method which returns an accuracy score, certainty score (how confident it is that it's correct),
+    the sourceObj, targetObj, dummyObj and modelObj objects and scores every unique account number in one pass with the PortfolioScorer.
+    In incremental mode only the accounts whose fingerprint changed since the last incremental run are rescored.
+    The run itself is the scoreAll function of the PaymentPredictor, the interface only asks for the options.
+    For every account this returns an accuracy score, certainty score (how confident it is that it's correct),
     a predicted payment amount (if any), a probability that there will be a payment made next month and what type of payment code was used to make this prediction.
-    This information is then saved into two csv files: one with all successful predictions and
+    The results are flushed to disk in batches of accounts while the run is in progress, as Parquet or csv part files,
+    or as Feather payment and account tables in the long format.
+    Completed batches are recorded in a checkpoint journal, so an interrupted run continues where it stopped.
+    This information is then saved into two files: one with all successful predictions and
 
     Args:
         self: Represent the instance of the class
@@ -232,68 +305,99 @@ class GraphicalUserInterface:
     Doc Author:
         Willem van der Schans, Trelent AI
     """
-        self.loadingAnimator = loadingAnimator("", "",
-                                               "").start()
+        workers = os.cpu_count() or 1
+        chunkSize = 25000
 
-        uniqueList = list(self.sourceObj.getDf()["acctrefno"].unique())
-        StartingTime = time.time()
-        BatchTime = time.time()
-        customerDict = {}
-        ErrorDict = {}
-        loopLength = len(uniqueList)
-        reportInterval = 5000
+        if self.skipFlag:
+            scoringMode = "p" if workers > 1 else "s"
+        else:
+            scoringMode = input(
+                "Do you want to score in a " + Fore.CYAN + "[S]" + Style.RESET_ALL + "ingle process, in " + Fore.CYAN + "[P]" + Style.RESET_ALL + "arallel or " + Fore.CYAN + "[I]" + Style.RESET_ALL + "ncrementally?: ").lower()
+            if scoringMode == "p":
+                workersInp = input(f"Please input the number of worker processes [{workers}]: ")
+                if workersInp.isdigit() and int(workersInp) > 0:
+                    workers = int(workersInp)
+            if scoringMode != "i":
+                chunkSizeInp = input(f"Please input the number of accounts per batch [{chunkSize}]: ")
+                if chunkSizeInp.isdigit() and int(chunkSizeInp) > 0:
+                    chunkSize = int(chunkSizeInp)
+
+        if self.skipFlag:
+            outputFormat = "parquet"
+        else:
+            outputFormat = {"c": "csv", "f": "feather"}.get(input(
+                "Do you want to save the output as " + Fore.CYAN + "[P]" + Style.RESET_ALL + "arquet, " + Fore.CYAN + "[C]" + Style.RESET_ALL + "SV or " + Fore.CYAN + "[F]" + Style.RESET_ALL + "eather tables with one row per payment code?: ").lower(), "parquet")
 
-        for x in range(loopLength):
+        self.loadingAnimator = loadingAnimator("Scoring Portfolio...", "Scoring Portfolio Complete",
+                                               "Scoring Portfolio Failed").start()
 
-            try:
-                customerObj = Customer(uniqueList[x], self.sourceObj.getDf(), self.targetObj.getDf(),
-                                       self.dummyObj.getDf(),
-                                       self.modelObj.getModel(), self.scalerObj.getModel(), "Data")
-
-                customerDict[uniqueList[x]] = [customerObj.accuracy, customerObj.certainty,
-                                               customerObj.paymentPrediction.values,
-                                               customerObj.nextPaymentProbability.values,
-                                               customerObj.paymentCodes.values] 
-            except Exception as e:
-                ErrorDict[uniqueList[x]] = e
-                pass
+        predictorObj = self.getPredictor()
+        runPath = predictorObj.scoreAll(mode={"p": "parallel", "i": "incremental"}.get(scoringMode, "single"),
+                                        workers=workers, chunkSize=chunkSize, fileFormat=outputFormat)
+        runSummary = predictorObj.runSummary
 
-            if x == 0 or x == loopLength or x % reportInterval == 0:
-                if self.verboseFlagBool:
-                    print("\n" +
-                          f"completed {x + 1}/{(loopLength + 1)} at {datetime.datetime.now().strftime('%d/%m/%Y %H:%M:%S')} | \n"
-                          f"total runtime = {str(datetime.timedelta(seconds=math.ceil(time.time() - StartingTime)))} | \n"
-                          f"Batch Run time = {str(datetime.timedelta(seconds=math.ceil(time.time() - BatchTime)))} | \n"
-                          f"Errors Encountered = {len(ErrorDict)} | \n"
-                          f"Expected time needed {str(datetime.timedelta(seconds=math.ceil((time.time() - StartingTime) / ((x + 1) / (loopLength + 1)))))}")
-                    BatchTime = time.time()
+        if self.verboseFlagBool:
+            print("\n" +
+                  f"completed {runSummary['accountCount'] + runSummary['errorCount']} accounts at {datetime.datetime.now().strftime('%d/%m/%Y %H:%M:%S')} | \n"
+                  f"total runtime = {str(datetime.timedelta(seconds=math.ceil(runSummary['runTime'])))} | \n"
+                  f"Errors Encountered = {runSummary['errorCount']}")
 
-       
-        if not os.path.exists(
-                Path(self.docPath).joinpath('Output').joinpath(
-                    f"Full{datetime.datetime.today().strftime('%m%d%Y_%H%M%S')}")):
-            os.mkdir(
-                Path(self.docPath).joinpath('Output').joinpath(
-                    f"Full{datetime.datetime.today().strftime('%m%d%Y_%H%M%S')}"))
+        self.loadingAnimator.stop()
 
-        df = pd.DataFrame.from_dict(customerDict, orient="index",
-                                    columns=["Accuracy", "Certainty", "Prediction", "Payment Probability",
-                                             "Payment Codes"])
-        df.to_csv(
-            self.docPath.joinpath('Output').joinpath(
-                f"Full{datetime.datetime.today().strftime('%m%d%Y_%H%M%S')}").joinpath(
-                f"CustomerTestDataFrame{datetime.datetime.today().strftime('%m%d%Y_%H%M%S')}.csv"))
+        if runSummary["resumedCount"] > 0:
+            print(Fore.CYAN + f"Resumed the interrupted run {runPath.name}, "
+                              f"{runSummary['resumedCount']} batches were already completed." + Style.RESET_ALL)
+        if scoringMode == "p":
+            print(Fore.CYAN + "Worker throughput:" + Style.RESET_ALL)
+            print(runSummary["scorerObj"].workerDf.round(2).to_string())
+        elif scoringMode == "i":
+            print(Fore.CYAN + f"Rescored {runSummary['scorerObj'].rescoredCount} changed accounts, carried forward "
+                              f"{runSummary['scorerObj'].carriedCount} unchanged accounts." + Style.RESET_ALL)
 
-        dfError = pd.DataFrame.from_dict(ErrorDict, orient="index", columns=["Error"])
-        dfError.to_csv(
-            self.docPath.joinpath('Output').joinpath(
-                f"Full{datetime.datetime.today().strftime('%m%d%Y_%H%M%S')}").joinpath(
-                f"CustomerErrorDataFrame{datetime.datetime.today().strftime('%m%d%Y_%H%M%S')}.csv"))
+        print(
+            Fore.GREEN + f"Output saved in {str(runPath)} folder." + Style.RESET_ALL)
+        if input("Do you want to exit the program? Y/N: ").lower() == "y":
+            self.exitFlag = True
+        else:
+            pass
 
-        self.loadingAnimator.stop()
+    def serverMethod(self):
+        """
+    The serverMethod function keeps the loaded data, model, scaler and account indexes in memory and serves scoring
+    requests on localhost until the user presses Ctrl+C. Requests that arrive together are scored in one batch.
+    The latency and batch size statistics are printed when the server stops.
+
+    Args:
+        self: Represent the instance of the class
+
+    Returns:
+        Nothing
+
+    Doc Author:
+        Willem van der Schans, Trelent AI
+    """
+        port = 8765
+        if not self.skipFlag:
+            portInp = input(f"Please input the port to listen on [{port}]: ")
+            if portInp.isdigit() and 0 < int(portInp) < 65536:
+                port = int(portInp)
+
+        serverObj = ScoringServer(self.sourceObj.getDf(), self.targetObj.getDf(), self.dummyObj.getDf(),
+                                  self.modelObj.getModel(), self.scalerObj.getModel(), cleanIndex=self.getCleanIndex(),
+                                  dummyIndex=self.getDummyIndex(), port=port, verbose=self.verboseFlagBool)
+
+        print(Fore.GREEN + f"Scoring server listening on http://{serverObj.address[0]}:{serverObj.address[1]}" +
+              Style.RESET_ALL)
+        print("Score accounts with " + Fore.CYAN + "/score?acctrefno=1,2,3" + Style.RESET_ALL + " and read the "
+              "statistics with " + Fore.CYAN + "/stats" + Style.RESET_ALL + ". Press Ctrl+C to stop the server.",
+              flush=True)
+
+        serverObj.serveForever()
+
+        print(Fore.CYAN + "Scoring server stopped:" + Style.RESET_ALL)
+        for key, value in serverObj.getStats().items():
+            print(f"{key} = {Fore.CYAN + str(value) + Style.RESET_ALL}")
 
-        print(
-            Fore.GREEN + f"Output saved in {str(self.docPath.joinpath('Output'))}/Full{datetime.datetime.today().strftime('%m%d%Y_%H%M%S')} folder." + Style.RESET_ALL)
         if input("Do you want to exit the program? Y/N: ").lower() == "y":
             self.exitFlag = True
         else:
@@ -325,7 +429,7 @@ class GraphicalUserInterface:
 
         if selVal.lower() == "o":
             print(
-                Fore.YELLOW + f"Make sure " + Fore.CYAN + "[dfDummy.csv]" + Fore.YELLOW + " and " + Fore.CYAN + "[dfTarget.csv]" + Fore.YELLOW + " exist in the folder: \n" + Fore.CYAN + f"  {self.docPath.joinpath('Data')}" + Style.RESET_ALL)
+                Fore.YELLOW + f"Make sure " + Fore.CYAN + "[dfDummy.parquet]" + Fore.YELLOW + " and " + Fore.CYAN + "[dfTarget.parquet]" + Fore.YELLOW + " exist in the folder: \n" + Fore.CYAN + f"  {self.docPath.joinpath('Data')}" + Style.RESET_ALL)
             input("Press [enter] to continue or Ctrl+C to cancel...")
 
             self.loadingAnimator = loadingAnimator("Creating ML Model...",
@@ -346,7 +450,7 @@ class GraphicalUserInterface:
             input("Press [enter] to continue...")
         elif selVal.lower() == "f":
             print(
-                Fore.YELLOW + f"Make sure " + Fore.CYAN + "[dfDummy.csv]" + Fore.YELLOW + " and " + Fore.CYAN + "[dfTarget.csv]" + Fore.YELLOW + " exist in the folder: \n" + Fore.CYAN + f"  {self.docPath.joinpath('Data')}" + Style.RESET_ALL)
+                Fore.YELLOW + f"Make sure " + Fore.CYAN + "[dfDummy.parquet]" + Fore.YELLOW + " and " + Fore.CYAN + "[dfTarget.parquet]" + Fore.YELLOW + " exist in the folder: \n" + Fore.CYAN + f"  {self.docPath.joinpath('Data')}" + Style.RESET_ALL)
             input("Press [enter] to continue or Ctrl+C to cancel...")
 
             self.loadingAnimator = loadingAnimator("Creating ML Model...",
@@ -367,7 +471,7 @@ class GraphicalUserInterface:
             input("Press [enter] to continue...")
         elif selVal.lower() == "c":
             print(
-                Fore.YELLOW + f"Make sure " + Fore.CYAN + "[dfDummy.csv]" + Fore.YELLOW + " and " + Fore.CYAN + "[dfTarget.csv]" + Fore.YELLOW + " exist in the folder: \n" + Fore.CYAN + f"  {self.docPath.joinpath('Data')}" + Style.RESET_ALL)
+                Fore.YELLOW + f"Make sure " + Fore.CYAN + "[dfDummy.parquet]" + Fore.YELLOW + " and " + Fore.CYAN + "[dfTarget.parquet]" + Fore.YELLOW + " exist in the folder: \n" + Fore.CYAN + f"  {self.docPath.joinpath('Data')}" + Style.RESET_ALL)
             n_estimatorsInp = input("Please input an integer to denote the N estimators: ")
             max_depthInp = input("Please input an integer to denote the max tree depth: ")
 
@@ -429,7 +533,7 @@ class GraphicalUserInterface:
 
         elif selection == "f":
             print(Fore.CYAN + "Full Prediction Method Selected" + Fore.YELLOW +
-                  "\nWARNING: This method can take a lot of time (Est. 5 hours)." + Style.RESET_ALL, flush=True)
+                  "\nWARNING: This method can take some time (Est. 5 minutes)." + Style.RESET_ALL, flush=True)
 
             selVal = input("Are you sure you want to continue? Y/N:")
 
@@ -451,6 +555,11 @@ class GraphicalUserInterface:
             elif selVal.lower() == "n":
                 print(Fore.RED + "Method cancelled returning to main menu" + Style.RESET_ALL, flush=True)
 
+        elif selection == "s":
+            self.passFlag = True
+            print(Fore.CYAN + "Scoring Server Method Selected" + Style.RESET_ALL, flush=True)
+            self.serverMethod()
+
         elif selection == "e":
             if input(Fore.RED + "Are you sure you want to exit? Y/N:" + Style.RESET_ALL).lower() == "y":
                 self.exitFlag = True
@@ -480,7 +589,8 @@ class GraphicalUserInterface:
     1.""" + Fore.CYAN + """[I]""" + Style.RESET_ALL + """ndividual prediction
     2.""" + Fore.CYAN + """[F]""" + Style.RESET_ALL + """ull set Prediction
     3.""" + Fore.CYAN + """[T]""" + Style.RESET_ALL + """rain Model
-    4.""" + Fore.CYAN + """[E]""" + Style.RESET_ALL + f"""xit{self.dividerSmall(None, method="return", fullLength=30)}
+    4.""" + Fore.CYAN + """[S]""" + Style.RESET_ALL + """coring Server
+    5.""" + Fore.CYAN + """[E]""" + Style.RESET_ALL + f"""xit{self.dividerSmall(None, method="return", fullLength=30)}
         """, flush=True)
 
         while not self.passFlag:
@@ -491,17 +601,20 @@ class GraphicalUserInterface:
             except ValueError as e:
                 if self.DebugFlag:
                     print(Fore.RED + f"DEBUG MESSAGE::: {e}") 
-                print(Fore.RED + "Please make a valid selection [I,F,T,E]" + Style.RESET_ALL)
+                print(Fore.RED + "Please make a valid selection [I,F,T,S,E]" + Style.RESET_ALL)
                 continue
 
     def dataModelLoader(self):
         """
     The dataModelLoader function is used to load all the necessary files for the AvidPaymentPredictor.
     This function will check if any of the files are missing and create them if needed.
-    The dataModelLoader function also checks for updates in tblXmain_transactions and will recreate all
-    necessary files if an update is detected.
+    The dataModelLoader function also checks the dependency graph of the files and will only recreate the files
+    whose inputs changed since they were built. When every file is up to date the user can still choose to recreate
+    all files, with the skip flag a start without changes goes straight to loading.
     The dataModelLoader function is then used to load the scaler and ML model from the Data folder.
     If it does not exist, it will prompt user to create one using either optimal, fast or custom parameters.
+    Only the file names are resolved at startup, every data set, model and account index is read the first time a
+    mode uses it, so a mode that does not score never pays for loading them.
 
     Args:
     self: Refer to the object itself
@@ -513,8 +626,6 @@ class GraphicalUserInterface:
     Willem van der Schans, Trelent AI
     """
        
-        retrainFlag = False
-        reloadFlag = False
         self.DebugFlag = False
         self.verboseFlagBool = False
 
@@ -534,22 +645,6 @@ class GraphicalUserInterface:
 
         while self.initFlag:
 
-            if self.initFlag and not reloadFlag:
-                recreateInp = input(
-                    "Did" + Fore.CYAN + " tblXmain_transactions.csv" + Style.RESET_ALL + " get Updated? Y/N:" + Fore.RED + " [Y will recreate all files]: " + Style.RESET_ALL)
-                if recreateInp.lower() == "y":
-                    reloadFlag = True
-                    print(
-                        Fore.YELLOW + " Note: The next question does not impact results by a large margin. \n    Only do this if you can spare the time or if the source table variables (additions or deletions) changed." + Style.RESET_ALL)
-                    if input(
-                            "Do you want to retrain the scaler and ensemble tree model? Y/N:").lower() == "y":
-                        retrainFlag = True
-                else:
-                    pass
-            else:
-                reloadFlag = False
-                pass
-
            
             if not os.path.exists(self.docPath):
                 os.mkdir(self.docPath)
@@ -655,20 +750,58 @@ class GraphicalUserInterface:
             else:
                 print(Fore.GREEN + "Output Folder Found." + Style.RESET_ALL)
 
+            self.dividerSmall(title="Dependency Check")
+
+            try:
+                graphObj = ArtifactGraph(self.docPath, verbose=self.verboseFlagBool)
+                staleList = graphObj.staleStages()
+                forceFlag = False
+
+                if len(staleList) == 0:
+                    print(Fore.GREEN + "All files are up to date." + Style.RESET_ALL)
+                    if not self.skipFlag:
+                        recreateInp = input(
+                            "Did" + Fore.CYAN + " tblXmain_transactions" + Style.RESET_ALL + " get Updated? Y/N:" + Fore.RED + " [Y will recreate all files]: " + Style.RESET_ALL)
+                        forceFlag = recreateInp.lower() == "y"
+
+                if len(staleList) > 0 or forceFlag:
+                    if len(staleList) > 0:
+                        print(Fore.YELLOW + "Out of date: " + Fore.CYAN + f"{', '.join(staleList)}" + Style.RESET_ALL)
+                    paramGrid = None
+                    if ("model" in staleList or forceFlag) and not self.skipFlag:
+                        methodChoice = input(
+                            "Do you want to train the model with " + Fore.CYAN + "[O]" + Style.RESET_ALL + "ptimal (Est. 4 Hours), " + Fore.CYAN + "[F]" + Style.RESET_ALL + "ast (Est. 5 Min) or the " + Fore.CYAN + "[P]" + Style.RESET_ALL + "revious parameters if it needs to be rebuilt?: ").lower()
+                        paramGrid = {"o": "optimal", "f": "fast"}.get(methodChoice)
+
+                    self.loadingAnimator = loadingAnimator("Rebuilding Out of Date Files...",
+                                                           "Rebuilding Out of Date Files Complete",
+                                                           "Rebuilding Out of Date Files Failed").start()
+                    rebuiltList = graphObj.build(paramGrid=paramGrid, force=forceFlag)
+                    self.loadingAnimator.stop()
+                    print(Fore.GREEN + f"Rebuilt: {', '.join(rebuiltList) if len(rebuiltList) > 0 else 'nothing'}"
+                          + Style.RESET_ALL)
+            except Exception as e:
+                try:
+                    self.loadingAnimator.stop(method="error")
+                except:
+                    pass
+                if self.DebugFlag:
+                    print(Fore.RED + f"DEBUG MESSAGE::: {e}")
+                print(Fore.RED + "Dependency check failed, continuing with the files that exist." + Style.RESET_ALL)
+
             self.dividerSmall(title="dfClean Data")
 
            
             try:
-                if reloadFlag:
-                    raise "Pass"
-
                 self.loadingAnimator = loadingAnimator("Loading dfClean...", "Loading dfClean Complete",
                                                        "Loading dfClean Failed",
                                                        0.05).start()
 
                 fileName = directoryScanner("dfClean", self.docPath, Folder="Data", returnMethod="Last",
                                             loadingAnimator=self.loadingAnimator, skipFlag=self.skipFlag)
-                self.sourceObj = dataFrameLoader(fileName, self.docPath, "Data", verbose=self.verboseFlagBool)
+                self.sourceObj = dataFrameLoader(fileName, self.docPath, "Data", verbose=self.verboseFlagBool,
+                                                 columns=PortfolioScorer.cleanColumns, lazy=True)
+                self.cleanIndex = None
                 self.loadingAnimator.stop()
             except Exception as e:
                 try:
@@ -677,58 +810,44 @@ class GraphicalUserInterface:
                     pass
                 if self.DebugFlag:
                     print(Fore.RED + f"DEBUG MESSAGE::: {e}") 
-                if not reloadFlag:
-                    if input(
-                            Fore.RED + "[dfClean] not found!!! " + Style.RESET_ALL + "Do you want to create this file? Y/N:").lower() == "y":
-                        print(
-                            Fore.YELLOW + f"Make sure " + Fore.CYAN + "[tblXmain_transactions.csv]" + Fore.YELLOW + " exists the folder: \n" + Fore.CYAN + f"  {self.docPath.joinpath('Data')}" + Style.RESET_ALL)
-                        if not self.skipFlag:
-                            input(
-                                "Press [enter] to continue" + " (Est. Time = 2 Minutes)..." + Style.RESET_ALL)
-
-                        self.loadingAnimator = loadingAnimator("Cleaning Data Set...", "Cleaning Complete",
-                                                               "Cleaning Failed").start()
-                        DataCleaner("tblXmain_transactions.csv",
-                                    f"dfClean{datetime.datetime.today().strftime('%m%d%Y_%H%M%S')}.csv", "Data",
-                                    path=self.docPath, verbose=self.verboseFlagBool)
-                        self.loadingAnimator.stop()
-                    else:
-                        print(
-                            Fore.RED + f"\nAction cancelled please make " + Fore.CYAN + "[dfClean.csv]" + Fore.RED + " exists in \n" + Fore.CYAN + f"  {self.docPath.joinpath('Data')}" + Style.RESET_ALL)
-                        print(Fore.RED + "Closing Application in 3 seconds" + Style.RESET_ALL)
-                        time.sleep(3)
-                        self.exitFlag = True
-                        return
-                else:
+                if input(
+                        Fore.RED + "[dfClean] not found or corrupted!!! " + Style.RESET_ALL + "Do you want to create this file? Y/N:").lower() == "y":
                     print(
-                        Fore.GREEN + "Rebuilding CleanDF" + Fore.YELLOW + f"Make sure " + Fore.CYAN + "[tblXmain_transactions.csv]" + Fore.YELLOW + " exists the folder: \n" + Fore.CYAN + f"  {self.docPath.joinpath('Data')}" + Style.RESET_ALL)
+                        Fore.YELLOW + f"Make sure " + Fore.CYAN + "[tblXmain_transactions.csv]" + Fore.YELLOW + " exists the folder: \n" + Fore.CYAN + f"  {self.docPath.joinpath('Data')}" + Style.RESET_ALL)
                     if not self.skipFlag:
-                        input("Press [enter] to continue" + " (Est. Time = 2 Minutes)..." + Style.RESET_ALL)
+                        input(
+                            "Press [enter] to continue" + " (Est. Time = 2 Minutes)..." + Style.RESET_ALL)
+
                     self.loadingAnimator = loadingAnimator("Cleaning Data Set...", "Cleaning Complete",
                                                            "Cleaning Failed").start()
-                    fileName = directoryScanner("tblXmain_transactions", self.docPath, Folder="Data",
-                                                returnMethod="Last", loadingAnimator=self.loadingAnimator,
-                                                skipFlag=self.skipFlag)
-                    DataCleaner(fileName, f"dfClean{datetime.datetime.today().strftime('%m%d%Y_%H%M%S')}.csv", "Data",
+                    DataCleaner("tblXmain_transactions.csv",
+                                f"dfClean{datetime.datetime.today().strftime('%m%d%Y_%H%M%S')}.parquet", "Data",
                                 path=self.docPath, verbose=self.verboseFlagBool)
                     self.loadingAnimator.stop()
+                else:
+                    print(
+                        Fore.RED + f"\nAction cancelled please make " + Fore.CYAN + "[dfClean.parquet]" + Fore.RED + " exists in \n" + Fore.CYAN + f"  {self.docPath.joinpath('Data')}" + Style.RESET_ALL)
+                    print(Fore.RED + "Closing Application in 3 seconds" + Style.RESET_ALL)
+                    time.sleep(3)
+                    self.exitFlag = True
+                    return
 
             self.dividerSmall(title="dfDummy & dfTarget Data")
 
            
             try:
-                if reloadFlag:
-                    raise "Pass"
-
                 self.loadingAnimator = loadingAnimator("Loading dfDummy and dfTarget...",
                                                        "Loading dfDummy and dfTarget Complete",
                                                        "Loading dfDummy and dfTarget Failed").start()
                 fileName = directoryScanner("dfDummy", self.docPath, Folder="Data", returnMethod="Last",
                                             loadingAnimator=self.loadingAnimator, skipFlag=self.skipFlag)
-                self.dummyObj = dataFrameLoader(fileName, self.docPath, "Data", verbose=self.verboseFlagBool)
+                self.dummyObj = dataFrameLoader(fileName, self.docPath, "Data", verbose=self.verboseFlagBool,
+                                                memoryMap=True, lazy=True)
                 fileName = directoryScanner("dfTarget", self.docPath, Folder="Data", returnMethod="Last",
                                             loadingAnimator=self.loadingAnimator, skipFlag=self.skipFlag)
-                self.targetObj = dataFrameLoader(fileName, self.docPath, "Data", verbose=self.verboseFlagBool)
+                self.targetObj = dataFrameLoader(fileName, self.docPath, "Data", verbose=self.verboseFlagBool,
+                                                 memoryMap=True, lazy=True)
+                self.dummyIndex = None
                 self.loadingAnimator.stop()
             except Exception as e:
                 try:
@@ -737,60 +856,42 @@ class GraphicalUserInterface:
                     pass
                 if self.DebugFlag:
                     print(Fore.RED + f"DEBUG MESSAGE::: {e}") 
-                if not reloadFlag:
-                    if input(
-                            Fore.RED + "[dfDummy] or [dfTarget] not found!!! " + Style.RESET_ALL + f"Do you want to create this file? Y/N:").lower() == "y":
-                        print(
-                            Fore.YELLOW + f"Make sure " + Fore.CYAN + "[dfClean.csv]" + Fore.YELLOW + " exists in the folder: \n" + Fore.CYAN + f"  {self.docPath.joinpath('Data')}" + Style.RESET_ALL)
-                        if not self.skipFlag:
-                            input(
-                                "Press [enter] to continue " + " (Est. Time = 1 Minute)..." + Style.RESET_ALL)
-
-                        self.loadingAnimator = loadingAnimator("Machine Learning Preparation...",
-                                                               "Machine Learning Preparation Complete",
-                                                               "Machine Learning Preparation Failed").start()
-                        fileName = directoryScanner("dfClean", self.docPath, Folder="Data", returnMethod="Last",
-                                                    loadingAnimator=self.loadingAnimator, skipFlag=self.skipFlag)
-                        dataMLPrep(fileName, f"dfDummy{datetime.datetime.today().strftime('%m%d%Y_%H%M%S')}.csv",
-                                   f"dfTarget{datetime.datetime.today().strftime('%m%d%Y_%H%M%S')}.csv", "Data",
-                                   self.docPath,
-                                   verbose=self.verboseFlagBool)
-                        self.loadingAnimator.stop()
-                    else:
-                        print(
-                            Fore.RED + f"\n Action cancelled please make sure " + Fore.CYAN + "[dfDummy.csv]" + Fore.RED + " and " + Fore.CYAN + "[dfTarget.csv]" + Fore.RED + " exist in \n" + Fore.CYAN + f"  {self.docPath.joinpath('Data')}" + Style.RESET_ALL)
-                        print(Fore.RED + "Closing Application in 3 seconds" + Style.RESET_ALL)
-                        time.sleep(3)
-                        self.exitFlag = True
-                        return
-                else:
+                if input(
+                        Fore.RED + "[dfDummy] or [dfTarget] not found or corrupted!!! " + Style.RESET_ALL + f"Do you want to create this file? Y/N:").lower() == "y":
                     print(
-                        Fore.GREEN + "Rebuilding dfDummy and dfTarget. " + Fore.YELLOW + f"Make sure " + Fore.CYAN + "[dfClean.csv]" + Fore.YELLOW + " exists in the folder: \n" + Fore.CYAN + f"  {self.docPath.joinpath('Data')}" + Style.RESET_ALL)
+                        Fore.YELLOW + f"Make sure " + Fore.CYAN + "[dfClean.parquet]" + Fore.YELLOW + " exists in the folder: \n" + Fore.CYAN + f"  {self.docPath.joinpath('Data')}" + Style.RESET_ALL)
                     if not self.skipFlag:
-                        input("Press [enter] to continue " + " (Est. Time = 1 Minute)..." + Style.RESET_ALL)
+                        input(
+                            "Press [enter] to continue " + " (Est. Time = 1 Minute)..." + Style.RESET_ALL)
+
                     self.loadingAnimator = loadingAnimator("Machine Learning Preparation...",
                                                            "Machine Learning Preparation Complete",
                                                            "Machine Learning Preparation Failed").start()
                     fileName = directoryScanner("dfClean", self.docPath, Folder="Data", returnMethod="Last",
                                                 loadingAnimator=self.loadingAnimator, skipFlag=self.skipFlag)
-                    dataMLPrep(fileName, f"dfDummy{datetime.datetime.today().strftime('%m%d%Y_%H%M%S')}.csv",
-                               f"dfTarget{datetime.datetime.today().strftime('%m%d%Y_%H%M%S')}.csv", "Data",
+                    dataMLPrep(fileName, f"dfDummy{datetime.datetime.today().strftime('%m%d%Y_%H%M%S')}.parquet",
+                               f"dfTarget{datetime.datetime.today().strftime('%m%d%Y_%H%M%S')}.parquet", "Data",
                                self.docPath,
-                               verbose=self.verboseFlagBool)
+                               verbose=self.verboseFlagBool,
+                               exportEncoderName=f"encoder{datetime.datetime.today().strftime('%m%d%Y_%H%M%S')}.sav")
                     self.loadingAnimator.stop()
+                else:
+                    print(
+                        Fore.RED + f"\n Action cancelled please make sure " + Fore.CYAN + "[dfDummy.parquet]" + Fore.RED + " and " + Fore.CYAN + "[dfTarget.parquet]" + Fore.RED + " exist in \n" + Fore.CYAN + f"  {self.docPath.joinpath('Data')}" + Style.RESET_ALL)
+                    print(Fore.RED + "Closing Application in 3 seconds" + Style.RESET_ALL)
+                    time.sleep(3)
+                    self.exitFlag = True
+                    return
 
             self.dividerSmall(title="Scaling Model")
 
            
             try:
-                if reloadFlag and retrainFlag:
-                    raise "Pass"
-
                 self.loadingAnimator = loadingAnimator("Loading Scaling Model...", "Loading Scaling Model Complete",
                                                        "Loading Scaling Model Failed").start()
                 fileName = directoryScanner("scaler", self.docPath, Folder="Data", returnMethod="Last",
                                             loadingAnimator=self.loadingAnimator, skipFlag=self.skipFlag)
-                self.scalerObj = modelLoader(fileName, self.docPath, "Data", verbose=self.verboseFlagBool)
+                self.scalerObj = modelLoader(fileName, self.docPath, "Data", verbose=self.verboseFlagBool, lazy=True)
                 self.loadingAnimator.stop()
             except Exception as e:
                 try:
@@ -799,49 +900,41 @@ class GraphicalUserInterface:
                     pass
                 if self.DebugFlag:
                     print(Fore.RED + f"DEBUG MESSAGE::: {e}") 
-                if not reloadFlag and not retrainFlag:
+                self.loadingAnimator.stop()
+                if input(
+                        Fore.RED + "[scaler.sav] not found or corrupted!!! " + Style.RESET_ALL + f"Do you want to create this file? Y/N:").lower() == "y":
+                    print(
+                        Fore.YELLOW + f"Make sure " + Fore.CYAN + "[dfDummy.parquet]" + Fore.YELLOW + " exists in the folder: \n" + Fore.CYAN + f"  {self.docPath.joinpath('Data')}" + Style.RESET_ALL)
+                    if not self.skipFlag:
+                        input(
+                            "Press [enter] to continue " + " (Est. Time = 30 Seconds)..." + Style.RESET_ALL)
+
+                    self.loadingAnimator = loadingAnimator("Creating Scaling Model...",
+                                                           "Creating Scaling Model Complete",
+                                                           "Creating Scaling Model Failed").start()
+                    fileName = directoryScanner("dfDummy", self.docPath, Folder="Data", returnMethod="Last",
+                                                loadingAnimator=self.loadingAnimator, skipFlag=self.skipFlag)
+                    self.scalerObj = dataScaler(fileName,
+                                                f"scaler{datetime.datetime.today().strftime('%m%d%Y_%H%M%S')}.sav",
+                                                self.docPath, "Data")
                     self.loadingAnimator.stop()
-                    if input(
-                            Fore.RED + "[scaler.sav] not found or corrupted!!! " + Style.RESET_ALL + f"Do you want to create this file? Y/N:").lower() == "y":
-                        print(
-                            Fore.YELLOW + f"Make sure " + Fore.CYAN + "[dfDummy.csv]" + Fore.YELLOW + " exists in the folder: \n" + Fore.CYAN + f"  {self.docPath.joinpath('Data')}" + Style.RESET_ALL)
-                        if not self.skipFlag:
-                            input(
-                                "Press [enter] to continue " + " (Est. Time = 30 Seconds)..." + Style.RESET_ALL)
-
-                        self.loadingAnimator = loadingAnimator("Creating Scaling Model...",
-                                                               "Creating Scaling Model Complete",
-                                                               "Creating Scaling Model Failed").start()
-                        fileName = directoryScanner("dfDummy", self.docPath, Folder="Data", returnMethod="Last",
-                                                    loadingAnimator=self.loadingAnimator, skipFlag=self.skipFlag)
-                        self.scalerObj = dataScaler(fileName,
-                                                    f"scaler{datetime.datetime.today().strftime('%m%d%Y_%H%M%S')}.sav",
-                                                    self.docPath, "Data")
-                        self.loadingAnimator.stop()
-                    else:
-                        print(
-                            Fore.RED + f"\n Action cancelled please make " + Fore.CYAN + "[scaler.sav]" + Fore.RED + " exists in \n" + Fore.CYAN + f"  {self.docPath.joinpath('Data')}" + Style.RESET_ALL)
-                        print(Fore.RED + "Closing Application in 3 seconds" + Style.RESET_ALL)
-                        time.sleep(3)
-                        self.exitFlag = True
-                        return
                 else:
                     print(
-                        Fore.CYAN + "Scaler Model will be retrained in the next section.")
-                    pass
+                        Fore.RED + f"\n Action cancelled please make " + Fore.CYAN + "[scaler.sav]" + Fore.RED + " exists in \n" + Fore.CYAN + f"  {self.docPath.joinpath('Data')}" + Style.RESET_ALL)
+                    print(Fore.RED + "Closing Application in 3 seconds" + Style.RESET_ALL)
+                    time.sleep(3)
+                    self.exitFlag = True
+                    return
 
             self.dividerSmall(title="Machine Learning Model")
 
            
             try:
-                if reloadFlag and retrainFlag:
-                    raise "Pass"
-
                 self.loadingAnimator = loadingAnimator("Loading ML Model...", "Loading ML Model Complete",
                                                        "Loading ML Model Failed").start()
                 fileName = directoryScanner("model", self.docPath, Folder="Data", returnMethod="Last",
                                             loadingAnimator=self.loadingAnimator, skipFlag=self.skipFlag)
-                self.modelObj = modelLoader(fileName, self.docPath, "Data", verbose=self.verboseFlagBool)
+                self.modelObj = modelLoader(fileName, self.docPath, "Data", verbose=self.verboseFlagBool, lazy=True)
                 self.loadingAnimator.stop()
             except Exception as e:
                 try:
@@ -850,181 +943,147 @@ class GraphicalUserInterface:
                     pass
                 if self.DebugFlag:
                     print(Fore.RED + f"DEBUG MESSAGE::: {e}") 
-                if not reloadFlag and not retrainFlag:
-                    methodChoice = input(
-                        Fore.RED + "[model.sav] not found or corrupted!!! " + Style.RESET_ALL + "\nDo you want to create this file using " + Fore.CYAN + "[O]" + Style.RESET_ALL + "ptimal, (Est. 4 Hours)" + Fore.CYAN + "[F]" + Style.RESET_ALL + "ast (Est. 5 min), or " + Fore.CYAN + "[C]" + Style.RESET_ALL + "ustom parameters? or " + Fore.CYAN + "[E]" + Style.RESET_ALL + "xit this action?:")
-                    if methodChoice.lower() == "o":
-                        print(
-                            Fore.YELLOW + f"Make sure " + Fore.CYAN + "[dfDummy.csv]" + Fore.YELLOW + " and " + Fore.CYAN + "[dfTarget.csv]" + Fore.YELLOW + " exist in the folder: \n" + Fore.CYAN + f"  {self.docPath.joinpath('Data')}" + Style.RESET_ALL)
-                        if not self.skipFlag:
-                            input(
-                                "Press [enter] to continue or Ctrl+C to cancel " + Style.RESET_ALL)
-
-                        self.loadingAnimator = loadingAnimator("Creating ML Model...",
-                                                               "Creating ML Model Complete",
-                                                               "Creating ML Model Failed").start()
-                        fileName = directoryScanner("dfDummy", self.docPath, Folder="Data", returnMethod="Last",
-                                                    loadingAnimator=self.loadingAnimator, skipFlag=self.skipFlag)
-                        self.scalerObj = dataScaler(fileName,
-                                                    f"scaler{datetime.datetime.today().strftime('%m%d%Y_%H%M%S')}.sav",
-                                                    self.docPath, "Data")
-                        fileName = directoryScanner("dfTarget", self.docPath, Folder="Data", returnMethod="Last",
-                                                    loadingAnimator=self.loadingAnimator, skipFlag=self.skipFlag)
-                        machineLearner(self.scalerObj.scaledDf, fileName,
-                                       f"model{datetime.datetime.today().strftime('%m%d%Y_%H%M%S')}.sav", self.docPath,
-                                       ParamGrid="optimal",
-                                       Folder="Data")
-                        self.loadingAnimator.stop()
-                    elif methodChoice.lower() == "f":
-                        if not self.skipFlag:
-                            input(
-                                "Press [enter] to continue or Ctrl+C to cancel " + Style.RESET_ALL)
-
-                        self.loadingAnimator = loadingAnimator("Creating ML Model...",
-                                                               "Creating ML Model Complete",
-                                                               "Creating ML Model Failed").start()
-                        fileName = directoryScanner("dfDummy", self.docPath, Folder="Data", returnMethod="Last",
-                                                    loadingAnimator=self.loadingAnimator, skipFlag=self.skipFlag)
-                        self.scalerObj = dataScaler(fileName,
-                                                    f"scaler{datetime.datetime.today().strftime('%m%d%Y_%H%M%S')}.sav",
-                                                    self.docPath, "Data")
-                        fileName = directoryScanner("dfTarget", self.docPath, Folder="Data", returnMethod="Last",
-                                                    loadingAnimator=self.loadingAnimator, skipFlag=self.skipFlag)
-                        machineLearner(self.scalerObj.scaledDf, fileName,
-                                       f"model{datetime.datetime.today().strftime('%m%d%Y_%H%M%S')}.sav", self.docPath,
-                                       ParamGrid="fast",
-                                       Folder="Data")
-                        self.loadingAnimator.stop()
-                    elif methodChoice.lower() == "c":
-                        n_estimatorsInp = input("\nPlease input an integer to denote the N estimators: ")
-                        max_depthInp = input("\nPlease input an integer to denote the max tree depth: ")
-
-                        ParamGrid = {"n_estimators": [n_estimatorsInp],
-                                     "max_depth": [max_depthInp],
-                                     "alpha": [1],
-                                     "learning_rate": [0.1],
-                                     "colsample_bytree": [0.8],
-                                     "lambda": [1],
-                                     "subsample": [1]}
-
-                        if not self.skipFlag:
-                            input(
-                                f"Press [enter] to continue learning with" + Fore.CYAN + f"N_est = {n_estimatorsInp}" + Style.RESET_ALL + " and " +
-                                Fore.CYAN + f"Max depth = {max_depthInp}" + Style.RESET_ALL + " or Ctrl+C to cancel...")
-
-                        self.loadingAnimator = loadingAnimator("Creating ML Model...",
-                                                               "Creating ML Model Complete",
-                                                               "Creating ML Model Failed").start()
-                        fileName = directoryScanner("dfDummy", self.docPath, Folder="Data", returnMethod="Last",
-                                                    loadingAnimator=self.loadingAnimator, skipFlag=self.skipFlag)
-                        self.scalerObj = dataScaler(fileName,
-                                                    f"scaler{datetime.datetime.today().strftime('%m%d%Y_%H%M%S')}.sav",
-                                                    self.docPath, "Data")
-                        fileName = directoryScanner("dfTarget", self.docPath, Folder="Data", returnMethod="Last",
-                                                    loadingAnimator=self.loadingAnimator, skipFlag=self.skipFlag)
-                        machineLearner(self.scalerObj.scaledDf, fileName,
-                                       f"model{datetime.datetime.today().strftime('%m%d%Y_%H%M%S')}.sav", self.docPath,
-                                       ParamGrid=ParamGrid,
-                                       Folder="Data")
-                        self.loadingAnimator.stop()
-                    else:
-                        print(
-                            Fore.RED + f"\n Action cancelled please make " + Fore.CYAN + "[model.sav]" + Fore.RED + " exists in \n" + Fore.CYAN + f"  {self.docPath.joinpath('Data')}" + Style.RESET_ALL)
-                        print(Fore.RED + "Closing Application in 3 seconds" + Style.RESET_ALL)
-                        time.sleep(3)
-                        self.exitFlag = True
-                        return
+                methodChoice = input(
+                    Fore.RED + "[model.sav] not found or corrupted!!! " + Style.RESET_ALL + "\nDo you want to create this file using " + Fore.CYAN + "[O]" + Style.RESET_ALL + "ptimal, (Est. 4 Hours)" + Fore.CYAN + "[F]" + Style.RESET_ALL + "ast (Est. 5 min), or " + Fore.CYAN + "[C]" + Style.RESET_ALL + "ustom parameters? or " + Fore.CYAN + "[E]" + Style.RESET_ALL + "xit this action?:")
+                if methodChoice.lower() == "o":
+                    print(
+                        Fore.YELLOW + f"Make sure " + Fore.CYAN + "[dfDummy.parquet]" + Fore.YELLOW + " and " + Fore.CYAN + "[dfTarget.parquet]" + Fore.YELLOW + " exist in the folder: \n" + Fore.CYAN + f"  {self.docPath.joinpath('Data')}" + Style.RESET_ALL)
+                    if not self.skipFlag:
+                        input(
+                            "Press [enter] to continue or Ctrl+C to cancel " + Style.RESET_ALL)
+
+                    self.loadingAnimator = loadingAnimator("Creating ML Model...",
+                                                           "Creating ML Model Complete",
+                                                           "Creating ML Model Failed").start()
+                    fileName = directoryScanner("dfDummy", self.docPath, Folder="Data", returnMethod="Last",
+                                                loadingAnimator=self.loadingAnimator, skipFlag=self.skipFlag)
+                    self.scalerObj = dataScaler(fileName,
+                                                f"scaler{datetime.datetime.today().strftime('%m%d%Y_%H%M%S')}.sav",
+                                                self.docPath, "Data")
+                    fileName = directoryScanner("dfTarget", self.docPath, Folder="Data", returnMethod="Last",
+                                                loadingAnimator=self.loadingAnimator, skipFlag=self.skipFlag)
+                    machineLearner(self.scalerObj.scaledDf, fileName,
+                                   f"model{datetime.datetime.today().strftime('%m%d%Y_%H%M%S')}.sav", self.docPath,
+                                   ParamGrid="optimal",
+                                   Folder="Data")
+                    self.loadingAnimator.stop()
+                elif methodChoice.lower() == "f":
+                    if not self.skipFlag:
+                        input(
+                            "Press [enter] to continue or Ctrl+C to cancel " + Style.RESET_ALL)
+
+                    self.loadingAnimator = loadingAnimator("Creating ML Model...",
+                                                           "Creating ML Model Complete",
+                                                           "Creating ML Model Failed").start()
+                    fileName = directoryScanner("dfDummy", self.docPath, Folder="Data", returnMethod="Last",
+                                                loadingAnimator=self.loadingAnimator, skipFlag=self.skipFlag)
+                    self.scalerObj = dataScaler(fileName,
+                                                f"scaler{datetime.datetime.today().strftime('%m%d%Y_%H%M%S')}.sav",
+                                                self.docPath, "Data")
+                    fileName = directoryScanner("dfTarget", self.docPath, Folder="Data", returnMethod="Last",
+                                                loadingAnimator=self.loadingAnimator, skipFlag=self.skipFlag)
+                    machineLearner(self.scalerObj.scaledDf, fileName,
+                                   f"model{datetime.datetime.today().strftime('%m%d%Y_%H%M%S')}.sav", self.docPath,
+                                   ParamGrid="fast",
+                                   Folder="Data")
+                    self.loadingAnimator.stop()
+                elif methodChoice.lower() == "c":
+                    n_estimatorsInp = input("\nPlease input an integer to denote the N estimators: ")
+                    max_depthInp = input("\nPlease input an integer to denote the max tree depth: ")
+
+                    ParamGrid = {"n_estimators": [n_estimatorsInp],
+                                 "max_depth": [max_depthInp],
+                                 "alpha": [1],
+                                 "learning_rate": [0.1],
+                                 "colsample_bytree": [0.8],
+                                 "lambda": [1],
+                                 "subsample": [1]}
+
+                    if not self.skipFlag:
+                        input(
+                            f"Press [enter] to continue learning with" + Fore.CYAN + f"N_est = {n_estimatorsInp}" + Style.RESET_ALL + " and " +
+                            Fore.CYAN + f"Max depth = {max_depthInp}" + Style.RESET_ALL + " or Ctrl+C to cancel...")
+
+                    self.loadingAnimator = loadingAnimator("Creating ML Model...",
+                                                           "Creating ML Model Complete",
+                                                           "Creating ML Model Failed").start()
+                    fileName = directoryScanner("dfDummy", self.docPath, Folder="Data", returnMethod="Last",
+                                                loadingAnimator=self.loadingAnimator, skipFlag=self.skipFlag)
+                    self.scalerObj = dataScaler(fileName,
+                                                f"scaler{datetime.datetime.today().strftime('%m%d%Y_%H%M%S')}.sav",
+                                                self.docPath, "Data")
+                    fileName = directoryScanner("dfTarget", self.docPath, Folder="Data", returnMethod="Last",
+                                                loadingAnimator=self.loadingAnimator, skipFlag=self.skipFlag)
+                    machineLearner(self.scalerObj.scaledDf, fileName,
+                                   f"model{datetime.datetime.today().strftime('%m%d%Y_%H%M%S')}.sav", self.docPath,
+                                   ParamGrid=ParamGrid,
+                                   Folder="Data")
+                    self.loadingAnimator.stop()
                 else:
                     print(
-                        Fore.GREEN + "Rebuilding Scaler and Ensemble Models. " + Fore.YELLOW + f"Make sure " + Fore.CYAN + "[dfClean.csv]" + Fore.YELLOW + " exists in the folder: \n" + Fore.CYAN + f"  {self.docPath.joinpath('Data')}" + Style.RESET_ALL)
-                    methodChoice = input(
-                        "Do you want to train the model with " + Fore.CYAN + "[O]" + Style.RESET_ALL + "ptimal, " + Fore.CYAN + "[F]" + Style.RESET_ALL + "ast, or " + Fore.CYAN + "[C]" + Style.RESET_ALL + "ustom parameters?")
-                    if methodChoice.lower() == "o":
-                        print(
-                            Fore.YELLOW + f"Make sure " + Fore.CYAN + "[dfDummy.csv]" + Fore.YELLOW + " and " + Fore.CYAN + "[dfTarget.csv]" + Fore.YELLOW + " exist in the folder: \n" + Fore.CYAN + f"  {self.docPath.joinpath('Data')}" + Style.RESET_ALL)
-                        if not self.skipFlag:
-                            input(
-                                "Press [enter] to continue or Ctrl+C to cancel " + Style.RESET_ALL)
-
-                        self.loadingAnimator = loadingAnimator("Creating ML Model...",
-                                                               "Creating ML Model Complete",
-                                                               "Creating ML Model Failed").start()
-                        fileName = directoryScanner("dfDummy", self.docPath, Folder="Data", returnMethod="Last",
-                                                    loadingAnimator=self.loadingAnimator, skipFlag=self.skipFlag)
-                        self.scalerObj = dataScaler(fileName,
-                                                    f"scaler{datetime.datetime.today().strftime('%m%d%Y_%H%M%S')}.sav",
-                                                    self.docPath, "Data")
-                        fileName = directoryScanner("dfTarget", self.docPath, Folder="Data", returnMethod="Last",
-                                                    loadingAnimator=self.loadingAnimator, skipFlag=self.skipFlag)
-                        machineLearner(self.scalerObj.scaledDf, fileName,
-                                       f"model{datetime.datetime.today().strftime('%m%d%Y_%H%M%S')}.sav", self.docPath,
-                                       ParamGrid="optimal",
-                                       Folder="Data")
-                        self.loadingAnimator.stop()
-                    elif methodChoice.lower() == "f":
-                        if not self.skipFlag:
-                            input(
-                                "Press [enter] to continue or Ctrl+C to cancel " + Style.RESET_ALL)
-
-                        self.loadingAnimator = loadingAnimator("Creating ML Model...",
-                                                               "Creating ML Model Complete",
-                                                               "Creating ML Model Failed").start()
-                        fileName = directoryScanner("dfDummy", self.docPath, Folder="Data", returnMethod="Last",
-                                                    loadingAnimator=self.loadingAnimator, skipFlag=self.skipFlag)
-                        self.scalerObj = dataScaler(fileName,
-                                                    f"scaler{datetime.datetime.today().strftime('%m%d%Y_%H%M%S')}.sav",
-                                                    self.docPath, "Data")
-                        fileName = directoryScanner("dfTarget", self.docPath, Folder="Data", returnMethod="Last",
-                                                    loadingAnimator=self.loadingAnimator, skipFlag=self.skipFlag)
-                        machineLearner(self.scalerObj.scaledDf, fileName,
-                                       f"model{datetime.datetime.today().strftime('%m%d%Y_%H%M%S')}.sav", self.docPath,
-                                       ParamGrid="fast",
-                                       Folder="Data")
-                        self.loadingAnimator.stop()
-                    elif methodChoice.lower() == "c":
-                        n_estimatorsInp = input("\nPlease input an integer to denote the N estimators: ")
-                        max_depthInp = input("\nPlease input an integer to denote the max tree depth: ")
-
-                        ParamGrid = {"n_estimators": [n_estimatorsInp],
-                                     "max_depth": [max_depthInp],
-                                     "alpha": [1],
-                                     "learning_rate": [0.1],
-                                     "colsample_bytree": [0.8],
-                                     "lambda": [1],
-                                     "subsample": [1]}
-
-                        if not self.skipFlag:
-                            input(
-                                f"Press [enter] to continue learning with" + Fore.CYAN + f"N_est = {n_estimatorsInp}" + Style.RESET_ALL + " and " +
-                                Fore.CYAN + f"Max depth = {max_depthInp}" + Style.RESET_ALL + " or Ctrl+C to cancel...")
-
-                        self.loadingAnimator = loadingAnimator("Creating ML Model...",
-                                                               "Creating ML Model Complete",
-                                                               "Creating ML Model Failed").start()
-                        fileName = directoryScanner("dfDummy", self.docPath, Folder="Data", returnMethod="Last",
-                                                    loadingAnimator=self.loadingAnimator, skipFlag=self.skipFlag)
-                        self.scalerObj = dataScaler(fileName,
-                                                    f"scaler{datetime.datetime.today().strftime('%m%d%Y_%H%M%S')}.sav",
-                                                    self.docPath, "Data")
-                        fileName = directoryScanner("dfTarget", self.docPath, Folder="Data", returnMethod="Last",
-                                                    loadingAnimator=self.loadingAnimator, skipFlag=self.skipFlag)
-                        machineLearner(self.scalerObj.scaledDf, fileName,
-                                       f"model{datetime.datetime.today().strftime('%m%d%Y_%H%M%S')}.sav", self.docPath,
-                                       ParamGrid=ParamGrid,
-                                       Folder="Data")
-                        self.loadingAnimator.stop()
-                    else:
-                        print(
-                            Fore.RED + f"\n Wrong input detected" + Fore.CYAN + "[model.sav]" + Fore.RED + " exists in \n" + Fore.CYAN + f"  {self.docPath.joinpath('Data')}" + Style.RESET_ALL)
-                        print(Fore.RED + "Closing Application in 3 seconds" + Style.RESET_ALL)
-                        time.sleep(3)
-                        self.exitFlag = True
-                        return
+                        Fore.RED + f"\n Action cancelled please make " + Fore.CYAN + "[model.sav]" + Fore.RED + " exists in \n" + Fore.CYAN + f"  {self.docPath.joinpath('Data')}" + Style.RESET_ALL)
+                    print(Fore.RED + "Closing Application in 3 seconds" + Style.RESET_ALL)
+                    time.sleep(3)
+                    self.exitFlag = True
+                    return
 
-            if reloadFlag:
-                self.initFlag = True
-            else:
-                self.initFlag = False
+            self.initFlag = False
+
+    def getCleanIndex(self):
+        """
+    The getCleanIndex function returns the AccountIndex of dfClean and builds it the first time a mode needs it.
+
+    Args:
+        self: Represent the instance of the class
+
+    Returns:
+        The AccountIndex of dfClean
+
+    Doc Author:
+        Willem van der Schans, Trelent AI
+    """
+        if self.cleanIndex is None:
+            self.cleanIndex = AccountIndex(self.sourceObj.getDf(), verbose=self.verboseFlagBool)
+        return self.cleanIndex
+
+    def getDummyIndex(self):
+        """
+    The getDummyIndex function returns the AccountIndex of dfDummy and builds it the first time a mode needs it.
+
+    Args:
+        self: Represent the instance of the class
+
+    Returns:
+        The AccountIndex of dfDummy
+
+    Doc Author:
+        Willem van der Schans, Trelent AI
+    """
+        if self.dummyIndex is None:
+            self.dummyIndex = AccountIndex(self.dummyObj.getDf(), verbose=self.verboseFlagBool)
+        return self.dummyIndex
+
+    def getPredictor(self):
+        """
+    The getPredictor function returns a PaymentPredictor that works on the data sets, scaler, model and account
+    indexes the interface loaded, so the interface scores through the same code as the command line.
+
+    Args:
+        self: Represent the instance of the class
+
+    Returns:
+        A PaymentPredictor
+
+    Doc Author:
+        Willem van der Schans, Trelent AI
+    """
+        return PaymentPredictor(self.docPath, verbose=self.verboseFlagBool).useLoaded(
+            self.sourceObj.getDf(), self.dummyObj.getDf(), self.targetObj.getDf(), self.scalerObj.getModel(),
+            self.modelObj.getModel(), cleanIndex=self.getCleanIndex(), dummyIndex=self.getDummyIndex(),
+            storePaths={"dummy": self.dummyObj.getStorePath(), "target": self.targetObj.getStorePath()},
+            fileNames={"clean": self.sourceObj.getFileName(), "dummy": self.dummyObj.getFileName(),
+                       "target": self.targetObj.getFileName(), "scaler": self.scalerObj.getFileName(),
+                       "model": self.modelObj.getFileName()})
 
     @staticmethod
     def dividerSmall(title=None, method="print", padding=None, fullLength=None):
@@ -1169,6 +1228,7 @@ class loadingAnimator:
         self.error = Fore.RED + error + Style.RESET_ALL
         self.startTime = time.time()
 
+        self._stopEvent = Event()
         self._thread = Thread(target=self._animate, daemon=True)
         self.steps = [Fore.CYAN + f"⢿" + Style.RESET_ALL,
                       Fore.CYAN + f"⣻" + Style.RESET_ALL,
@@ -1202,7 +1262,8 @@ class loadingAnimator:
     def _animate(self):
         """
     The _animate function is a generator that cycles through the steps of the animation.
-    It prints out each step, and then waits for self.timeout seconds before printing out the next step.
+    It prints out each step, and then waits for self.timeout seconds before printing out the next step, or until
+    the animator is stopped.
 
     Args:
         self: Make the class methods aware of other methods and attributes within the class
@@ -1218,7 +1279,7 @@ class loadingAnimator:
                 break
             print(f"\r{self.desc} {c} T+ {datetime.timedelta(seconds=round(time.time() - self.startTime, 0))}",
                   flush=True, end="")
-            sleep(self.timeout)
+            self._stopEvent.wait(self.timeout)
 
     def __enter__(self):
         """
@@ -1257,6 +1318,9 @@ class loadingAnimator:
             """
 
         self.done = True
+        self._stopEvent.set()
+        if self._thread.is_alive():
+            self._thread.join()
         cols = get_terminal_size((80, 20)).columns
         print("\r" + " " * cols, end="", flush=True)
         if method.lower() == "error":
@@ -1265,7 +1329,6 @@ class loadingAnimator:
             pass
         else:
             print(f"\r{self.end}", flush=True)
-        time.sleep(0.5)
 
     def __exit__(self, exc_type, exc_value, tb):
         """
@@ -0,0 +1,309 @@
+#  Copyright (C) 2022-2023 - Willem van der Schans - All Rights Reserved.
+#
+#  THE CONTENTS OF THIS PROJECT ARE PROPRIETARY AND CONFIDENTIAL.
+#  UNAUTHORIZED COPYING, TRANSFERRING OR REPRODUCTION OF THE CONTENTS OF THIS PROJECT, VIA ANY MEDIUM IS STRICTLY PROHIBITED.
+#  The receipt or possession of the source code and/or any parts thereof does not convey or imply any right to use them
+#  for any purpose other than the purpose for which they were provided to you.
+#
+#  The software is provided "AS IS", without warranty of any kind, express or implied, including but not limited to
+#  the warranties of merchantability, fitness for a particular purpose and non infringement.
+#  In no event shall the authors or copyright holders be liable for any claim, damages or other liability,
+#  whether in an action of contract, tort or otherwise, arising from, out of or in connection with the software
+#  or the use or other dealings in the software.
+#
+#  The above copyright notice and this permission notice shall be included in all copies or substantial portions of the Software.
+
+import datetime
+import os
+import pickle
+import time
+from pathlib import Path
+
+import pandas as pd
+
+from PaymentPredictorUtility.Classes.PortfolioScorer import PortfolioScorer
+from PaymentPredictorUtility.Classes.ResultWriter import ResultWriter
+from PaymentPredictorUtility.Functions.Fingerprint import accountFingerprints, objectFingerprint
+
+
+class IncrementalScorer:
+
+    def __init__(self, dfClean, dfTarget, dfDummies, Model, Scaler, previousState=None, fileFormat="parquet",
+                 verbose=False):
+
+        """
+    The __init__ function scores only the accounts that changed since the previous run. Every account gets a
+    fingerprint of its dfClean rows and of its dfDummies rows with their target, and the model and scaler get one
+    shared identity. Accounts whose fingerprints match the previous state, under the same model identity, keep their
+    previous results, which are read back from the result files of the previous run. All other accounts are scored
+    with the PortfolioScorer. Without a previous state, after the model or scaler changed, when the previous run was
+    saved in another format or as csv, or when its result files cannot be read, every account is scored.
+
+    Args:
+        self: Represent the instance of the class
+        dfClean: Get the payment numbers and payment codes of every account
+        dfTarget: Get the target dataframe
+        dfDummies: Get the dummy variables of every account
+        Model: Pass the model to the class
+        Scaler: Scale the data
+        previousState: Pass the state dictionary saved by the previous run
+        fileFormat: Pass the format the results of this run are saved in
+        verbose: Print out the time each step takes
+
+    Returns:
+        Nothing
+
+    Doc Author:
+        Willem van der Schans, Trelent AI
+    """
+        self.customerDict = {}
+        self.ErrorDict = {}
+        self.accountDf = None
+        self.paymentDf = None
+        self.rescoredCount = 0
+        self.carriedCount = 0
+
+        self.__fileFormat = fileFormat
+        self.__verbose = verbose
+        self.__startTime = time.time()
+
+        self.__identity = objectFingerprint(Model, Scaler)
+        self.__fingerprints = self.__fingerprintAccounts(dfClean, dfTarget, dfDummies)
+        self.__report("Fingerprinting")
+
+        self.__scoreChanges(dfClean, dfTarget, dfDummies, Model, Scaler, previousState)
+
+    def getDF(self):
+        """
+    The getDF function returns the scoring results in the same layout the full prediction method has always written,
+    one row per acctrefno with the Accuracy, Certainty, Prediction, Payment Probability and Payment Codes columns.
+
+    Args:
+        self: Represent the instance of the class
+
+    Returns:
+        A dataframe with one row per account
+
+    Doc Author:
+        Willem van der Schans, Trelent AI
+    """
+        return pd.DataFrame.from_dict(self.customerDict, orient="index",
+                                      columns=["Accuracy", "Certainty", "Prediction", "Payment Probability",
+                                               "Payment Codes"])
+
+    def getErrorDF(self):
+        """
+    The getErrorDF function returns the accounts that could not be scored together with the error that was raised.
+
+    Args:
+        self: Represent the instance of the class
+
+    Returns:
+        A dataframe with one row per failed account
+
+    Doc Author:
+        Willem van der Schans, Trelent AI
+    """
+        return pd.DataFrame.from_dict(self.ErrorDict, orient="index", columns=["Error"])
+
+    def getState(self, runStamp):
+        """
+    The getState function returns everything the next incremental run needs, the model identity, the fingerprint of
+    every account and the runStamp and format of the results of this run. The results themselves are not part of the
+    state, the next run reads them back from the result files of this run.
+
+    Args:
+        self: Represent the instance of the class
+        runStamp: Pass the runStamp the results of this run are saved under
+
+    Returns:
+        A dictionary with the state of this run
+
+    Doc Author:
+        Willem van der Schans, Trelent AI
+    """
+        return {"identity": self.__identity,
+                "fingerprints": self.__fingerprints,
+                "runStamp": runStamp,
+                "fileFormat": self.__fileFormat}
+
+    def saveState(self, runPath, runStamp, stateName="IncrementalState"):
+        """
+    The saveState function pickles the state of this run to the folder of the run. It is called once the results are
+    on disk. The file is written under a temporary name first and then renamed, so an interrupted run never leaves a
+    half written state behind.
+
+    Args:
+        self: Represent the instance of the class
+        runPath: Specify the folder of the run
+        runStamp: Pass the runStamp the results of this run are saved under
+        stateName: Specify the name of the state file
+
+    Returns:
+        Nothing
+
+    Doc Author:
+        Willem van der Schans, Trelent AI
+    """
+        filePath = Path(runPath).joinpath(f"{stateName}{runStamp}.pkl")
+        tempPath = f"{filePath}.tmp"
+        with open(tempPath, "wb") as stateFile:
+            pickle.dump(self.getState(runStamp), stateFile, protocol=4)
+        os.replace(tempPath, filePath)
+
+    @staticmethod
+    def loadState(outputPath, stateName="IncrementalState"):
+        """
+    The loadState function looks through the full run folders in the output folder and loads the state of the run
+    with the latest runStamp. Only a state file in the Full folder of its own runStamp counts, so a copied or renamed
+    run folder never becomes the baseline, and the modification times of the folders play no part.
+
+    Args:
+        outputPath: Specify the output folder that holds the full run folders
+        stateName: Specify the name of the state file
+
+    Returns:
+        The state dictionary of the last run with the runPath of its folder, or None if there is no previous state
+
+    Doc Author:
+        Willem van der Schans, Trelent AI
+    """
+        stateList = []
+        for statePath in Path(outputPath).glob(f"Full*/{stateName}*.pkl"):
+            runStamp = statePath.stem[len(stateName):]
+            if statePath.parent.name != f"Full{runStamp}":
+                continue
+            try:
+                stateList.append((datetime.datetime.strptime(runStamp, '%m%d%Y_%H%M%S'), statePath))
+            except ValueError:
+                continue
+
+        for _, statePath in sorted(stateList, reverse=True):
+            with open(statePath, "rb") as stateFile:
+                state = pickle.load(stateFile)
+            if state.get("runStamp") == statePath.stem[len(stateName):]:
+                state["runPath"] = statePath.parent
+                return state
+        return None
+
+    def __fingerprintAccounts(self, dfClean, dfTarget, dfDummies):
+        """
+    The __fingerprintAccounts function computes the fingerprint of every account. The target is attached to the
+    dummy rows before hashing so a changed target also marks the account as changed.
+
+    Args:
+        self: Represent the instance of the class
+        dfClean: Get the rows of every account
+        dfTarget: Get the target dataframe
+        dfDummies: Get the dummy variables of every account
+
+    Returns:
+        A dataframe with a Clean and a Dummy hash per account
+
+    Doc Author:
+        Willem van der Schans, Trelent AI
+    """
+        df = dfDummies.drop(columns="target", errors="ignore")
+        df = df.assign(target=dfTarget.iloc[:, 0].reindex(df.index))
+
+        cleanHash = accountFingerprints(dfClean)
+        dummyHash = accountFingerprints(df)
+        accounts = cleanHash.index.union(dummyHash.index)
+
+        return pd.DataFrame({"Clean": cleanHash.reindex(accounts, fill_value=0),
+                             "Dummy": dummyHash.reindex(accounts, fill_value=0)})
+
+    def __scoreChanges(self, dfClean, dfTarget, dfDummies, Model, Scaler, previousState):
+        """
+    The __scoreChanges function compares the fingerprints with the previous state, scores the changed accounts and
+    merges them with the carried forward results in the order in which the accounts appear in dfClean.
+
+    Args:
+        self: Represent the instance of the class
+        dfClean: Get the payment numbers and payment codes of every account
+        dfTarget: Get the target dataframe
+        dfDummies: Get the dummy variables of every account
+        Model: Pass the model that is used to predict
+        Scaler: Scale the data
+        previousState: Pass the state dictionary saved by the previous run
+
+    Returns:
+        Nothing
+
+    Doc Author:
+        Willem van der Schans, Trelent AI
+    """
+        unchanged = set()
+        previousCustomerDict = {}
+        previousErrorDict = {}
+        previousPaymentDf = None
+        if previousState is not None and previousState["identity"] == self.__identity and \
+                previousState["fileFormat"] == self.__fileFormat and self.__fileFormat != "csv":
+            previous = previousState["fingerprints"]
+            common = self.__fingerprints.index.intersection(previous.index)
+            same = (self.__fingerprints.loc[common] == previous.loc[common]).all(axis=1)
+            try:
+                previousCustomerDict, previousErrorDict, previousPaymentDf = ResultWriter.readResults(
+                    previousState["runPath"], previousState["runStamp"], self.__fileFormat, same.index[same])
+            except (OSError, ValueError) as e:
+                if self.__verbose:
+                    print(f"Results of the previous run could not be read, every account is scored: {e}")
+            unchanged = set(previousCustomerDict.keys()) | set(previousErrorDict.keys())
+
+        uniqueList = dfClean["acctrefno"].unique()
+        changedList = [acctrefno for acctrefno in uniqueList if acctrefno not in unchanged]
+        self.__report("Comparing")
+
+        customerDict = {}
+        errorDict = {}
+        paymentList = []
+
+        if len(changedList) > 0:
+            cleanMask = dfClean["acctrefno"].isin(changedList).to_numpy()
+            dummyMask = dfDummies["acctrefno"].isin(changedList).to_numpy()
+            scorerObj = PortfolioScorer(dfClean[cleanMask], dfTarget, dfDummies[dummyMask], Model, Scaler,
+                                        verbose=self.__verbose)
+            customerDict.update(scorerObj.customerDict)
+            errorDict.update(scorerObj.ErrorDict)
+            paymentList.append(scorerObj.paymentDf)
+
+        customerDict.update(previousCustomerDict)
+        errorDict.update(previousErrorDict)
+        if previousPaymentDf is not None:
+            paymentList.append(previousPaymentDf)
+
+        for acctrefno in uniqueList:
+            if acctrefno in customerDict:
+                self.customerDict[acctrefno] = customerDict[acctrefno]
+            elif acctrefno in errorDict:
+                self.ErrorDict[acctrefno] = errorDict[acctrefno]
+
+        self.rescoredCount = len(changedList)
+        self.carriedCount = len(uniqueList) - len(changedList)
+
+        if len(paymentList) > 0:
+            self.paymentDf = pd.concat(paymentList, ignore_index=True)
+        self.accountDf = pd.DataFrame.from_dict({key: value[:2] for key, value in self.customerDict.items()},
+                                                orient="index", columns=["Accuracy", "Certainty"])
+        self.__report("Scoring")
+
+        if self.__verbose:
+            print(f"Rescored {self.rescoredCount} accounts and carried forward {self.carriedCount} accounts")
+
+    def __report(self, step):
+        """
+    The __report function prints the time a step took when verbose is set and resets the timer.
+
+    Args:
+        self: Represent the instance of the class
+        step: Name the step that was completed
+
+    Returns:
+        Nothing
+
+    Doc Author:
+        Willem van der Schans, Trelent AI
+    """
+        if self.__verbose:
+            print(f"{step} done in {round(time.time() - self.__startTime, 5)} seconds")
+        self.__startTime = time.time()
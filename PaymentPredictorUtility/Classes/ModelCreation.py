@@ -17,6 +17,7 @@ import datetime
 import os
 import pickle
 import time
+from multiprocessing.pool import ThreadPool
 from pathlib import Path
 
 import numpy as np
@@ -38,6 +39,8 @@ from sklearn.preprocessing import MinMaxScaler
 from tabulate import tabulate
 
 from colorama import Fore, init, Style
+
+from PaymentPredictorUtility.Functions.Func import readFrame
 init(autoreset=True, convert=True)
 
 
@@ -77,7 +80,7 @@ class dataScaler:
         else:
             self.__Path = self.__Path.joinpath(str(Folder))
 
-        self.df = pd.read_csv(f"{self.__Path.joinpath(dataframeFileName)}", index_col=0)
+        self.df = readFrame(self.__Path.joinpath(dataframeFileName), memoryMap=True)
 
         self.__scaler()
         self.__modelExporter(self.scaler_model, ModelFileName)
@@ -123,7 +126,7 @@ class dataScaler:
 class machineLearner:
 
     def __init__(self, inputX, inputY, modelFile, path, method="xgBoost", Gridsearch=True, tableType=None,
-                 ParamGrid=None, Folder=None, verbose=False):
+                 ParamGrid=None, Folder=None, verbose=False, workers=1):
 
         """
     The __init__ function is the first function that gets called when you create an object.
@@ -142,6 +145,7 @@ class machineLearner:
         ParamGrid: Pass a dictionary of parameters to the gridsearchcv function
         Folder: Specify the folder where the data is stored
         verbose: Print out the time it takes to run each function
+        workers: Set the number of grid search fits that run at the same time, None uses every core
 
     Returns:
         Nothing
@@ -161,6 +165,12 @@ class machineLearner:
         self.__paramGrid = None
         self.__verbose = verbose
         self.__tableType = tableType
+        self.__foldList = None
+        self.__nthread = None
+
+        if workers is None:
+            workers = os.cpu_count() or 1
+        self.__workers = max(int(workers), 1)
 
         self.__Path = Path(path)
 
@@ -170,11 +180,11 @@ class machineLearner:
             self.__Path = self.__Path.joinpath(str(Folder))
 
         if type(inputX) == str:
-            self.df = pd.read_csv(f"{self.__Path.joinpath(inputX)}", index_col=0)
+            self.df = readFrame(self.__Path.joinpath(inputX), memoryMap=True)
         else:
             self.df = inputX
         if type(inputY) == str:
-            self.target = pd.read_csv(f"{self.__Path.joinpath(inputY)}", index_col=0)
+            self.target = readFrame(self.__Path.joinpath(inputY), memoryMap=True)
         else:
             self.target = inputY
 
@@ -271,7 +281,7 @@ class machineLearner:
            
             raise ValueError
 
-    def __xgboostTrainer(self, Gridsearch, ParamGrid, Path, Folder):
+    def __xgboostTrainer(self, Gridsearch, ParamGrid):
 
         """
     The __xgboostTrainer function is the main function that runs the xgboost model.
@@ -279,14 +289,18 @@ class machineLearner:
     If Gridsearch is set to True, it will take in a dictionary of parameter values and create an exhaustive list of all possible combinations using __paramGridCreator().
     The function then uses KFold cross validation with 3 folds to train and test each combination on the training data.
     The mean accuracy score and AUC are calculated for each fold, then averaged across all folds for each epoch (combination).
+    With more than one worker every (combination, fold) pair is a job on a pool of threads, XGBoost releases the GIL
+    while it fits, and the cores are split between the jobs through the nthread of every fit. The results are read
+    back in the order of the grid, so ArgumentsEpoch and the selected parameters are the same as with one worker.
+    The fold matrices are built once per search by __foldMatrixCreator and every combination is fitted on them with
+    the hist tree method, the final model is fitted with the hist tree method as well so it is the model the
+    parameters were selected for.
     This process continues
 
     Args:
         self: Bind the object to the method
         Gridsearch: Determine whether the model should be run with a gridsearch or not
         ParamGrid: Define the grid of parameters to search over
-        Path: Define the path to save the model
-        Folder: Specify the folder to save the model in
 
     Returns:
         :
@@ -299,88 +313,84 @@ class machineLearner:
             self.__paramGridCreator(ParamGrid)
 
             kf = KFold(n_splits=3, shuffle=True, random_state=42)
+            self.__foldList = self.__foldMatrixCreator(kf)
+
+            jobList = [(epoch, fold) for epoch in range(len(self.__paramGrid))
+                       for fold in range(len(self.__foldList))]
+            jobCount = min(self.__workers, len(jobList))
+            if jobCount > 1:
+                self.__nthread = max((os.cpu_count() or 1) // jobCount, 1)
+                pool = ThreadPool(processes=jobCount)
+                foldIterator = pool.imap(self.__foldScorer, jobList)
+            else:
+                self.__nthread = None
+                pool = None
+                foldIterator = map(self.__foldScorer, jobList)
 
-            counter = 0
-            xgboost_timer_start = timeit.default_timer()
-            optimalAucFold = 0
-            verboseDict = {}
+            try:
+                counter = 0
+                xgboost_timer_start = timeit.default_timer()
+                optimalAucFold = 0
+                verboseDict = {}
 
-            for epoch in range(len(self.__paramGrid)):
+                for epoch in range(len(self.__paramGrid)):
 
-                xgboost_timer_lap = timeit.default_timer()
-               
-                xgClassifier = xgb.XGBClassifier(objective='binary:logistic',
-                                                 n_estimators=self.__paramGrid["n_estimators"][epoch],
-                                                 max_depth=self.__paramGrid["max_depth"][epoch],
-                                                 reg_alpha=self.__paramGrid["alpha"][epoch],
-                                                 learning_rate=self.__paramGrid["learning_rate"][epoch],
-                                                 colsample_bytree=self.__paramGrid["colsample_bytree"][epoch],
-                                                 reg_lambda=self.__paramGrid["lambda"][epoch],
-                                                 subsample=self.__paramGrid["subsample"][epoch],
-                                                 verbosity=0,
-                                                 use_label_encoder=False)
-
-                accFold = []
-                aucFold = []
-                try:
-                    for Train_index, Test_index in kf.split(self.__xTrain, self.__yTrain):
-                        xTrainFold, xTestFold = self.__xTrain.iloc[Train_index], self.__xTrain.iloc[Test_index]
-                        yTrainFold, yTestFold = self.__yTrain.iloc[Train_index], self.__yTrain.iloc[Test_index]
-                        xgClassifier.fit(xTrainFold, yTrainFold)
-
-                        yTestFoldPred = xgClassifier.predict(xTestFold)
-                        accFold.append(accuracy_score(yTestFold, yTestFoldPred))
-                        aucFold.append(roc_auc_score(yTestFold, yTestFoldPred))
+                    xgboost_timer_lap = timeit.default_timer()
+
+                    accFold = []
+                    aucFold = []
+                    for fold in range(len(self.__foldList)):
+                        foldAcc, foldAuc = next(foldIterator)
+                        accFold.append(foldAcc)
+                        aucFold.append(foldAuc)
 
                     meanFoldAcc = np.mean(accFold)
                     meanFoldAuc = np.mean(aucFold)
 
-                except Exception as e:
-                    raise Exception(e)
+                    if meanFoldAuc > optimalAucFold:
+                        optimalAucFold = meanFoldAuc
+                        self.Arguments = {"objective": 'binary:logistic',
+                                          "tree_method": "hist",
+                                          "n_estimators": self.__paramGrid["n_estimators"][epoch],
+                                          "max_depth": self.__paramGrid["max_depth"][epoch],
+                                          "reg_alpha": self.__paramGrid["alpha"][epoch],
+                                          "learning_rate": self.__paramGrid["learning_rate"][epoch],
+                                          "colsample_bytree": self.__paramGrid["colsample_bytree"][epoch],
+                                          "reg_lambda": self.__paramGrid["lambda"][epoch],
+                                          "subsample": self.__paramGrid["subsample"][epoch],
+                                          "verbose": 0}
+
+                    counter += 1
+                    xgboost_timer_stop = timeit.default_timer()
+
+                    if counter % 1 == 0 or counter == 1 or counter == len(self.__paramGrid):
+                        if self.__verbose:
+                            print(
+                                f"Completed Epoch {counter}/{len(self.__paramGrid)} at {datetime.datetime.now().strftime('%d/%m/%Y %H:%M:%S')} | "
+                                f"time elapsed = {str(datetime.timedelta(seconds=round(xgboost_timer_stop - xgboost_timer_start, 0)))} | "
+                                f"estimated time remaining {str(datetime.timedelta(seconds=round((xgboost_timer_stop - xgboost_timer_lap) * (len(self.__paramGrid) - counter), 0)))}")
+                    else:
+                        pass
 
-                if meanFoldAuc > optimalAucFold:
-                    optimalAucFold = meanFoldAuc
-                    self.Arguments = {"objective": 'binary:logistic',
-                                      "tree_method": "gpu_hist",
-                                      "gpu_id": 0,
-                                      "fail_on_invalid_gpu_id": 1,
-                                      "nthread": 5,
+                    epochParamGrid = {"Mean Fold Accuracy": meanFoldAcc,
+                                      "Mean Fold Auc": meanFoldAuc,
                                       "n_estimators": self.__paramGrid["n_estimators"][epoch],
                                       "max_depth": self.__paramGrid["max_depth"][epoch],
                                       "reg_alpha": self.__paramGrid["alpha"][epoch],
                                       "learning_rate": self.__paramGrid["learning_rate"][epoch],
                                       "colsample_bytree": self.__paramGrid["colsample_bytree"][epoch],
                                       "reg_lambda": self.__paramGrid["lambda"][epoch],
-                                      "subsample": self.__paramGrid["subsample"][epoch],
-                                      "verbose": 0}
-
-                counter += 1
-                xgboost_timer_stop = timeit.default_timer()
-
-                if counter % 1 == 0 or counter == 1 or counter == len(self.__paramGrid):
-                    if self.__verbose:
-                        print(
-                            f"Completed Epoch {counter}/{len(self.__paramGrid)} at {datetime.datetime.now().strftime('%d/%m/%Y %H:%M:%S')} | "
-                            f"time elapsed = {str(datetime.timedelta(seconds=round(xgboost_timer_stop - xgboost_timer_start, 0)))} | "
-                            f"estimated time remaining {str(datetime.timedelta(seconds=round((xgboost_timer_stop - xgboost_timer_lap) * (len(self.__paramGrid) - counter), 0)))}")
-                else:
-                    pass
-
-                epochParamGrid = {"Mean Fold Accuracy": meanFoldAcc,
-                                  "Mean Fold Auc": meanFoldAuc,
-                                  "n_estimators": self.__paramGrid["n_estimators"][epoch],
-                                  "max_depth": self.__paramGrid["max_depth"][epoch],
-                                  "reg_alpha": self.__paramGrid["alpha"][epoch],
-                                  "learning_rate": self.__paramGrid["learning_rate"][epoch],
-                                  "colsample_bytree": self.__paramGrid["colsample_bytree"][epoch],
-                                  "reg_lambda": self.__paramGrid["lambda"][epoch],
-                                  "subsample": self.__paramGrid["subsample"][epoch]}
-
-                verboseDict[epoch + 1] = epochParamGrid
-                self.ArgumentsEpoch = verboseDict
+                                      "subsample": self.__paramGrid["subsample"][epoch]}
+
+                    verboseDict[epoch + 1] = epochParamGrid
+                    self.ArgumentsEpoch = verboseDict
+            finally:
+                # Stops the pool when the search ends or is interrupted, every job has been read back on success
+                if pool is not None:
+                    pool.terminate()
 
-           
             xgClassifier = xgb.XGBClassifier(objective='binary:logistic',
+                                             tree_method=self.Arguments["tree_method"],
                                              n_estimators=self.Arguments["n_estimators"],
                                              max_depth=self.Arguments["max_depth"],
                                              reg_alpha=self.Arguments["reg_alpha"],
@@ -415,6 +425,7 @@ class machineLearner:
             self.ArgumentsEpoch = epochParamGrid
 
         xgClassifier.fit(self.__xTrain, self.__yTrain)
+        self.Model = xgClassifier
         if self.__verbose:
             print(f"fit done in {round(time.time() - self.startTime, 5)} seconds")
         self.startTime = time.time()
@@ -472,8 +483,7 @@ class machineLearner:
         result_bare = f"In-sample: Accuracy = {round(insampleAcc,2)}, AUC = {round(insampleAUC,2)} | Out-of-Sample: Accuracy = {round(outsampleAcc,2)}, AUC = {round(outsampleAUC,2)} \nwith parameters: {epochParamGrid}"
         file_path = Path(os.getcwd()).joinpath('Output').joinpath("Logs").joinpath(f"ModelLog{datetime.datetime.today().strftime('%Y%m%d_%H%M')}.log")
 
-        if not os.path.exists(Path(os.getcwd()).joinpath('Output').joinpath("Logs")):
-            os.mkdir(Path(os.getcwd()).joinpath('Output').joinpath("Logs"))
+        os.makedirs(Path(os.getcwd()).joinpath('Output').joinpath("Logs"), exist_ok=True)
 
         with open(file_path, 'w') as fp:
             fp.write(result_bare)
@@ -481,6 +491,72 @@ class machineLearner:
         print(result)
         print(f"Log file saved to: " + Fore.CYAN + f"{file_path}")
 
+    def __foldMatrixCreator(self, kf):
+        """
+    The __foldMatrixCreator function builds the matrices every combination of the grid search is fitted on. The
+    training data is converted from pandas once, and the quantile cuts of the hist method are sketched once on all
+    training rows. The training part of every KFold fold is quantized with those cuts, the test part is a plain
+    DMatrix. The matrices are read only while the combinations are fitted, so the jobs of a parallel search can share
+    them.
+
+    Args:
+        self: Represent the instance of the class
+        kf: Pass the KFold object that splits the training data
+
+    Returns:
+        A list with the training matrix, test matrix and test labels of every fold
+
+    Doc Author:
+        Willem van der Schans, Trelent AI
+    """
+        xArray = self.__xTrain.to_numpy(dtype="float32")
+        yArray = np.asarray(self.__yTrain).ravel()
+
+        quantileMatrix = xgb.QuantileDMatrix(xArray, yArray)
+
+        foldList = []
+        for trainIndex, testIndex in kf.split(xArray, yArray):
+            foldList.append((xgb.QuantileDMatrix(xArray[trainIndex], yArray[trainIndex], ref=quantileMatrix),
+                             xgb.DMatrix(xArray[testIndex]),
+                             yArray[testIndex]))
+        return foldList
+
+    def __foldScorer(self, job):
+        """
+    The __foldScorer function fits the parameter combination of one epoch of the grid on the training matrix of one
+    KFold fold and scores it on the test matrix of that fold. It is the job the grid search hands to its pool.
+
+    Args:
+        self: Represent the instance of the class
+        job: Pass the (epoch, fold) pair that is fitted
+
+    Returns:
+        The accuracy and AUC of the fold
+
+    Doc Author:
+        Willem van der Schans, Trelent AI
+    """
+        epoch, fold = job
+        trainMatrix, testMatrix, yTestFold = self.__foldList[fold]
+
+        foldParams = {"objective": 'binary:logistic',
+                      "tree_method": "hist",
+                      "max_depth": self.__paramGrid["max_depth"][epoch],
+                      "alpha": self.__paramGrid["alpha"][epoch],
+                      "learning_rate": self.__paramGrid["learning_rate"][epoch],
+                      "colsample_bytree": self.__paramGrid["colsample_bytree"][epoch],
+                      "lambda": self.__paramGrid["lambda"][epoch],
+                      "subsample": self.__paramGrid["subsample"][epoch],
+                      "verbosity": 0}
+        if self.__nthread is not None:
+            foldParams["nthread"] = self.__nthread
+
+        foldBooster = xgb.train(foldParams, trainMatrix,
+                                num_boost_round=int(self.__paramGrid["n_estimators"][epoch]))
+
+        yTestFoldPred = (foldBooster.predict(testMatrix) > 0.5).astype("int64")
+        return accuracy_score(yTestFold, yTestFoldPred), roc_auc_score(yTestFold, yTestFoldPred)
+
     def __KNNTrainer(self, Gridsearch):
 
         """
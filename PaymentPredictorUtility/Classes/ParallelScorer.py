@@ -0,0 +1,343 @@
+#  Copyright (C) 2022-2023 - Willem van der Schans - All Rights Reserved.
+#
+#  THE CONTENTS OF THIS PROJECT ARE PROPRIETARY AND CONFIDENTIAL.
+#  UNAUTHORIZED COPYING, TRANSFERRING OR REPRODUCTION OF THE CONTENTS OF THIS PROJECT, VIA ANY MEDIUM IS STRICTLY PROHIBITED.
+#  The receipt or possession of the source code and/or any parts thereof does not convey or imply any right to use them
+#  for any purpose other than the purpose for which they were provided to you.
+#
+#  The software is provided "AS IS", without warranty of any kind, express or implied, including but not limited to
+#  the warranties of merchantability, fitness for a particular purpose and non infringement.
+#  In no event shall the authors or copyright holders be liable for any claim, damages or other liability,
+#  whether in an action of contract, tort or otherwise, arising from, out of or in connection with the software
+#  or the use or other dealings in the software.
+#
+#  The above copyright notice and this permission notice shall be included in all copies or substantial portions of the Software.
+
+import multiprocessing
+import os
+import time
+from multiprocessing import shared_memory
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+
+from PaymentPredictorUtility.Classes.AccountIndex import AccountIndex
+from PaymentPredictorUtility.Classes.PortfolioScorer import PortfolioScorer
+
+_workerState = {}
+
+
+class ParallelScorer:
+
+    def __init__(self, dfClean, dfTarget, dfDummies, Model, Scaler, workers=None, chunkSize=25000,
+                 cleanIndex=None, dummyIndex=None, resultWriter=None, journalObj=None, storePaths=None, verbose=False):
+
+        """
+    The __init__ function scores every account in dfClean over a pool of worker processes. The accounts are split
+    into shards of chunkSize accounts and every shard is scored with the PortfolioScorer inside a worker.
+    dfClean, dfDummies and dfTarget are copied once into shared memory and every worker attaches to those blocks,
+    so the frames are never pickled. When storePaths holds the memory mapped Arrow files that dfDummies and dfTarget
+    were read from, the workers map those files themselves instead, so no copy of them is made at all and every
+    process reads the same pages. Only the row positions of a shard go to a worker and only its results come back.
+    When a resultWriter is passed the results of every shard are handed to it as soon as they arrive instead of being
+    kept in customerDict and ErrorDict. With a journalObj the shards that an earlier attempt already completed are
+    skipped and every finished shard is recorded in the journal after its results are written.
+
+    Args:
+        self: Represent the instance of the class
+        dfClean: Get the payment numbers and payment codes of every account
+        dfTarget: Get the target dataframe
+        dfDummies: Get the dummy variables of every account
+        Model: Pass the model to the class
+        Scaler: Scale the data
+        workers: Set the number of worker processes, defaults to the number of cores
+        chunkSize: Set the number of accounts in one shard
+        cleanIndex: Pass an AccountIndex of dfClean if one was already built
+        dummyIndex: Pass an AccountIndex of dfDummies if one was already built
+        resultWriter: Pass a ResultWriter that receives the results of every shard
+        journalObj: Pass a CheckpointJournal to resume an interrupted run, requires a resultWriter
+        storePaths: Pass the Arrow files of dfDummies and dfTarget in a dictionary with the keys dummy and target
+        verbose: Print out the throughput of every worker
+
+    Returns:
+        Nothing
+
+    Doc Author:
+        Willem van der Schans, Trelent AI
+    """
+        self.customerDict = {}
+        self.ErrorDict = {}
+        self.accountDf = None
+        self.paymentDf = None
+        self.workerDf = None
+
+        if workers is None:
+            workers = os.cpu_count() or 1
+
+        self.__workers = max(int(workers), 1)
+        self.__chunkSize = max(int(chunkSize), 1)
+        self.__verbose = verbose
+        self.__sharedBlocks = []
+        self.__resultWriter = resultWriter
+        self.__journalObj = journalObj
+        self.__storePaths = storePaths if storePaths is not None else {}
+
+        if cleanIndex is None:
+            cleanIndex = AccountIndex(dfClean)
+        if dummyIndex is None:
+            dummyIndex = AccountIndex(dfDummies)
+
+        try:
+            self.__scoreShards(dfClean, dfTarget, dfDummies, Model, Scaler, cleanIndex, dummyIndex)
+        finally:
+            for block in self.__sharedBlocks:
+                block.close()
+                block.unlink()
+
+    def getDF(self):
+        """
+    The getDF function returns the scoring results in the same layout the full prediction method has always written,
+    one row per acctrefno with the Accuracy, Certainty, Prediction, Payment Probability and Payment Codes columns.
+
+    Args:
+        self: Represent the instance of the class
+
+    Returns:
+        A dataframe with one row per account
+
+    Doc Author:
+        Willem van der Schans, Trelent AI
+    """
+        return pd.DataFrame.from_dict(self.customerDict, orient="index",
+                                      columns=["Accuracy", "Certainty", "Prediction", "Payment Probability",
+                                               "Payment Codes"])
+
+    def getErrorDF(self):
+        """
+    The getErrorDF function returns the accounts that could not be scored together with the error that was raised.
+
+    Args:
+        self: Represent the instance of the class
+
+    Returns:
+        A dataframe with one row per failed account
+
+    Doc Author:
+        Willem van der Schans, Trelent AI
+    """
+        return pd.DataFrame.from_dict(self.ErrorDict, orient="index", columns=["Error"])
+
+    def __scoreShards(self, dfClean, dfTarget, dfDummies, Model, Scaler, cleanIndex, dummyIndex):
+
+        """
+    The __scoreShards function shares the frames, hands the shards to the pool and merges the results. The merged
+    results are put back in the order in which the accounts appear in dfClean, the same order the single process
+    run uses.
+
+    Args:
+        self: Represent the instance of the class
+        dfClean: Get the payment numbers and payment codes of every account
+        dfTarget: Get the target dataframe
+        dfDummies: Get the dummy variables of every account
+        Model: Pass the model to the workers
+        Scaler: Pass the scaler to the workers
+        cleanIndex: Split dfClean into shards of whole accounts
+        dummyIndex: Split dfDummies into shards of whole accounts
+
+    Returns:
+        Nothing
+
+    Doc Author:
+        Willem van der Schans, Trelent AI
+    """
+        dfCleanShared = dfClean[["acctrefno", "payment_number", "transaction_code"]]
+        dfDummiesShared = dfDummies.drop(columns="target", errors="ignore").reset_index(drop=True)
+        dfTargetShared = dfTarget.iloc[:, [0]].reindex(dfDummies.index).reset_index(drop=True)
+
+        frameSpecs = {"clean": self.__shareFrame(dfCleanShared)}
+        if self.__storeMatches("dummy", dfDummiesShared) and \
+                self.__storeMatches("target", dfTargetShared) and dfTarget.index.equals(dfDummies.index):
+            frameSpecs["dummy"] = (str(self.__storePaths["dummy"]), list(dfDummiesShared.columns))
+            frameSpecs["target"] = (str(self.__storePaths["target"]), list(dfTargetShared.columns))
+        else:
+            frameSpecs["dummy"] = self.__shareFrame(dfDummiesShared)
+            frameSpecs["target"] = self.__shareFrame(dfTargetShared)
+
+        accounts = cleanIndex.getAccounts()
+        shardList = []
+        for shardNumber, start in enumerate(range(0, len(accounts), self.__chunkSize)):
+            if self.__journalObj is not None and self.__journalObj.isComplete(shardNumber):
+                continue
+            shardAccounts = accounts[start:start + self.__chunkSize]
+            shardList.append((shardNumber, cleanIndex.getRangePositions(shardAccounts[0], shardAccounts[-1]),
+                              dummyIndex.getRangePositions(shardAccounts[0], shardAccounts[-1])))
+
+        customerDict = {}
+        errorDict = {}
+        paymentList = []
+        workerStats = {}
+        startTime = time.time()
+
+        context = multiprocessing.get_context("spawn")
+        with context.Pool(processes=min(self.__workers, max(len(shardList), 1)), initializer=_initWorker,
+                          initargs=(frameSpecs, Model, Scaler)) as pool:
+            for shardCount, result in enumerate(pool.imap_unordered(_scoreShard, shardList)):
+                shardNumber, shardCustomers, shardErrors, shardPayments, workerId, shardAccounts, shardTime = result
+                if self.__journalObj is not None:
+                    self.__resultWriter.write(shardCustomers, shardErrors, paymentDf=shardPayments,
+                                              partNumber=shardNumber)
+                    self.__journalObj.record(shardNumber)
+                elif self.__resultWriter is not None:
+                    self.__resultWriter.write(shardCustomers, shardErrors, paymentDf=shardPayments)
+                else:
+                    customerDict.update(shardCustomers)
+                    errorDict.update(shardErrors)
+                    paymentList.append(shardPayments)
+
+                stats = workerStats.setdefault(workerId, [0, 0, 0.0])
+                stats[0] += 1
+                stats[1] += shardAccounts
+                stats[2] += shardTime
+
+                if self.__verbose:
+                    print(f"Shard {shardCount + 1}/{len(shardList)} completed by worker {workerId} | "
+                          f"{shardAccounts} accounts in {round(shardTime, 2)} seconds | "
+                          f"total runtime = {round(time.time() - startTime, 2)} seconds")
+
+        for acctrefno in dfClean["acctrefno"].unique():
+            if acctrefno in customerDict:
+                self.customerDict[acctrefno] = customerDict[acctrefno]
+            elif acctrefno in errorDict:
+                self.ErrorDict[acctrefno] = errorDict[acctrefno]
+
+        if len(paymentList) > 0:
+            self.paymentDf = pd.concat(paymentList, ignore_index=True)
+        self.accountDf = pd.DataFrame.from_dict({key: value[:2] for key, value in self.customerDict.items()},
+                                                orient="index", columns=["Accuracy", "Certainty"])
+
+        self.workerDf = pd.DataFrame.from_dict(workerStats, orient="index",
+                                               columns=["Shards", "Accounts", "Seconds"])
+        self.workerDf["Accounts per Second"] = (self.workerDf["Accounts"] /
+                                                self.workerDf["Seconds"].where(self.workerDf["Seconds"] > 0))
+        self.workerDf.index.name = "Worker"
+
+        if self.__verbose:
+            print(self.workerDf.round(2).to_string())
+
+    def __shareFrame(self, dataframe):
+        """
+    The __shareFrame function copies every column of a dataframe into its own shared memory block. Only numeric
+    and boolean columns can be shared this way.
+
+    Args:
+        self: Represent the instance of the class
+        dataframe: Pass the dataframe that needs to be shared
+
+    Returns:
+        A list with the column name, block name, dtype and length of every column
+
+    Doc Author:
+        Willem van der Schans, Trelent AI
+    """
+        frameSpec = []
+        for colName in dataframe.columns:
+            values = dataframe[colName].to_numpy()
+            if values.dtype.kind not in "biuf":
+                raise ValueError(f"Column {colName} with dtype {values.dtype} can not be placed in shared memory")
+
+            block = shared_memory.SharedMemory(create=True, size=max(values.nbytes, 1))
+            self.__sharedBlocks.append(block)
+            np.ndarray(values.shape, dtype=values.dtype, buffer=block.buf)[:] = values
+            frameSpec.append((colName, block.name, values.dtype.str, len(values)))
+
+        return frameSpec
+
+
+    def __storeMatches(self, frameName, dataframe):
+        """
+    The __storeMatches function checks if the Arrow file of a frame holds the same rows and at least the same
+    columns as the frame, so the workers can map the file instead of a shared copy of the frame.
+
+    Args:
+        self: Represent the instance of the class
+        frameName: Specify the key of the frame in storePaths
+        dataframe: Pass the frame the workers need
+
+    Returns:
+        True if the workers can read the frame from its Arrow file
+
+    Doc Author:
+        Willem van der Schans, Trelent AI
+    """
+        if self.__storePaths.get(frameName) is None or not os.path.exists(self.__storePaths[frameName]):
+            return False
+
+        storeTable = pa.ipc.open_file(pa.memory_map(str(self.__storePaths[frameName]), "r")).read_all()
+        return storeTable.num_rows == len(dataframe) and set(dataframe.columns).issubset(storeTable.column_names)
+
+
+def _initWorker(frameSpecs, Model, Scaler):
+    """
+The _initWorker function runs once in every worker process. It attaches to the shared memory blocks and keeps
+numpy views on them, so the worker reads the frames of the parent process without a copy. A frame that is passed
+as an Arrow file is memory mapped and read as views on the mapped columns.
+
+Args:
+    frameSpecs: Pass the shared memory layout or the Arrow file and columns of every frame
+    Model: Pass the model that is used to predict
+    Scaler: Pass the scaler that is used to scale the data
+
+Returns:
+    Nothing
+
+Doc Author:
+    Willem van der Schans, Trelent AI
+"""
+    _workerState["blocks"] = []
+    _workerState["frames"] = {}
+    _workerState["model"] = Model
+    _workerState["scaler"] = Scaler
+
+    for frameName, frameSpec in frameSpecs.items():
+        if isinstance(frameSpec, tuple):
+            storePath, columnList = frameSpec
+            storeDf = pa.ipc.open_file(pa.memory_map(storePath, "r")).read_all().to_pandas(split_blocks=True)
+            _workerState["frames"][frameName] = {colName: storeDf[colName].to_numpy() for colName in columnList}
+            continue
+
+        columns = {}
+        for colName, blockName, dtype, length in frameSpec:
+            block = shared_memory.SharedMemory(name=blockName)
+            _workerState["blocks"].append(block)
+            columns[colName] = np.ndarray((length,), dtype=np.dtype(dtype), buffer=block.buf)
+        _workerState["frames"][frameName] = columns
+
+
+def _scoreShard(shard):
+    """
+The _scoreShard function scores one shard of accounts inside a worker. The rows of the shard are gathered from
+the shared columns and passed to the PortfolioScorer.
+
+Args:
+    shard: Pass the number of the shard and its row positions in dfClean and dfDummies
+
+Returns:
+    The shard number, the customer results, errors and payment rows of the shard together with the worker id, the number of accounts
+    and the time it took
+
+Doc Author:
+    Willem van der Schans, Trelent AI
+"""
+    startTime = time.time()
+    shardNumber, cleanPositions, dummyPositions = shard
+    frames = _workerState["frames"]
+
+    dfClean = pd.DataFrame({colName: values[cleanPositions] for colName, values in frames["clean"].items()})
+    dfDummies = pd.DataFrame({colName: values[dummyPositions] for colName, values in frames["dummy"].items()})
+    dfTarget = pd.DataFrame({colName: values[dummyPositions] for colName, values in frames["target"].items()})
+
+    scorerObj = PortfolioScorer(dfClean, dfTarget, dfDummies, _workerState["model"], _workerState["scaler"])
+
+    return (shardNumber, scorerObj.customerDict, scorerObj.ErrorDict, scorerObj.paymentDf, os.getpid(),
+            len(scorerObj.customerDict) + len(scorerObj.ErrorDict), time.time() - startTime)
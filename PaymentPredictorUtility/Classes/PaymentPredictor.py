@@ -0,0 +1,629 @@
+#  Copyright (C) 2022-2023 - Willem van der Schans - All Rights Reserved.
+#
+#  THE CONTENTS OF THIS PROJECT ARE PROPRIETARY AND CONFIDENTIAL.
+#  UNAUTHORIZED COPYING, TRANSFERRING OR REPRODUCTION OF THE CONTENTS OF THIS PROJECT, VIA ANY MEDIUM IS STRICTLY PROHIBITED.
+#  The receipt or possession of the source code and/or any parts thereof does not convey or imply any right to use them
+#  for any purpose other than the purpose for which they were provided to you.
+#
+#  The software is provided "AS IS", without warranty of any kind, express or implied, including but not limited to
+#  the warranties of merchantability, fitness for a particular purpose and non infringement.
+#  In no event shall the authors or copyright holders be liable for any claim, damages or other liability,
+#  whether in an action of contract, tort or otherwise, arising from, out of or in connection with the software
+#  or the use or other dealings in the software.
+#
+#  The above copyright notice and this permission notice shall be included in all copies or substantial portions of the Software.
+
+import datetime
+import os
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from PaymentPredictorUtility.Classes.AccountIndex import AccountIndex
+from PaymentPredictorUtility.Classes.ArtifactGraph import ArtifactGraph
+from PaymentPredictorUtility.Classes.CheckpointJournal import CheckpointJournal
+from PaymentPredictorUtility.Classes.DataPrep import DataCleaner, dataMLPrep
+from PaymentPredictorUtility.Classes.IncrementalScorer import IncrementalScorer
+from PaymentPredictorUtility.Classes.ModelCreation import dataScaler, machineLearner
+from PaymentPredictorUtility.Classes.ParallelScorer import ParallelScorer
+from PaymentPredictorUtility.Classes.PortfolioScorer import PortfolioScorer
+from PaymentPredictorUtility.Classes.ResultWriter import ResultWriter
+from PaymentPredictorUtility.Classes.ScoringServer import ScoringServer
+from PaymentPredictorUtility.Classes.dataFrameLoader import dataFrameLoader
+from PaymentPredictorUtility.Classes.modelLoader import modelLoader
+from PaymentPredictorUtility.Functions.Func import directoryScanner
+
+
+class PaymentPredictor:
+
+    def __init__(self, docPath=None, verbose=False):
+
+        """
+    The __init__ function sets up the programmatic interface of the AvidPaymentPredictor. Nothing is loaded here,
+    every data set, the scaler, the model and the account indexes are loaded the first time an operation needs them
+    and kept for the lifetime of the object, so several operations can be chained on the same in-memory state without
+    reading a file twice. The latest file of every kind in the Data folder is used, the same file the interface picks
+    when manual inputs are skipped. No operation asks for input, which makes the class usable from scheduled jobs.
+
+    Args:
+        self: Represent the instance of the class
+        docPath: Specify the AvidPaymentPredictor folder, defaults to Documents/AvidPaymentPredictor
+        verbose: Print out the progress of every operation
+
+    Returns:
+        Nothing
+
+    Doc Author:
+        Willem van der Schans, Trelent AI
+    """
+        if docPath is None:
+            self.docPath = Path(os.path.expanduser('~/Documents')).joinpath("AvidPaymentPredictor")
+        else:
+            self.docPath = Path(docPath)
+        self.verbose = verbose
+
+        self.__dfClean = None
+        self.__dfDummy = None
+        self.__dfTarget = None
+        self.__scaler = None
+        self.__model = None
+        self.__cleanIndex = None
+        self.__dummyIndex = None
+        self.__storePaths = {}
+        self.__fileNames = {}
+        self.runSummary = None
+
+        os.makedirs(self.docPath.joinpath("Data"), exist_ok=True)
+        os.makedirs(self.docPath.joinpath("Output"), exist_ok=True)
+
+    def useLoaded(self, dfClean, dfDummy, dfTarget, scaler, model, cleanIndex=None, dummyIndex=None,
+                  storePaths=None, fileNames=None):
+        """
+    The useLoaded function hands the object data sets, a scaler and a model that were already loaded elsewhere, like
+    the files the interface selected, so the operations run on them instead of loading the latest files again.
+    Without the names of all five files a full run is not checkpointed, because the journal is keyed on them.
+
+    Args:
+        self: Represent the instance of the class
+        dfClean: Pass the cleaned dataframe
+        dfDummy: Pass the dummy encoded dataframe
+        dfTarget: Pass the target dataframe
+        scaler: Pass the fitted scaler
+        model: Pass the trained model
+        cleanIndex: Pass an AccountIndex of dfClean if one was already built
+        dummyIndex: Pass an AccountIndex of dfDummy if one was already built
+        storePaths: Pass the Arrow files dfDummy and dfTarget are memory mapped from
+        fileNames: Pass the names of the clean, dummy, target, scaler and model files in the Data folder
+
+    Returns:
+        The object itself
+
+    Doc Author:
+        Willem van der Schans, Trelent AI
+    """
+        self.__dfClean = dfClean
+        self.__dfDummy = dfDummy
+        self.__dfTarget = dfTarget
+        self.__scaler = scaler
+        self.__model = model
+        self.__cleanIndex = cleanIndex
+        self.__dummyIndex = dummyIndex
+        self.__storePaths = dict(storePaths) if storePaths is not None else {}
+        self.__fileNames = dict(fileNames) if fileNames is not None else {}
+        return self
+
+    def getClean(self):
+        """
+    The getClean function returns dfClean and loads the latest dfClean file the first time it is called. Only the
+    columns that scoring uses are read.
+
+    Args:
+        self: Represent the instance of the class
+
+    Returns:
+        The scoring columns of the cleaned dataframe
+
+    Doc Author:
+        Willem van der Schans, Trelent AI
+    """
+        if self.__dfClean is None:
+            loaderObj = dataFrameLoader(self.__latestFile("dfClean"), self.docPath, "Data", verbose=self.verbose,
+                                        columns=PortfolioScorer.cleanColumns)
+            self.__dfClean = loaderObj.getDf()
+            self.__fileNames["clean"] = loaderObj.getFileName()
+        return self.__dfClean
+
+    def getDummy(self):
+        """
+    The getDummy function returns dfDummy and loads the latest dfDummy file the first time it is called. The frame
+    is memory mapped from its Arrow file, which the workers of a parallel run map as well.
+
+    Args:
+        self: Represent the instance of the class
+
+    Returns:
+        The dummy encoded dataframe
+
+    Doc Author:
+        Willem van der Schans, Trelent AI
+    """
+        if self.__dfDummy is None:
+            loaderObj = dataFrameLoader(self.__latestFile("dfDummy"), self.docPath, "Data", verbose=self.verbose,
+                                        memoryMap=True)
+            self.__dfDummy = loaderObj.getDf()
+            self.__storePaths["dummy"] = loaderObj.getStorePath()
+            self.__fileNames["dummy"] = loaderObj.getFileName()
+        return self.__dfDummy
+
+    def getTarget(self):
+        """
+    The getTarget function returns dfTarget and loads the latest dfTarget file the first time it is called. The frame
+    is memory mapped from its Arrow file, which the workers of a parallel run map as well.
+
+    Args:
+        self: Represent the instance of the class
+
+    Returns:
+        The target dataframe
+
+    Doc Author:
+        Willem van der Schans, Trelent AI
+    """
+        if self.__dfTarget is None:
+            loaderObj = dataFrameLoader(self.__latestFile("dfTarget"), self.docPath, "Data", verbose=self.verbose,
+                                        memoryMap=True)
+            self.__dfTarget = loaderObj.getDf()
+            self.__storePaths["target"] = loaderObj.getStorePath()
+            self.__fileNames["target"] = loaderObj.getFileName()
+        return self.__dfTarget
+
+    def getScaler(self):
+        """
+    The getScaler function returns the scaler and loads the latest scaler file the first time it is called.
+
+    Args:
+        self: Represent the instance of the class
+
+    Returns:
+        The fitted scaler
+
+    Doc Author:
+        Willem van der Schans, Trelent AI
+    """
+        if self.__scaler is None:
+            loaderObj = modelLoader(self.__latestFile("scaler"), self.docPath, "Data", verbose=self.verbose)
+            self.__scaler = loaderObj.getModel()
+            self.__fileNames["scaler"] = loaderObj.getFileName()
+        return self.__scaler
+
+    def getModel(self):
+        """
+    The getModel function returns the model and loads the latest model file the first time it is called.
+
+    Args:
+        self: Represent the instance of the class
+
+    Returns:
+        The trained model
+
+    Doc Author:
+        Willem van der Schans, Trelent AI
+    """
+        if self.__model is None:
+            loaderObj = modelLoader(self.__latestFile("model"), self.docPath, "Data", verbose=self.verbose)
+            self.__model = loaderObj.getModel()
+            self.__fileNames["model"] = loaderObj.getFileName()
+        return self.__model
+
+    def getCleanIndex(self):
+        """
+    The getCleanIndex function returns the AccountIndex of dfClean and builds it the first time it is called.
+
+    Args:
+        self: Represent the instance of the class
+
+    Returns:
+        The AccountIndex of dfClean
+
+    Doc Author:
+        Willem van der Schans, Trelent AI
+    """
+        if self.__cleanIndex is None:
+            self.__cleanIndex = AccountIndex(self.getClean(), verbose=self.verbose)
+        return self.__cleanIndex
+
+    def getDummyIndex(self):
+        """
+    The getDummyIndex function returns the AccountIndex of dfDummy and builds it the first time it is called.
+
+    Args:
+        self: Represent the instance of the class
+
+    Returns:
+        The AccountIndex of dfDummy
+
+    Doc Author:
+        Willem van der Schans, Trelent AI
+    """
+        if self.__dummyIndex is None:
+            self.__dummyIndex = AccountIndex(self.getDummy(), verbose=self.verbose)
+        return self.__dummyIndex
+
+    def prepare(self, sourceName="tblXmain_transactions", chunkSize=None, incremental=False):
+        """
+    The prepare function rebuilds dfClean from the latest tblXmain_transactions file with the DataCleaner and then
+    dfDummy, dfTarget and the encoder registry from the new dfClean with dataMLPrep. The data sets that were loaded
+    before are dropped, so the next operation works on the new files. With incremental only the rows that are not
+    in the latest dfClean are cleaned and prepared, with the latest encoder registry, and they are appended to the
+    latest dfClean, dfDummy and dfTarget as new parts, which are moved to the new names without being rewritten.
+
+    Args:
+        self: Represent the instance of the class
+        sourceName: Specify the name of the source table in the Data folder
+        chunkSize: Set the number of rows the DataCleaner reads at once, None reads the whole file
+        incremental: Append the new rows to the latest dfClean, dfDummy and dfTarget instead of preparing every row
+
+    Returns:
+        The names of the dfClean, dfDummy, dfTarget and encoder files that were created
+
+    Doc Author:
+        Willem van der Schans, Trelent AI
+    """
+        runStamp = datetime.datetime.today().strftime('%m%d%Y_%H%M%S')
+        cleanName = f"dfClean{runStamp}.parquet"
+        dummyName = f"dfDummy{runStamp}.parquet"
+        targetName = f"dfTarget{runStamp}.parquet"
+        encoderName = f"encoder{runStamp}.sav"
+
+        if incremental:
+            previousName = self.__latestFile("dfClean")
+            previousDict = {"encoderName": self.__latestFile("encoder"),
+                            "previousDummyName": self.__latestFile("dfDummy"),
+                            "previousTargetName": self.__latestFile("dfTarget")}
+        else:
+            previousName = None
+            previousDict = {}
+
+        DataCleaner(self.__latestFile(sourceName), cleanName, "Data", path=self.docPath, verbose=self.verbose,
+                    chunkSize=chunkSize, previousName=previousName)
+        dataMLPrep(cleanName, dummyName, targetName, "Data", self.docPath, verbose=self.verbose,
+                   exportEncoderName=encoderName, **previousDict)
+
+        self.__dfClean = None
+        self.__dfDummy = None
+        self.__dfTarget = None
+        self.__cleanIndex = None
+        self.__dummyIndex = None
+        self.__storePaths = {}
+        for key in ("clean", "dummy", "target"):
+            self.__fileNames.pop(key, None)
+
+        return cleanName, dummyName, targetName, encoderName
+
+    def train(self, paramGrid="fast", workers=1):
+        """
+    The train function fits a new scaler on the latest dfDummy file and trains a new model on the scaled data and the
+    latest dfTarget file. Both are saved in the Data folder and replace the scaler and model in memory, so scoring
+    afterwards uses them without loading them again and the checkpoint journal is keyed on the new files.
+
+    Args:
+        self: Represent the instance of the class
+        paramGrid: Pass optimal, fast or a dictionary with the parameter grid
+        workers: Set the number of grid search fits that run at the same time, None uses every core
+
+    Returns:
+        The names of the scaler and model files that were created
+
+    Doc Author:
+        Willem van der Schans, Trelent AI
+    """
+        runStamp = datetime.datetime.today().strftime('%m%d%Y_%H%M%S')
+        scalerName = f"scaler{runStamp}.sav"
+        modelName = f"model{runStamp}.sav"
+
+        scalerObj = dataScaler(self.__latestFile("dfDummy"), scalerName, self.docPath, "Data")
+        learnerObj = machineLearner(scalerObj.scaledDf, self.__latestFile("dfTarget"), modelName, self.docPath,
+                                    ParamGrid=paramGrid, Folder="Data", workers=workers)
+
+        self.__scaler = scalerObj.scaler_model
+        self.__model = learnerObj.Model
+        self.__fileNames["scaler"] = scalerName
+        self.__fileNames["model"] = modelName
+
+        return scalerName, modelName
+
+    def update(self, paramGrid=None, force=False):
+        """
+    The update function rebuilds only the files in the Data folder whose inputs changed since they were built, using
+    the dependency graph of the ArtifactGraph, or every file with force. The data sets and models in memory that were
+    rebuilt are dropped, so the next operation loads the new files.
+
+    Args:
+        self: Represent the instance of the class
+        paramGrid: Pass optimal, fast or a dictionary with the parameter grid, None reuses the grid of the current
+            model
+        force: Rebuild every file, also the files that are up to date
+
+    Returns:
+        A list of the stages that were rebuilt
+
+    Doc Author:
+        Willem van der Schans, Trelent AI
+    """
+        rebuiltList = ArtifactGraph(self.docPath, verbose=self.verbose).build(paramGrid=paramGrid, force=force)
+
+        if "dfClean" in rebuiltList:
+            self.__dfClean = None
+            self.__cleanIndex = None
+            self.__fileNames.pop("clean", None)
+        if "dfDummy" in rebuiltList:
+            self.__dfDummy = None
+            self.__dfTarget = None
+            self.__dummyIndex = None
+            self.__storePaths = {}
+            self.__fileNames.pop("dummy", None)
+            self.__fileNames.pop("target", None)
+        if "scaler" in rebuiltList:
+            self.__scaler = None
+            self.__fileNames.pop("scaler", None)
+        if "model" in rebuiltList:
+            self.__model = None
+            self.__fileNames.pop("model", None)
+
+        return rebuiltList
+
+    def scoreAll(self, mode="single", workers=None, chunkSize=25000, fileFormat="parquet"):
+        """
+    The scoreAll function scores every account the same way as the Full Prediction of the interface. The single
+    mode scores one batch of accounts at a time, the parallel mode spreads the batches over worker processes and the
+    incremental mode only rescores the accounts that changed since the last incremental run. The single and parallel
+    modes keep a checkpoint journal, so a run that was interrupted continues where it stopped. The counts, the run
+    time and the scorer of the run are kept in runSummary.
+
+    Args:
+        self: Represent the instance of the class
+        mode: Choose between single, parallel and incremental
+        workers: Set the number of worker processes of the parallel mode, defaults to the number of cores
+        chunkSize: Set the number of accounts in one batch
+        fileFormat: Choose between parquet, csv and feather
+
+    Returns:
+        The folder the results were saved in
+
+    Doc Author:
+        Willem van der Schans, Trelent AI
+    """
+        if mode not in ("single", "parallel", "incremental"):
+            raise ValueError(f"Unknown scoring mode {mode}, use single, parallel or incremental")
+
+        outputPath = self.docPath.joinpath("Output")
+        runStamp = self.__runStamp(outputPath)
+        startTime = time.time()
+
+        journalObj = None
+        resumedCount = 0
+        journalKey = self.__journalKey(fileFormat) if mode != "incremental" else None
+        if journalKey is not None:
+            journalObj = CheckpointJournal(outputPath, journalKey, runStamp, chunkSize)
+            runStamp = journalObj.runStamp
+            chunkSize = journalObj.chunkSize
+            if journalObj.resumed:
+                resumedCount = len(journalObj.completedSet)
+                if self.verbose:
+                    print(f"Resuming the interrupted run Full{runStamp}, {resumedCount} batches were already completed")
+
+        runPath = outputPath.joinpath(f"Full{runStamp}")
+        os.makedirs(runPath, exist_ok=True)
+        writerObj = ResultWriter(runPath, runStamp, fileFormat=fileFormat, batchSize=chunkSize)
+
+        scorerObj = None
+        if mode == "parallel":
+            scorerObj = ParallelScorer(self.getClean(), self.getTarget(), self.getDummy(), self.getModel(),
+                                       self.getScaler(), workers=workers, chunkSize=chunkSize,
+                                       cleanIndex=self.getCleanIndex(), dummyIndex=self.getDummyIndex(),
+                                       resultWriter=writerObj, journalObj=journalObj, storePaths=self.__storePaths,
+                                       verbose=self.verbose)
+        elif mode == "incremental":
+            scorerObj = IncrementalScorer(self.getClean(), self.getTarget(), self.getDummy(), self.getModel(),
+                                          self.getScaler(), previousState=IncrementalScorer.loadState(outputPath),
+                                          fileFormat=fileFormat, verbose=self.verbose)
+            writerObj.write(scorerObj.customerDict, scorerObj.ErrorDict, paymentDf=scorerObj.paymentDf)
+        else:
+            self.__scoreInBatches(writerObj, chunkSize, journalObj)
+
+        writerObj.close()
+        if journalObj is not None:
+            journalObj.close()
+        if mode == "incremental":
+            scorerObj.saveState(runPath, runStamp)
+
+        self.runSummary = {"runPath": runPath, "mode": mode, "accountCount": writerObj.accountCount,
+                           "errorCount": writerObj.errorCount, "resumedCount": resumedCount,
+                           "runTime": time.time() - startTime, "scorerObj": scorerObj}
+
+        if self.verbose:
+            print(f"Scored {writerObj.accountCount + writerObj.errorCount} accounts in "
+                  f"{str(datetime.timedelta(seconds=round(self.runSummary['runTime'])))}, "
+                  f"{writerObj.errorCount} errors encountered")
+
+        return runPath
+
+    def scoreAccounts(self, accountList, save=True):
+        """
+    The scoreAccounts function scores a list of accounts in one pass with the PortfolioScorer on the rows of those
+    accounts only, which are taken by position from the account indexes. Account numbers that are not in dfClean are returned separately. When save is True the results,
+    errors and unknown account numbers are saved in the Individual folder of today, like a batch in the interface.
+
+    Args:
+        self: Represent the instance of the class
+        accountList: Pass the acctrefnos that need to be scored
+        save: Save the results in the Individual folder of today
+
+    Returns:
+        The results in the order of accountList, the errors and a list of the unknown account numbers
+
+    Doc Author:
+        Willem van der Schans, Trelent AI
+    """
+        accountArr = np.array(list(dict.fromkeys(accountList)), dtype=np.int64)
+        knownMask = np.isin(accountArr, self.getCleanIndex().getAccounts())
+        knownArr = accountArr[knownMask]
+        unknownList = accountArr[~knownMask].tolist()
+
+        scorerObj = PortfolioScorer(self.getClean().iloc[self.getCleanIndex().getListPositions(knownArr)],
+                                    self.getTarget(),
+                                    self.getDummy().iloc[self.getDummyIndex().getListPositions(knownArr)],
+                                    self.getModel(), self.getScaler())
+
+        df = scorerObj.getDF()
+        df = df.reindex([acctrefno for acctrefno in knownArr.tolist() if acctrefno in scorerObj.customerDict])
+        dfError = scorerObj.getErrorDF()
+
+        if save:
+            outputPath = self.docPath.joinpath('Output').joinpath(
+                f"Individual{datetime.datetime.today().strftime('%m%d%Y')}")
+            os.makedirs(outputPath, exist_ok=True)
+            batchName = f"Batch{datetime.datetime.today().strftime('%H%M%S')}"
+
+            df.to_csv(outputPath.joinpath(f"{batchName}_TestDataFrame.csv"))
+            dfError.to_csv(outputPath.joinpath(f"{batchName}_ErrorDataFrame.csv"))
+            pd.DataFrame({"Acctrefno": pd.Series(unknownList, dtype=str)}).to_csv(
+                outputPath.joinpath(f"{batchName}_UnknownDataFrame.csv"), index=False)
+
+        return df, dfError, unknownList
+
+    def serve(self, host="127.0.0.1", port=8765, block=True):
+        """
+    The serve function starts a ScoringServer on the data, model, scaler and account indexes in memory. With block
+    the server runs until Ctrl+C is pressed, otherwise it runs on a background thread and the caller stops it.
+
+    Args:
+        self: Represent the instance of the class
+        host: Specify the address to listen on
+        port: Specify the port to listen on
+        block: Serve until Ctrl+C is pressed
+
+    Returns:
+        The ScoringServer
+
+    Doc Author:
+        Willem van der Schans, Trelent AI
+    """
+        serverObj = ScoringServer(self.getClean(), self.getTarget(), self.getDummy(), self.getModel(),
+                                  self.getScaler(), cleanIndex=self.getCleanIndex(),
+                                  dummyIndex=self.getDummyIndex(), host=host, port=port, verbose=self.verbose)
+        if block:
+            serverObj.serveForever()
+        else:
+            serverObj.start()
+
+        return serverObj
+
+    def __scoreInBatches(self, writerObj, chunkSize, journalObj=None):
+        """
+    The __scoreInBatches function scores the portfolio in a single process one batch of accounts at a time and hands
+    the results of every batch to the ResultWriter. Batches that the journalObj lists as completed are skipped.
+
+    Args:
+        self: Represent the instance of the class
+        writerObj: Pass the ResultWriter that receives the results
+        chunkSize: Set the number of accounts in one batch
+        journalObj: Pass the CheckpointJournal of the run
+
+    Returns:
+        Nothing
+
+    Doc Author:
+        Willem van der Schans, Trelent AI
+    """
+        dfClean = self.getClean()
+        dfDummies = self.getDummy()
+        accounts = self.getCleanIndex().getAccounts()
+
+        for batchNumber, start in enumerate(range(0, len(accounts), chunkSize)):
+            if journalObj is not None and journalObj.isComplete(batchNumber):
+                continue
+
+            batchAccounts = accounts[start:start + chunkSize]
+            cleanPositions = self.getCleanIndex().getRangePositions(batchAccounts[0], batchAccounts[-1])
+            dummyPositions = self.getDummyIndex().getRangePositions(batchAccounts[0], batchAccounts[-1])
+
+            scorerObj = PortfolioScorer(dfClean.iloc[cleanPositions], self.getTarget(),
+                                        dfDummies.iloc[dummyPositions], self.getModel(), self.getScaler())
+            if journalObj is not None:
+                writerObj.write(scorerObj.customerDict, scorerObj.ErrorDict, paymentDf=scorerObj.paymentDf,
+                                partNumber=batchNumber)
+                journalObj.record(batchNumber)
+            else:
+                writerObj.write(scorerObj.customerDict, scorerObj.ErrorDict, paymentDf=scorerObj.paymentDf)
+
+    @staticmethod
+    def __runStamp(outputPath):
+        """
+    The __runStamp function returns the runStamp of a new full run. A run that starts in the same second as an
+    earlier run, because runs were chained, gets the second after the latest Full folder instead, so the results of
+    two runs never share a folder and the stamps keep the order of the runs.
+
+    Args:
+        outputPath: Specify the output folder that holds the full run folders
+
+    Returns:
+        The runStamp of the run
+
+    Doc Author:
+        Willem van der Schans, Trelent AI
+    """
+        runTime = datetime.datetime.today().replace(microsecond=0)
+        for runPath in Path(outputPath).glob("Full*"):
+            try:
+                folderTime = datetime.datetime.strptime(runPath.name[len("Full"):], '%m%d%Y_%H%M%S')
+            except ValueError:
+                continue
+            if folderTime >= runTime:
+                runTime = folderTime + datetime.timedelta(seconds=1)
+        return runTime.strftime('%m%d%Y_%H%M%S')
+
+    def __journalKey(self, fileFormat):
+        """
+    The __journalKey function identifies a full run for the checkpoint journal by the names and the cached content
+    hashes of the files that are scored, so the data sets in memory are never hashed.
+
+    Args:
+        self: Represent the instance of the class
+        fileFormat: Pass the output format of the run
+
+    Returns:
+        A hexadecimal sha256 string or None when the name of a file is not known
+
+    Doc Author:
+        Willem van der Schans, Trelent AI
+    """
+        for getter in (self.getClean, self.getDummy, self.getTarget, self.getScaler, self.getModel):
+            getter()
+
+        fileNameList = [self.__fileNames.get(key) for key in ("clean", "dummy", "target", "scaler", "model")]
+        if None in fileNameList:
+            return None
+
+        return ArtifactGraph(self.docPath).artifactKey(fileNameList, fileFormat)
+
+    def __latestFile(self, fileName):
+        """
+    The __latestFile function returns the name of the latest file in the Data folder that contains fileName.
+
+    Args:
+        self: Represent the instance of the class
+        fileName: Specify the name to search for
+
+    Returns:
+        The name of the latest matching file
+
+    Doc Author:
+        Willem van der Schans, Trelent AI
+    """
+        if not any(fileName.lower() in file.name.lower() for file in os.scandir(self.docPath.joinpath("Data"))):
+            raise FileNotFoundError(f"No {fileName} file found in {self.docPath.joinpath('Data')}")
+
+        return directoryScanner(fileName, self.docPath, Folder="Data", returnMethod="Last", skipFlag=True)
@@ -0,0 +1,241 @@
+#  Copyright (C) 2022-2023 - Willem van der Schans - All Rights Reserved.
+#
+#  THE CONTENTS OF THIS PROJECT ARE PROPRIETARY AND CONFIDENTIAL.
+#  UNAUTHORIZED COPYING, TRANSFERRING OR REPRODUCTION OF THE CONTENTS OF THIS PROJECT, VIA ANY MEDIUM IS STRICTLY PROHIBITED.
+#  The receipt or possession of the source code and/or any parts thereof does not convey or imply any right to use them
+#  for any purpose other than the purpose for which they were provided to you.
+#
+#  The software is provided "AS IS", without warranty of any kind, express or implied, including but not limited to
+#  the warranties of merchantability, fitness for a particular purpose and non infringement.
+#  In no event shall the authors or copyright holders be liable for any claim, damages or other liability,
+#  whether in an action of contract, tort or otherwise, arising from, out of or in connection with the software
+#  or the use or other dealings in the software.
+#
+#  The above copyright notice and this permission notice shall be included in all copies or substantial portions of the Software.
+
+import time
+
+import numpy as np
+import pandas as pd
+
+
+class PortfolioScorer:
+
+    cleanColumns = ["acctrefno", "payment_number", "transaction_code", "date_due"]
+
+    def __init__(self, dfClean, dfTarget, dfDummies, Model, Scaler, verbose=False):
+
+        """
+    The __init__ function scores every account in dfClean in one pass. Instead of scoring one acctrefno at a time
+    the whole of dfDummies is scaled once, Model.predict and Model.predict_proba are each called once and the per
+    account results are filled in with grouped array operations. The results are the same values a model scored per
+    account produces for every account. Scoring uses only the cleanColumns of dfClean, so dfClean can be loaded with
+    just those columns. When dfDummies has no rows every account of dfClean is put in ErrorDict.
+
+    Args:
+        self: Represent the instance of the class
+        dfClean: Get the payment numbers and payment codes of every account
+        dfTarget: Get the target dataframe
+        dfDummies: Get the dummy variables of every account
+        Model: Pass the model to the class
+        Scaler: Scale the data
+        verbose: Print out the time each scoring step takes
+
+    Returns:
+        Nothing
+
+    Doc Author:
+        Willem van der Schans, Trelent AI
+    """
+        self.customerDict = {}
+        self.ErrorDict = {}
+        self.accountDf = None
+        self.paymentDf = None
+
+        self.__verbose = verbose
+        self.__startTime = time.time()
+
+        if len(dfDummies) > 0:
+            self.__scorePortfolio(dfClean, dfTarget, dfDummies, Model, Scaler)
+        else:
+            # The scaler can not transform zero rows, so every account fails the way an account without rows does
+            for acctrefno in dfClean["acctrefno"].unique():
+                self.ErrorDict[acctrefno] = ValueError(f"No dummy rows found for acctrefno {acctrefno}")
+            self.paymentDf = pd.DataFrame({"acctrefno": np.array([], dtype=np.int64),
+                                           "transaction_code": dfClean["transaction_code"].to_numpy()[:0],
+                                           "Payment Probability": np.array([], dtype=np.float64),
+                                           "Prediction": np.array([], dtype=np.int64)})
+            self.accountDf = pd.DataFrame(columns=["Accuracy", "Certainty"], dtype=np.float64)
+
+    def getDF(self):
+        """
+    The getDF function returns the scoring results in the same layout the full prediction method has always written,
+    one row per acctrefno with the Accuracy, Certainty, Prediction, Payment Probability and Payment Codes columns.
+
+    Args:
+        self: Represent the instance of the class
+
+    Returns:
+        A dataframe with one row per account
+
+    Doc Author:
+        Willem van der Schans, Trelent AI
+    """
+        return pd.DataFrame.from_dict(self.customerDict, orient="index",
+                                      columns=["Accuracy", "Certainty", "Prediction", "Payment Probability",
+                                               "Payment Codes"])
+
+    def getErrorDF(self):
+        """
+    The getErrorDF function returns the accounts that could not be scored together with the error that was raised.
+
+    Args:
+        self: Represent the instance of the class
+
+    Returns:
+        A dataframe with one row per failed account
+
+    Doc Author:
+        Willem van der Schans, Trelent AI
+    """
+        return pd.DataFrame.from_dict(self.ErrorDict, orient="index", columns=["Error"])
+
+    def __scorePortfolio(self, dfClean, dfTarget, dfDummies, Model, Scaler):
+
+        """
+    The __scorePortfolio function does the actual scoring. Rows are ordered by acctrefno and payment_number with a
+    stable sort so every account becomes one contiguous block. Accuracy is the per block mean of correct
+    predictions, the last row per transaction_code of each block is moved forward by the payment number distance
+    and scored with predict_proba, after which certainty, nextPaymentProbability and paymentPrediction are
+    derived per block.
+
+    Args:
+        self: Represent the instance of the class
+        dfClean: Get the payment numbers and payment codes of every account
+        dfTarget: Get the target dataframe
+        dfDummies: Get the dummy variables of every account
+        Model: Pass the model that is used to predict
+        Scaler: Scale the data
+
+    Returns:
+        Nothing
+
+    Doc Author:
+        Willem van der Schans, Trelent AI
+    """
+        uniqueList = dfClean["acctrefno"].unique()
+
+        cleanMax = dfClean.groupby("acctrefno", sort=False)["payment_number"].max()
+        paymentCodes = dfClean[["acctrefno", "transaction_code"]].drop_duplicates()
+        paymentCodes = self.__groupArrays(paymentCodes["acctrefno"].to_numpy(),
+                                          paymentCodes["transaction_code"].to_numpy())
+
+        df = dfDummies.drop(columns="target", errors="ignore")
+        target = dfTarget.iloc[:, 0].reindex(df.index).to_numpy()
+        column_names = list(df.keys())
+        acct = df["acctrefno"].to_numpy().astype(np.int64)
+        codes = df["transaction_code"].to_numpy()
+
+        dfScaled = pd.DataFrame(data=Scaler.transform(df), columns=column_names)
+        paymentNumber = dfScaled["payment_number"].to_numpy()
+        self.__report("Scaling")
+
+        correct = Model.predict(dfScaled) == target
+        self.__report("Prediction")
+
+        order = np.lexsort((np.arange(len(acct)), paymentNumber, acct))
+        acctSorted = acct[order]
+        blockAcct, blockStart, blockSize = np.unique(acctSorted, return_index=True, return_counts=True)
+        blockAccuracy = np.add.reduceat(correct[order].astype(np.float64), blockStart) / blockSize
+        blockMin = np.minimum.reduceat(paymentNumber[order], blockStart)
+        blockMax = np.maximum.reduceat(paymentNumber[order], blockStart)
+        blockTargetNull = np.add.reduceat(pd.isnull(target[order]).astype(np.int64), blockStart) > 0
+
+        numberOfPayments = np.maximum(cleanMax.reindex(blockAcct).fillna(0).to_numpy(), blockMax)
+        numberOfPayments = np.maximum(numberOfPayments, 0)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            paymentNumberDistance = (blockMax - blockMin) / numberOfPayments
+
+        futureOrder = np.lexsort((np.arange(len(acct)), paymentNumber, codes, acct))
+        futureKey = np.stack([acct[futureOrder], codes[futureOrder]])
+        lastRow = np.ones(len(futureOrder), dtype=bool)
+        lastRow[:-1] = (futureKey[:, 1:] != futureKey[:, :-1]).any(axis=0)
+        futureRows = futureOrder[lastRow]
+        futureRows = futureRows[np.lexsort((futureRows, paymentNumber[futureRows], acct[futureRows]))]
+
+        futureBlock = np.searchsorted(blockAcct, acct[futureRows])
+        dfFuture = dfScaled.iloc[futureRows].reset_index(drop=True)
+        dfFuture["payment_number"] += paymentNumberDistance[futureBlock]
+
+        payProbability = Model.predict_proba(dfFuture)[:, 1]
+        self.__report("Future prediction")
+
+        futureStart = np.searchsorted(acct[futureRows], blockAcct)
+        futureSize = np.diff(np.append(futureStart, len(futureRows)))
+        certainty = np.add.reduceat(payProbability.astype(np.float64), futureStart) / futureSize * 100
+        nextPaymentProbability = pd.Series(payProbability).round(5).to_numpy()
+        paymentPrediction = np.where(nextPaymentProbability < 0.5, 0, 1)
+
+        self.paymentDf = pd.DataFrame({"acctrefno": acct[futureRows],
+                                       "transaction_code": codes[futureRows],
+                                       "Payment Probability": nextPaymentProbability,
+                                       "Prediction": paymentPrediction})
+
+        blockPrediction = np.split(paymentPrediction, futureStart[1:])
+        blockProbability = np.split(nextPaymentProbability, futureStart[1:])
+        blockLookup = dict(zip(blockAcct.tolist(), range(len(blockAcct))))
+
+        for acctrefno in uniqueList:
+            block = blockLookup.get(int(acctrefno))
+            if block is None:
+                self.ErrorDict[acctrefno] = ValueError(f"No dummy rows found for acctrefno {acctrefno}")
+            elif blockTargetNull[block]:
+                self.ErrorDict[acctrefno] = ValueError(f"Missing target values for acctrefno {acctrefno}")
+            else:
+                self.customerDict[acctrefno] = [float(blockAccuracy[block]),
+                                                round(float(certainty[block]), 2),
+                                                blockPrediction[block],
+                                                blockProbability[block],
+                                                paymentCodes[acctrefno]]
+
+        self.accountDf = pd.DataFrame.from_dict({key: value[:2] for key, value in self.customerDict.items()},
+                                                orient="index", columns=["Accuracy", "Certainty"])
+        self.__report("Grouping")
+
+    def __report(self, step):
+        """
+    The __report function prints the time a scoring step took when verbose is set and resets the timer.
+
+    Args:
+        self: Represent the instance of the class
+        step: Name the step that was completed
+
+    Returns:
+        Nothing
+
+    Doc Author:
+        Willem van der Schans, Trelent AI
+    """
+        if self.__verbose:
+            print(f"{step} done in {round(time.time() - self.__startTime, 5)} seconds")
+        self.__startTime = time.time()
+
+    @staticmethod
+    def __groupArrays(keys, values):
+        """
+    The __groupArrays function splits an array of values into one array per key. The values keep the order they
+    have in the input, so the first occurrence of a payment code stays first just like with Series.unique.
+
+    Args:
+        keys: Pass the acctrefno of every value
+        values: Pass the values that need to be grouped
+
+    Returns:
+        A dictionary with an array of values per key
+
+    Doc Author:
+        Willem van der Schans, Trelent AI
+    """
+        order = np.argsort(keys, kind="stable")
+        groupKeys, groupStart = np.unique(keys[order], return_index=True)
+        return dict(zip(groupKeys.tolist(), np.split(values[order], groupStart[1:])))
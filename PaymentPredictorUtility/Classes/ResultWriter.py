@@ -0,0 +1,327 @@
+#  Copyright (C) 2022-2023 - Willem van der Schans - All Rights Reserved.
+#
+#  THE CONTENTS OF THIS PROJECT ARE PROPRIETARY AND CONFIDENTIAL.
+#  UNAUTHORIZED COPYING, TRANSFERRING OR REPRODUCTION OF THE CONTENTS OF THIS PROJECT, VIA ANY MEDIUM IS STRICTLY PROHIBITED.
+#  The receipt or possession of the source code and/or any parts thereof does not convey or imply any right to use them
+#  for any purpose other than the purpose for which they were provided to you.
+#
+#  The software is provided "AS IS", without warranty of any kind, express or implied, including but not limited to
+#  the warranties of merchantability, fitness for a particular purpose and non infringement.
+#  In no event shall the authors or copyright holders be liable for any claim, damages or other liability,
+#  whether in an action of contract, tort or otherwise, arising from, out of or in connection with the software
+#  or the use or other dealings in the software.
+#
+#  The above copyright notice and this permission notice shall be included in all copies or substantial portions of the Software.
+
+import os
+import shutil
+from pathlib import Path
+
+import pandas as pd
+
+
+class ResultWriter:
+
+    def __init__(self, folderPath, runStamp, fileFormat="parquet", batchSize=25000):
+
+        """
+    The __init__ function prepares a writer that flushes scoring results to disk in fixed size batches. Every batch
+    is written as its own part file in a CustomerTestDataFrame and a CustomerErrorDataFrame folder. A part is
+    written under a temporary name and renamed once it is complete, so the parts on disk can be read at any moment
+    of the run. Parquet parts keep the Prediction, Payment Probability and Payment Codes arrays as typed list
+    columns. CSV parts are merged into the usual single CSV files when the writer is closed. The feather format writes
+    the long layout instead, a PaymentDataFrame with one typed row per acctrefno and transaction_code and an
+    AccountDataFrame with the accuracy and certainty of every account, as uncompressed Arrow IPC files that can be
+    memory mapped. Part files that already exist in the folders, from an earlier attempt of the same run, are kept
+    and numbering continues after them.
+
+    Args:
+        self: Represent the instance of the class
+        folderPath: Specify the folder of the run
+        runStamp: Name the output files after the run
+        fileFormat: Choose between parquet, csv and feather
+        batchSize: Set the number of accounts in one part file
+
+    Returns:
+        Nothing
+
+    Doc Author:
+        Willem van der Schans, Trelent AI
+    """
+        if fileFormat not in ("parquet", "csv", "feather"):
+            raise ValueError(f"Unknown file format {fileFormat}, use parquet, csv or feather")
+
+        self.accountCount = 0
+        self.errorCount = 0
+
+        self.__folderPath = Path(folderPath)
+        self.__fileFormat = fileFormat
+        self.__batchSize = max(int(batchSize), 1)
+        self.__customerDict = {}
+        self.__errorDict = {}
+        self.__paymentList = []
+        self.__partNumber = 0
+        self.__errorPath = self.__folderPath.joinpath(f"CustomerErrorDataFrame{runStamp}")
+        self.__paymentPath = None
+
+        if fileFormat == "feather":
+            self.__resultPath = self.__folderPath.joinpath(f"AccountDataFrame{runStamp}")
+            self.__paymentPath = self.__folderPath.joinpath(f"PaymentDataFrame{runStamp}")
+            os.makedirs(self.__paymentPath, exist_ok=True)
+        else:
+            self.__resultPath = self.__folderPath.joinpath(f"CustomerTestDataFrame{runStamp}")
+
+        os.makedirs(self.__resultPath, exist_ok=True)
+        os.makedirs(self.__errorPath, exist_ok=True)
+
+        for partFile in self.__resultPath.glob(f"part*.{self.__fileFormat}"):
+            self.__partNumber = max(self.__partNumber, int(partFile.stem[4:]) + 1)
+
+    def write(self, customerDict, errorDict, paymentDf=None, partNumber=None):
+        """
+    The write function adds the results of a number of accounts to the current batch and flushes every full batch
+    to disk. When a partNumber is passed the results are written straight away as that part, which makes writing
+    the same batch twice overwrite the first part instead of duplicating it.
+
+    Args:
+        self: Represent the instance of the class
+        customerDict: Pass the results per account
+        errorDict: Pass the errors per account
+        paymentDf: Pass the payment rows of the accounts, required for the feather format
+        partNumber: Write the results as this part number
+
+    Returns:
+        Nothing
+
+    Doc Author:
+        Willem van der Schans, Trelent AI
+    """
+        if self.__fileFormat == "feather":
+            if paymentDf is None:
+                raise ValueError("The feather format needs the payment rows of every account")
+            self.__paymentList.append(paymentDf)
+
+        self.__customerDict.update(customerDict)
+        self.__errorDict.update(errorDict)
+        self.accountCount += len(customerDict)
+        self.errorCount += len(errorDict)
+
+        if partNumber is not None:
+            self.flush(force=True, partNumber=partNumber)
+        elif len(self.__customerDict) + len(self.__errorDict) >= self.__batchSize:
+            self.flush()
+
+    def flush(self, force=False, partNumber=None):
+        """
+    The flush function writes the current batch as one part file and empties the batch.
+
+    Args:
+        self: Represent the instance of the class
+        force: Write a part file even when the batch is empty
+        partNumber: Write the batch as this part number instead of the next one
+
+    Returns:
+        Nothing
+
+    Doc Author:
+        Willem van der Schans, Trelent AI
+    """
+        if len(self.__customerDict) + len(self.__errorDict) == 0 and not force:
+            return
+
+        if self.__fileFormat == "feather":
+            df = pd.DataFrame.from_dict({key: value[:2] for key, value in self.__customerDict.items()},
+                                        orient="index", columns=["Accuracy", "Certainty"])
+        else:
+            df = pd.DataFrame.from_dict(self.__customerDict, orient="index",
+                                        columns=["Accuracy", "Certainty", "Prediction", "Payment Probability",
+                                                 "Payment Codes"])
+        dfError = pd.DataFrame.from_dict(self.__errorDict, orient="index", columns=["Error"])
+
+        if partNumber is None:
+            partNumber = self.__partNumber
+
+        self.__writePart(df, self.__resultPath, partNumber)
+        self.__writePart(dfError, self.__errorPath, partNumber)
+        if self.__fileFormat == "feather":
+            self.__writePart(self.__paymentFrame(), self.__paymentPath, partNumber)
+
+        self.__partNumber = max(self.__partNumber, partNumber + 1)
+        self.__customerDict = {}
+        self.__errorDict = {}
+        self.__paymentList = []
+
+    def close(self):
+        """
+    The close function flushes the last batch. For csv output the part files are then merged into
+    CustomerTestDataFrame and CustomerErrorDataFrame csv files and the part folders are removed.
+
+    Args:
+        self: Represent the instance of the class
+
+    Returns:
+        Nothing
+
+    Doc Author:
+        Willem van der Schans, Trelent AI
+    """
+        self.flush(force=self.__partNumber == 0)
+
+        if self.__fileFormat == "csv":
+            self.__mergeParts(self.__resultPath)
+            self.__mergeParts(self.__errorPath)
+
+    @staticmethod
+    def readResults(folderPath, runStamp, fileFormat, accountList):
+        """
+    The readResults function reads the results of a number of accounts back from the part files of an earlier run.
+    Only the parquet and feather formats can be read back, csv files hold the arrays as text. Parquet parts give the
+    results in the layout of the customerDict. Feather parts give the payment rows as well, the Prediction, Payment
+    Probability and Payment Codes arrays of an account are then taken from its payment rows.
+
+    Args:
+        folderPath: Specify the folder of the run
+        runStamp: Pass the runStamp the output files of the run are named after
+        fileFormat: Choose between parquet and feather
+        accountList: Pass the accounts whose results are needed
+
+    Returns:
+        The results per account, the errors per account and the payment rows, None for the parquet format
+
+    Doc Author:
+        Willem van der Schans, Trelent AI
+    """
+        if fileFormat not in ("parquet", "feather"):
+            raise ValueError(f"Results in the {fileFormat} format cannot be read back, use parquet or feather")
+
+        dfError = ResultWriter.__readParts(folderPath, f"CustomerErrorDataFrame{runStamp}", fileFormat, accountList)
+        errorDict = dict(zip(dfError["acctrefno"].tolist(), dfError["Error"].tolist()))
+
+        if fileFormat == "parquet":
+            df = ResultWriter.__readParts(folderPath, f"CustomerTestDataFrame{runStamp}", fileFormat, accountList)
+            customerDict = {row[0]: list(row[1:]) for row in
+                            df[["acctrefno", "Accuracy", "Certainty", "Prediction", "Payment Probability",
+                                "Payment Codes"]].itertuples(index=False)}
+            return customerDict, errorDict, None
+
+        df = ResultWriter.__readParts(folderPath, f"AccountDataFrame{runStamp}", fileFormat, accountList)
+        paymentDf = ResultWriter.__readParts(folderPath, f"PaymentDataFrame{runStamp}", fileFormat, accountList)
+        paymentDf = paymentDf.reset_index(drop=True)
+        paymentGroups = paymentDf.groupby("acctrefno", sort=False).indices
+        customerDict = {}
+        for acctrefno, accuracy, certainty in df[["acctrefno", "Accuracy", "Certainty"]].itertuples(index=False):
+            rows = paymentGroups.get(acctrefno, [])
+            customerDict[acctrefno] = [accuracy, certainty,
+                                       paymentDf["Prediction"].to_numpy()[rows],
+                                       paymentDf["Payment Probability"].to_numpy()[rows],
+                                       paymentDf["transaction_code"].to_numpy()[rows]]
+        return customerDict, errorDict, paymentDf
+
+    @staticmethod
+    def __readParts(folderPath, partName, fileFormat, accountList):
+        """
+    The __readParts function reads the part files of one output folder and keeps the rows of the requested accounts.
+
+    Args:
+        folderPath: Specify the folder of the run
+        partName: Specify the folder of the part files
+        fileFormat: Choose between parquet and feather
+        accountList: Pass the accounts whose rows are needed
+
+    Returns:
+        A dataframe with the rows of the accounts
+
+    Doc Author:
+        Willem van der Schans, Trelent AI
+    """
+        partPath = Path(folderPath).joinpath(partName)
+        partList = sorted(partPath.glob(f"part*.{fileFormat}"))
+        if len(partList) == 0:
+            raise FileNotFoundError(f"No {fileFormat} part files found in {partPath}")
+
+        readMethod = pd.read_parquet if fileFormat == "parquet" else pd.read_feather
+        df = pd.concat([readMethod(partFile) for partFile in partList], ignore_index=True)
+        return df[df["acctrefno"].isin(list(accountList)).to_numpy()]
+
+    def __writePart(self, dataframe, partPath, partNumber):
+        """
+    The __writePart function writes one part file under a temporary name and renames it when it is complete.
+
+    Args:
+        self: Represent the instance of the class
+        dataframe: Pass the dataframe that needs to be written
+        partPath: Specify the folder of the part files
+        partNumber: Number the part file
+
+    Returns:
+        Nothing
+
+    Doc Author:
+        Willem van der Schans, Trelent AI
+    """
+        filePath = partPath.joinpath(f"part{partNumber:05d}.{self.__fileFormat}")
+        tempPath = partPath.joinpath(f"part{partNumber:05d}.tmp")
+
+        if self.__fileFormat == "csv":
+            dataframe.to_csv(tempPath)
+        else:
+            if "acctrefno" not in dataframe.columns:
+                dataframe = dataframe.rename_axis("acctrefno").reset_index()
+            if "Error" in dataframe.columns:
+                dataframe["Error"] = dataframe["Error"].astype(str)
+            if self.__fileFormat == "parquet":
+                dataframe.to_parquet(tempPath, engine="pyarrow", index=False)
+            else:
+                dataframe.to_feather(tempPath, compression="uncompressed")
+
+        os.replace(tempPath, filePath)
+
+    def __paymentFrame(self):
+        """
+    The __paymentFrame function builds the payment table of the current batch. Only the payment rows of accounts
+    that were scored without an error are kept, and the probability and prediction columns get compact types.
+
+    Args:
+        self: Represent the instance of the class
+
+    Returns:
+        A dataframe with one row per acctrefno and transaction_code
+
+    Doc Author:
+        Willem van der Schans, Trelent AI
+    """
+        if len(self.__paymentList) == 0:
+            return pd.DataFrame({"acctrefno": pd.Series(dtype="int64"),
+                                 "transaction_code": pd.Series(dtype="int64"),
+                                 "Payment Probability": pd.Series(dtype="float32"),
+                                 "Prediction": pd.Series(dtype="int8")})
+
+        dfPayment = pd.concat(self.__paymentList, ignore_index=True)
+        dfPayment = dfPayment[dfPayment["acctrefno"].isin(list(self.__customerDict.keys())).to_numpy()]
+        return dfPayment.astype({"Payment Probability": "float32", "Prediction": "int8"}).reset_index(drop=True)
+
+    def __mergeParts(self, partPath):
+        """
+    The __mergeParts function appends the csv part files of a folder into one csv file with a single header line.
+
+    Args:
+        self: Represent the instance of the class
+        partPath: Specify the folder of the part files
+
+    Returns:
+        Nothing
+
+    Doc Author:
+        Willem van der Schans, Trelent AI
+    """
+        tempPath = f"{partPath}.tmp"
+        with open(tempPath, "w", newline="") as mergedFile:
+            for partNumber, partFile in enumerate(sorted(partPath.glob("part*.csv"))):
+                with open(partFile, "r", newline="") as part:
+                    header = part.readline()
+                    if partNumber == 0:
+                        mergedFile.write(header)
+                    shutil.copyfileobj(part, mergedFile)
+
+        os.replace(tempPath, f"{partPath}.csv")
+        shutil.rmtree(partPath)
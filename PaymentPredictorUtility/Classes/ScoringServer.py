@@ -0,0 +1,412 @@
+#  Copyright (C) 2022-2023 - Willem van der Schans - All Rights Reserved.
+#
+#  THE CONTENTS OF THIS PROJECT ARE PROPRIETARY AND CONFIDENTIAL.
+#  UNAUTHORIZED COPYING, TRANSFERRING OR REPRODUCTION OF THE CONTENTS OF THIS PROJECT, VIA ANY MEDIUM IS STRICTLY PROHIBITED.
+#  The receipt or possession of the source code and/or any parts thereof does not convey or imply any right to use them
+#  for any purpose other than the purpose for which they were provided to you.
+#
+#  The software is provided "AS IS", without warranty of any kind, express or implied, including but not limited to
+#  the warranties of merchantability, fitness for a particular purpose and non infringement.
+#  In no event shall the authors or copyright holders be liable for any claim, damages or other liability,
+#  whether in an action of contract, tort or otherwise, arising from, out of or in connection with the software
+#  or the use or other dealings in the software.
+#
+#  The above copyright notice and this permission notice shall be included in all copies or substantial portions of the Software.
+
+import json
+import queue
+import threading
+import time
+from collections import deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import numpy as np
+
+from PaymentPredictorUtility.Classes.AccountIndex import AccountIndex
+from PaymentPredictorUtility.Classes.PortfolioScorer import PortfolioScorer
+
+
+class ScoringServer:
+
+    def __init__(self, dfClean, dfTarget, dfDummies, Model, Scaler, cleanIndex=None, dummyIndex=None,
+                 host="127.0.0.1", port=8765, maxBatchSize=512, maxWait=0.005, verbose=False):
+
+        """
+    The __init__ function sets up a local scoring server around data that is already loaded. The dataframes, the
+    model, the scaler and the account indexes stay in memory for the lifetime of the server. Every request is put on
+    a queue and a single batching thread collects the requests that arrive within maxWait seconds, up to
+    maxBatchSize accounts, and scores them together with one PortfolioScorer call, so concurrent requests share a
+    single predict_proba call.
+
+    The server answers GET /score?acctrefno=1,2,3 with the results per account and GET /stats with the latency and
+    batch size statistics.
+
+    Args:
+        self: Represent the instance of the class
+        dfClean: Get the payment numbers and payment codes of every account
+        dfTarget: Get the target dataframe
+        dfDummies: Get the dummy variables of every account
+        Model: Pass the model to the class
+        Scaler: Scale the data
+        cleanIndex: Pass an AccountIndex of dfClean if one was already built
+        dummyIndex: Pass an AccountIndex of dfDummies if one was already built
+        host: Set the address the server listens on, localhost by default
+        port: Set the port the server listens on, 0 picks a free port
+        maxBatchSize: Set the maximum number of accounts scored in one batch
+        maxWait: Set how many seconds the first request of a batch waits for more requests
+        verbose: Print out every request
+
+    Returns:
+        Nothing
+
+    Doc Author:
+        Willem van der Schans, Trelent AI
+    """
+        self.__dfClean = dfClean
+        self.__dfTarget = dfTarget
+        self.__dfDummies = dfDummies
+        self.__Model = Model
+        self.__Scaler = Scaler
+        self.__cleanIndex = cleanIndex if cleanIndex is not None else AccountIndex(dfClean)
+        self.__dummyIndex = dummyIndex if dummyIndex is not None else AccountIndex(dfDummies)
+        self.__maxBatchSize = max(int(maxBatchSize), 1)
+        self.__maxWait = max(float(maxWait), 0.0)
+        self.__verbose = verbose
+
+        self.__requestQueue = queue.Queue()
+        self.__statsLock = threading.Lock()
+        self.__latencyList = deque(maxlen=100000)
+        self.__batchSizeList = deque(maxlen=100000)
+        self.__requestCount = 0
+        self.__stopEvent = threading.Event()
+        self.__batchThread = None
+        self.__serverThread = None
+
+        self.__httpServer = ThreadingHTTPServer((host, port), _ScoringRequestHandler)
+        self.__httpServer.daemon_threads = True
+        self.__httpServer.scoringServer = self
+        self.address = self.__httpServer.server_address
+
+    def start(self):
+        """
+    The start function starts the batching thread and serves requests on a background thread.
+
+    Args:
+        self: Represent the instance of the class
+
+    Returns:
+        The object itself
+
+    Doc Author:
+        Willem van der Schans, Trelent AI
+    """
+        self.__startBatching()
+        self.__serverThread = threading.Thread(target=self.__httpServer.serve_forever, daemon=True)
+        self.__serverThread.start()
+        return self
+
+    def serveForever(self):
+        """
+    The serveForever function starts the batching thread and serves requests on the calling thread until the
+    server is stopped or the user presses Ctrl+C.
+
+    Args:
+        self: Represent the instance of the class
+
+    Returns:
+        Nothing
+
+    Doc Author:
+        Willem van der Schans, Trelent AI
+    """
+        self.__startBatching()
+        try:
+            self.__httpServer.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            self.stop()
+
+    def stop(self):
+        """
+    The stop function shuts down the server and the batching thread.
+
+    Args:
+        self: Represent the instance of the class
+
+    Returns:
+        Nothing
+
+    Doc Author:
+        Willem van der Schans, Trelent AI
+    """
+        self.__stopEvent.set()
+        if self.__serverThread is not None:
+            self.__httpServer.shutdown()
+            self.__serverThread.join()
+            self.__serverThread = None
+        self.__httpServer.server_close()
+        if self.__batchThread is not None:
+            self.__batchThread.join()
+            self.__batchThread = None
+
+    def score(self, acctrefnoList, timeout=60):
+        """
+    The score function queues the accounts of one request and waits until the batching thread has scored them.
+
+    Args:
+        self: Represent the instance of the class
+        acctrefnoList: Pass the accounts that need to be scored
+        timeout: Set how many seconds to wait for the result
+
+    Returns:
+        A dictionary with the result or the error of every account
+
+    Doc Author:
+        Willem van der Schans, Trelent AI
+    """
+        request = {"accounts": list(acctrefnoList), "event": threading.Event(), "result": None,
+                   "startTime": time.perf_counter()}
+        self.__requestQueue.put(request)
+
+        if not request["event"].wait(timeout):
+            raise TimeoutError(f"Scoring did not finish within {timeout} seconds")
+
+        with self.__statsLock:
+            self.__latencyList.append(time.perf_counter() - request["startTime"])
+            self.__requestCount += 1
+
+        return request["result"]
+
+    def getStats(self):
+        """
+    The getStats function returns the latency and batch size statistics of the requests served so far.
+
+    Args:
+        self: Represent the instance of the class
+
+    Returns:
+        A dictionary with the request count, the p50 and p99 latency in milliseconds and the batch size statistics
+
+    Doc Author:
+        Willem van der Schans, Trelent AI
+    """
+        with self.__statsLock:
+            latencyArr = np.array(self.__latencyList, dtype=np.float64) * 1000
+            batchSizeArr = np.array(self.__batchSizeList, dtype=np.float64)
+            requestCount = self.__requestCount
+
+        statsDict = {"Requests": requestCount, "Batches": len(batchSizeArr)}
+        if len(latencyArr) > 0:
+            statsDict["Latency p50 ms"] = round(float(np.percentile(latencyArr, 50)), 3)
+            statsDict["Latency p99 ms"] = round(float(np.percentile(latencyArr, 99)), 3)
+        if len(batchSizeArr) > 0:
+            statsDict["Batch Size Mean"] = round(float(batchSizeArr.mean()), 2)
+            statsDict["Batch Size p50"] = float(np.percentile(batchSizeArr, 50))
+            statsDict["Batch Size Max"] = int(batchSizeArr.max())
+        return statsDict
+
+    def isVerbose(self):
+        """
+    The isVerbose function tells the request handler if requests should be printed.
+
+    Args:
+        self: Represent the instance of the class
+
+    Returns:
+        True if the server was started with verbose
+
+    Doc Author:
+        Willem van der Schans, Trelent AI
+    """
+        return self.__verbose
+
+    def __startBatching(self):
+        """
+    The __startBatching function starts the batching thread if it is not running yet.
+
+    Args:
+        self: Represent the instance of the class
+
+    Returns:
+        Nothing
+
+    Doc Author:
+        Willem van der Schans, Trelent AI
+    """
+        if self.__batchThread is None:
+            self.__stopEvent.clear()
+            self.__batchThread = threading.Thread(target=self.__batchLoop, daemon=True)
+            self.__batchThread.start()
+
+    def __batchLoop(self):
+        """
+    The __batchLoop function runs on the batching thread. It waits for a request, keeps collecting requests until
+    maxWait has passed or maxBatchSize distinct accounts are queued and then scores the whole batch at once.
+
+    Args:
+        self: Represent the instance of the class
+
+    Returns:
+        Nothing
+
+    Doc Author:
+        Willem van der Schans, Trelent AI
+    """
+        while not self.__stopEvent.is_set():
+            try:
+                requestList = [self.__requestQueue.get(timeout=0.25)]
+            except queue.Empty:
+                continue
+
+            # Counts the distinct accounts, the same number that is reported as the batch size
+            accountDict = dict.fromkeys(requestList[0]["accounts"])
+            deadline = time.perf_counter() + self.__maxWait
+            while len(accountDict) < self.__maxBatchSize:
+                remaining = deadline - time.perf_counter()
+                if remaining <= 0:
+                    break
+                try:
+                    request = self.__requestQueue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+                requestList.append(request)
+                accountDict.update(dict.fromkeys(request["accounts"]))
+
+            with self.__statsLock:
+                self.__batchSizeList.append(len(accountDict))
+
+            try:
+                self.__scoreBatch(requestList, list(accountDict))
+            except Exception as e:
+                for request in requestList:
+                    request["result"] = {str(acctrefno): {"Error": repr(e)} for acctrefno in request["accounts"]}
+            finally:
+                for request in requestList:
+                    request["event"].set()
+
+    def __scoreBatch(self, requestList, accountList):
+        """
+    The __scoreBatch function scores every known account of a batch with one PortfolioScorer call and hands every
+    request its own part of the results.
+
+    Args:
+        self: Represent the instance of the class
+        requestList: Pass the requests of the batch
+        accountList: Pass the distinct accounts of the batch
+
+    Returns:
+        Nothing
+
+    Doc Author:
+        Willem van der Schans, Trelent AI
+    """
+        accountList = [acctrefno for acctrefno in accountList if acctrefno in self.__cleanIndex]
+
+        customerDict = {}
+        errorDict = {}
+        if len(accountList) > 0:
+            scorerObj = PortfolioScorer(self.__dfClean.iloc[self.__cleanIndex.getListPositions(accountList)],
+                                        self.__dfTarget,
+                                        self.__dfDummies.iloc[self.__dummyIndex.getListPositions(accountList)],
+                                        self.__Model, self.__Scaler)
+            customerDict = scorerObj.customerDict
+            errorDict = scorerObj.ErrorDict
+
+        for request in requestList:
+            resultDict = {}
+            for acctrefno in request["accounts"]:
+                if acctrefno in customerDict:
+                    accuracy, certainty, prediction, probability, codes = customerDict[acctrefno]
+                    resultDict[str(acctrefno)] = {"Accuracy": accuracy,
+                                                  "Certainty": certainty,
+                                                  "Prediction": prediction.tolist(),
+                                                  "Payment Probability": np.round(probability.astype(float), 5).tolist(),
+                                                  "Payment Codes": codes.tolist()}
+                elif acctrefno in errorDict:
+                    resultDict[str(acctrefno)] = {"Error": str(errorDict[acctrefno])}
+                else:
+                    resultDict[str(acctrefno)] = {"Error": f"Acctrefno {acctrefno} not found in database"}
+            request["result"] = resultDict
+
+
+class _ScoringRequestHandler(BaseHTTPRequestHandler):
+
+    def do_GET(self):
+        """
+    The do_GET function answers the /score and /stats requests of the ScoringServer.
+
+    Args:
+        self: Represent the instance of the class
+
+    Returns:
+        Nothing
+
+    Doc Author:
+        Willem van der Schans, Trelent AI
+    """
+        scoringServer = self.server.scoringServer
+        url = urlparse(self.path)
+
+        if url.path == "/stats":
+            self.__reply(200, scoringServer.getStats())
+        elif url.path == "/score":
+            tokenList = [token for value in parse_qs(url.query).get("acctrefno", [])
+                         for token in value.split(",") if token.strip() != ""]
+            try:
+                acctrefnoList = [int(token) for token in tokenList]
+            except ValueError:
+                self.__reply(400, {"Error": "acctrefno has to be a comma separated list of whole numbers"})
+                return
+            if len(acctrefnoList) == 0:
+                self.__reply(400, {"Error": "No acctrefno passed, use /score?acctrefno=1,2,3"})
+                return
+            try:
+                resultDict = scoringServer.score(acctrefnoList)
+            except TimeoutError as e:
+                self.__reply(503, {"Error": str(e)})
+                return
+            self.__reply(200, resultDict)
+        else:
+            self.__reply(404, {"Error": f"Unknown path {url.path}, use /score or /stats"})
+
+    def log_message(self, format, *args):
+        """
+    The log_message function prints the request line only when the server is verbose.
+
+    Args:
+        self: Represent the instance of the class
+        format: Pass the format string of the message
+        *args: Pass the values of the message
+
+    Returns:
+        Nothing
+
+    Doc Author:
+        Willem van der Schans, Trelent AI
+    """
+        if self.server.scoringServer.isVerbose():
+            super().log_message(format, *args)
+
+    def __reply(self, statusCode, content):
+        """
+    The __reply function sends a json response.
+
+    Args:
+        self: Represent the instance of the class
+        statusCode: Set the http status code
+        content: Pass the dictionary that is sent as json
+
+    Returns:
+        Nothing
+
+    Doc Author:
+        Willem van der Schans, Trelent AI
+    """
+        body = json.dumps(content).encode("utf-8")
+        self.send_response(statusCode)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
@@ -17,24 +17,30 @@ import os
 import time
 from pathlib import Path
 
-import pandas as pd
+import pyarrow.parquet as pq
+
+from PaymentPredictorUtility.Functions.Func import partPaths, readFrame, storePath
 
 
 class dataFrameLoader:
 
-    def __init__(self, csvName, path, Folder=None, verbose=False):
+    def __init__(self, csvName, path, Folder=None, verbose=False, memoryMap=False, columns=None, lazy=False):
 
         """
     The __init__ function is the first function that gets called when you create a new instance of a class.
     It's job is to initialize all of the attributes of the newly created object.
-
+    With lazy the path is resolved and checked here, but the file is only read the first time getDf is called.
+    The footer of every parquet part is read, so a parquet file that is cut off or corrupted is still found here.
 
     Args:
         self: Refer to the object itself
-        csvName: Specify the name of the csv file to be loaded
-        path: Set the path to the folder where the csv file is located
-        Folder: Specify the folder in which the csv file is located
+        csvName: Specify the name of the parquet or csv file to be loaded, a csv file is converted to parquet
+        path: Set the path to the folder where the file is located
+        Folder: Specify the folder in which the file is located
         verbose: Print out the time it takes to load a data set
+        memoryMap: Read the data set from its memory mapped Arrow file, which processes that load the same file share
+        columns: Specify the columns that are needed, only those are read from the file
+        lazy: Defer reading the file until the data set is first used
 
     Returns:
         Nothing
@@ -45,7 +51,9 @@ class dataFrameLoader:
         self.__Folder = None
         self.__Path = None
         self.__df = None
-        __startTime = time.time()
+        self.__memoryMap = memoryMap
+        self.__columns = columns
+        self.__verbose = verbose
 
         self.__Path = Path(path)
 
@@ -56,15 +64,63 @@ class dataFrameLoader:
 
         self.__Path = self.__Path.joinpath(str(csvName))
 
-        if verbose:
-            self.__df = pd.read_csv(f"{self.__Path}", index_col=0, engine="pyarrow")
-            print(f"Data set {csvName} loaded in {round(time.time() - __startTime, 2)} seconds")
+        if lazy:
+            if not self.__Path.with_suffix(".parquet").exists() and not self.__Path.with_suffix(".csv").exists():
+                raise FileNotFoundError(f"Data set {csvName} not found in {self.__Path.parent}")
+            self.__parquetChecker()
         else:
-            self.__df = pd.read_csv(f"{self.__Path}", index_col=0, engine="pyarrow")
+            self.__dataReader()
+
+    def __parquetChecker(self):
+        """
+    The __parquetChecker function reads the metadata in the footer of every part of the parquet file without reading
+    its rows. A csv file that is newer than the parquet file is read instead of it by readFrame, so it is not checked.
+
+
+    Args:
+        self: Represent the instance of the class
+
+    Returns:
+        Nothing, a pyarrow.ArrowInvalid error is raised when a part is not a complete parquet file
+
+    Doc Author:
+        Willem van der Schans, Trelent AI
+    """
+        parquetPath = self.__Path.with_suffix(".parquet")
+        csvPath = self.__Path.with_suffix(".csv")
+
+        if not parquetPath.exists() or (csvPath.exists() and csvPath.stat().st_mtime > parquetPath.stat().st_mtime):
+            return
+
+        for partPath in partPaths(parquetPath):
+            pq.read_metadata(partPath)
+
+    def __dataReader(self):
+        """
+    The __dataReader function reads the data set and prints out the time it took when verbose is True.
+
+
+    Args:
+        self: Represent the instance of the class
+
+    Returns:
+        Nothing
+
+    Doc Author:
+        Willem van der Schans, Trelent AI
+    """
+        __startTime = time.time()
+
+        if self.__verbose:
+            self.__df = readFrame(self.__Path, memoryMap=self.__memoryMap, columns=self.__columns)
+            print(f"Data set {self.__Path.name} loaded in {round(time.time() - __startTime, 2)} seconds")
+        else:
+            self.__df = readFrame(self.__Path, memoryMap=self.__memoryMap, columns=self.__columns)
 
     def getDf(self):
         """
-    The getDf function returns the dataframe that was created in the __init__ function.
+    The getDf function returns the dataframe that was created in the __init__ function. A lazy loader reads the
+    data set on the first call and keeps it for the calls after that.
 
 
     Args:
@@ -76,4 +132,45 @@ class dataFrameLoader:
     Doc Author:
         Willem van der Schans, Trelent AI
     """
+        if self.__df is None:
+            self.__dataReader()
         return self.__df
+
+    def getStorePath(self):
+        """
+    The getStorePath function returns the path of the memory mapped Arrow file the data set was read from.
+
+
+    Args:
+        self: Represent the instance of the class
+
+    Returns:
+        The path of the Arrow file or None when the data set was not memory mapped
+
+    Doc Author:
+        Willem van der Schans, Trelent AI
+    """
+        if self.__memoryMap:
+            return storePath(self.__Path)
+        else:
+            return None
+
+    def getFileName(self):
+        """
+    The getFileName function returns the name of the file the data set is read from. A csv file is converted to
+    parquet when it is read, so the parquet file is returned when it exists.
+
+
+    Args:
+        self: Represent the instance of the class
+
+    Returns:
+        The name of the data set file
+
+    Doc Author:
+        Willem van der Schans, Trelent AI
+    """
+        if self.__Path.with_suffix(".parquet").exists():
+            return self.__Path.with_suffix(".parquet").name
+        else:
+            return self.__Path.with_suffix(".csv").name
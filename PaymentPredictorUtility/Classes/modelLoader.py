@@ -21,12 +21,14 @@ from pathlib import Path
 
 class modelLoader:
 
-    def __init__(self, modelName, path, Folder=None, verbose=False):
+    def __init__(self, modelName, path, Folder=None, verbose=False, lazy=False):
 
         """
     The __init__ function is the constructor for a class. It is called when an object of that class
     is instantiated. The __init__ function can take any number of arguments, but it must have at least one argument,
     self (which refers to the newly created object). All other arguments are passed as parameters to the __init__ function.
+    With lazy the path is resolved and checked here, but the model is only unpickled the first time getModel is called.
+    The first and last bytes of the file are checked, so a file that is not a pickle or was cut off is still found here.
 
     Args:
         self: Represent the instance of the class
@@ -34,6 +36,7 @@ class modelLoader:
         path: Specify the path to the folder where we want to store our model
         Folder: Specify the folder in which the model is located
         verbose: Print out the time it takes to load a model
+        lazy: Defer loading the model until it is first used
 
     Returns:
         Nothing
@@ -44,7 +47,7 @@ class modelLoader:
         self.__Folder = None
         self.__model = None
         self.__Path = None
-        __startTime = time.time()
+        self.__verbose = verbose
 
         self.__Path = Path(path)
 
@@ -55,15 +58,62 @@ class modelLoader:
 
         self.__Path = self.__Path.joinpath(str(modelName))
 
-        if verbose:
+        if lazy:
+            if not self.__Path.exists():
+                raise FileNotFoundError(f"Model {modelName} not found in {self.__Path.parent}")
+            self.__pickleChecker()
+        else:
+            self.__modelReader()
+
+    def __pickleChecker(self):
+        """
+    The __pickleChecker function checks the file without unpickling it. A pickle starts with the PROTO opcode and
+    ends with the STOP opcode, a file that is empty, cut off or of another format fails one of the two.
+
+    Args:
+        self: Represent the instance of the class
+
+    Returns:
+        Nothing, a pickle.UnpicklingError is raised when the file is not a complete pickle
+
+    Doc Author:
+        Willem van der Schans, Trelent AI
+    """
+        with open(self.__Path, "rb") as modelFile:
+            header = modelFile.read(2)
+            modelFile.seek(0, os.SEEK_END)
+            if modelFile.tell() > 2:
+                modelFile.seek(-1, os.SEEK_END)
+            footer = modelFile.read(1)
+
+        if len(header) < 2 or header[0] != pickle.PROTO[0] or footer != pickle.STOP:
+            raise pickle.UnpicklingError(f"Model {self.__Path.name} in {self.__Path.parent} is not a complete pickle")
+
+    def __modelReader(self):
+        """
+    The __modelReader function unpickles the model and prints out the time it took when verbose is True.
+
+    Args:
+        self: Represent the instance of the class
+
+    Returns:
+        Nothing
+
+    Doc Author:
+        Willem van der Schans, Trelent AI
+    """
+        __startTime = time.time()
+
+        if self.__verbose:
             self.__model = pickle.load(open(f"{self.__Path}", "rb"))
-            print(f"Data set {modelName} loaded in {round(time.time() - __startTime, 2)} seconds")
+            print(f"Data set {self.__Path.name} loaded in {round(time.time() - __startTime, 2)} seconds")
         else:
             self.__model = pickle.load(open(f"{self.__Path}", "rb"))
 
     def getModel(self):
         """
-    The getModel function returns the model.
+    The getModel function returns the model. A lazy loader unpickles the model on the first call and keeps it for
+    the calls after that.
 
     Args:
         self: Represent the instance of the class
@@ -74,4 +124,21 @@ class modelLoader:
     Doc Author:
         Willem van der Schans, Trelent AI
     """
+        if self.__model is None:
+            self.__modelReader()
         return self.__model
+
+    def getFileName(self):
+        """
+    The getFileName function returns the name of the file the model is read from.
+
+    Args:
+        self: Represent the instance of the class
+
+    Returns:
+        The name of the model file
+
+    Doc Author:
+        Willem van der Schans, Trelent AI
+    """
+        return self.__Path.name
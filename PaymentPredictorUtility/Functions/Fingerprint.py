@@ -0,0 +1,94 @@
+#  Copyright (C) 2022-2023 - Willem van der Schans - All Rights Reserved.
+#
+#  THE CONTENTS OF THIS PROJECT ARE PROPRIETARY AND CONFIDENTIAL.
+#  UNAUTHORIZED COPYING, TRANSFERRING OR REPRODUCTION OF THE CONTENTS OF THIS PROJECT, VIA ANY MEDIUM IS STRICTLY PROHIBITED.
+#  The receipt or possession of the source code and/or any parts thereof does not convey or imply any right to use them
+#  for any purpose other than the purpose for which they were provided to you.
+#
+#  The software is provided "AS IS", without warranty of any kind, express or implied, including but not limited to
+#  the warranties of merchantability, fitness for a particular purpose and non infringement.
+#  In no event shall the authors or copyright holders be liable for any claim, damages or other liability,
+#  whether in an action of contract, tort or otherwise, arising from, out of or in connection with the software
+#  or the use or other dealings in the software.
+#
+#  The above copyright notice and this permission notice shall be included in all copies or substantial portions of the Software.
+
+import hashlib
+import pickle
+
+import numpy as np
+import pandas as pd
+
+from PaymentPredictorUtility.Functions.Func import partPaths
+
+
+def objectFingerprint(*objects):
+    """
+The objectFingerprint function hashes the pickled bytes of one or more objects. Two fitted models or scalers with
+the same fingerprint will produce the same predictions, which makes it usable as the identity of a model.
+
+Args:
+    *objects: Pass the objects that need to be fingerprinted
+
+Returns:
+    A hexadecimal sha256 string
+
+Doc Author:
+    Willem van der Schans, Trelent AI
+"""
+    hashObj = hashlib.sha256()
+    for obj in objects:
+        hashObj.update(pickle.dumps(obj, protocol=4))
+    return hashObj.hexdigest()
+
+
+def accountFingerprints(dataframe, keyColumn="acctrefno"):
+    """
+The accountFingerprints function computes one 64 bit hash per account over all rows of that account. Every row is
+hashed together with its position within the account, and the row hashes of an account are summed. The hash of
+an account therefore changes when any of its rows is added, removed, edited or reordered, while the rows of other
+accounts have no influence on it.
+
+Args:
+    dataframe: Pass the dataframe that needs to be fingerprinted
+    keyColumn: Specify the column that identifies the account
+
+Returns:
+    A series with the hash of every account, indexed by account
+
+Doc Author:
+    Willem van der Schans, Trelent AI
+"""
+    keys = dataframe[keyColumn].to_numpy()
+    rowPosition = dataframe.groupby(keyColumn, sort=False).cumcount().to_numpy()
+    rowHash = pd.util.hash_pandas_object(dataframe.assign(__rowPosition=rowPosition), index=False).to_numpy()
+
+    order = np.argsort(keys, kind="stable")
+    accounts, starts = np.unique(keys[order], return_index=True)
+    accountHash = np.add.reduceat(rowHash[order], starts) if len(starts) > 0 else rowHash[:0]
+
+    return pd.Series(accountHash, index=accounts, dtype=np.uint64)
+
+
+def fileFingerprint(filePath, blockSize=1 << 20):
+    """
+The fileFingerprint function hashes the content of a file. The file is read in blocks, so files that do not fit in
+memory can be fingerprinted as well. A data set that is stored as a folder of parts is hashed as its parts in the
+order they are read.
+
+Args:
+    filePath: Specify the file that needs to be fingerprinted
+    blockSize: Set the number of bytes read at a time
+
+Returns:
+    A hexadecimal sha256 string
+
+Doc Author:
+    Willem van der Schans, Trelent AI
+"""
+    hashObj = hashlib.sha256()
+    for partPath in partPaths(filePath):
+        with open(partPath, "rb") as fileObj:
+            for block in iter(lambda: fileObj.read(blockSize), b""):
+                hashObj.update(block)
+    return hashObj.hexdigest()
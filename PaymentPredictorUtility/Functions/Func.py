@@ -13,10 +13,14 @@
 #
 #  The above copyright notice and this permission notice shall be included in all copies or substantial portions of the Software.
 
+import json
 import os
 from pathlib import Path
 from colorama import Style, Fore, init
+import numpy as np
 import pandas as pd
+import pyarrow as pa
+from pyarrow import feather
 from datetime import datetime
 
 init(autoreset=True)
@@ -198,3 +202,399 @@ Doc Author:
                 print("Invalid Input please try again")
         except:
             print("Invalid Input please try again")
+
+
+def accountListReader(source):
+    """
+The accountListReader function turns a file or a typed list of account numbers into a list of acctrefnos. When
+source is an existing file the account numbers are read from it. A csv file with an acctrefno column uses that
+column, any other file is split on commas, semicolons and whitespace. Otherwise source itself is split the same way.
+Duplicates are removed while the first occurrence keeps its place and entries that are not whole numbers are
+returned separately so they can be reported together.
+
+Args:
+    source: Pass the path of an account file or a comma separated list of account numbers
+
+Returns:
+    A list of unique acctrefnos and a list of the entries that could not be read
+
+Doc Author:
+    Willem van der Schans, Trelent AI
+"""
+    source = str(source).strip().strip('"')
+    tokenList = None
+
+    if os.path.isfile(source):
+        if source.lower().endswith(".csv"):
+            dfAccounts = pd.read_csv(source, dtype=str)
+            colList = [colName for colName in dfAccounts.columns if colName.lower() == "acctrefno"]
+            if len(colList) > 0:
+                tokenList = dfAccounts[colList[0]].dropna().tolist()
+        if tokenList is None:
+            with open(source, "r") as accountFile:
+                source = accountFile.read()
+
+    if tokenList is None:
+        tokenList = source.replace(",", " ").replace(";", " ").split()
+
+    accountList = []
+    invalidList = []
+    for token in tokenList:
+        token = str(token).strip()
+        try:
+            acctrefno = int(float(token)) if float(token).is_integer() else None
+        except ValueError:
+            acctrefno = None
+
+        if acctrefno is None:
+            invalidList.append(token)
+        else:
+            accountList.append(acctrefno)
+
+    return list(dict.fromkeys(accountList)), invalidList
+
+
+def readFrame(filePath, convert=True, memoryMap=False, columns=None):
+    """
+The readFrame function reads a dataframe that was saved by writeFrame. Parquet files are read with their types,
+index and column names as they were written. A csv file is read with its first column as index and, when convert
+is True, saved as a parquet file with the same name after which the csv file is moved to the Archive folder next
+to it, so every csv file is parsed only once and the original is kept. When the csv file of filePath was already
+converted, the parquet file is read instead, unless a newer csv file with the same name was placed next to it.
+Every read gets the column types of the schema file back with schemaApplier, when the file has one.
+A data set that appendFrame stored as a folder of parquet parts is read as its parts one after the other.
+With memoryMap the frame is read from its uncompressed Arrow file in the FeatureStore folder next to it, which is
+created on the first read and again whenever the parquet or csv file is newer. The columns of the returned frame
+are read only views on the memory mapped file, so every process that reads the same file shares the pages that
+the operating system keeps of it instead of holding a copy of its own.
+When columns is passed only those columns are read from a parquet or Arrow file, the other columns are never
+loaded. A csv file is always read and converted as a whole before its columns are selected.
+
+Args:
+    filePath: Specify the path of the parquet or csv file
+    convert: Replace a csv file by a parquet file after reading it and archive the csv file
+    memoryMap: Read the frame from the memory mapped Arrow file of filePath
+    columns: Specify the columns that need to be read, defaults to every column
+
+Returns:
+    A dataframe
+
+Doc Author:
+    Willem van der Schans, Trelent AI
+"""
+    filePath = Path(filePath)
+    parquetPath = filePath.with_suffix(".parquet")
+    csvPath = filePath.with_suffix(".csv")
+
+    csvNewer = csvPath.exists() and (not parquetPath.exists() or
+                                     csvPath.stat().st_mtime > parquetPath.stat().st_mtime)
+
+    if memoryMap:
+        arrowPath = storePath(filePath)
+        sourcePath = csvPath if csvNewer else parquetPath
+        if not arrowPath.exists() or arrowPath.stat().st_mtime < sourcePath.stat().st_mtime:
+            writeFrame(readFrame(filePath, convert=convert), arrowPath)
+        table = pa.ipc.open_file(pa.memory_map(str(arrowPath), "r")).read_all()
+        if columns is not None:
+            table = table.select(list(columns) + [colName for colName in table.schema.pandas_metadata["index_columns"]
+                                                  if isinstance(colName, str)])
+        return schemaApplier(table.to_pandas(split_blocks=True), filePath)
+
+    if not csvNewer and parquetPath.is_dir():
+        return schemaApplier(pd.concat([pd.read_parquet(partPath, engine="pyarrow", columns=columns)
+                                        for partPath in partPaths(parquetPath)], ignore_index=True), filePath)
+
+    if not csvNewer:
+        return schemaApplier(pd.read_parquet(parquetPath, engine="pyarrow", columns=columns), filePath)
+
+    dataframe = schemaApplier(pd.read_csv(csvPath, index_col=0, engine="pyarrow"), filePath)
+    if convert:
+        writeFrame(dataframe, parquetPath)
+        csvArchiver(csvPath)
+
+    if columns is not None:
+        return dataframe[list(columns)]
+    return dataframe
+
+
+def schemaApplier(dataframe, filePath):
+    """
+The schemaApplier function gives the columns of a dataframe the types in the schema file of filePath. Only the
+columns whose type differs from the schema are converted, a parquet or Arrow file that was written with the types
+of its schema is returned as it was read, so the memory mapped columns stay views on the file.
+
+Args:
+    dataframe: Pass the dataframe that was read
+    filePath: Specify the path of the parquet or csv file the dataframe was read from
+
+Returns:
+    The dataframe with the column types of the schema
+
+Doc Author:
+    Willem van der Schans, Trelent AI
+"""
+    if not schemaPath(filePath).exists():
+        return dataframe
+
+    with open(schemaPath(filePath), "r") as schemaFile:
+        schema = json.load(schemaFile)
+
+    typeDict = {}
+    for colName, value in schema.items():
+        if colName not in dataframe.columns:
+            continue
+        if value["dtype"] == "category":
+            dataType = pd.CategoricalDtype(value["categories"])
+        else:
+            dataType = pd.api.types.pandas_dtype(value["dtype"])
+        if dataframe[colName].dtype != dataType:
+            typeDict[colName] = dataType
+
+    if typeDict:
+        dataframe = dataframe.astype(typeDict)
+    return dataframe
+
+
+def csvArchiver(csvPath):
+    """
+The csvArchiver function moves a csv file that readFrame converted to the Archive folder next to it, so the
+original file is kept but is no longer found as a second copy of the data set when the folder is scanned. An
+archived file with the same name gets the modification time of the newer file added to its name.
+
+Args:
+    csvPath: Specify the path of the csv file
+
+Returns:
+    The path of the archived file
+
+Doc Author:
+    Willem van der Schans, Trelent AI
+"""
+    csvPath = Path(csvPath)
+    archivePath = csvPath.parent.joinpath("Archive", csvPath.name)
+    if archivePath.exists():
+        archiveStamp = datetime.fromtimestamp(csvPath.stat().st_mtime).strftime('%m%d%Y_%H%M%S')
+        archivePath = archivePath.with_name(f"{csvPath.stem}_{archiveStamp}{csvPath.suffix}")
+
+    os.makedirs(archivePath.parent, exist_ok=True)
+    os.replace(csvPath, archivePath)
+    return archivePath
+
+
+def storePath(filePath):
+    """
+The storePath function returns the path of the Arrow file that readFrame memory maps for a parquet or csv file.
+The Arrow files are kept in a FeatureStore folder next to the file, so they are never mistaken for the data sets
+themselves when a folder is scanned for the latest file.
+
+Args:
+    filePath: Specify the path of the parquet or csv file
+
+Returns:
+    The path of the Arrow file
+
+Doc Author:
+    Willem van der Schans, Trelent AI
+"""
+    filePath = Path(filePath)
+    return filePath.parent.joinpath("FeatureStore", f"{filePath.stem}.arrow")
+
+
+def schemaPath(filePath):
+    """
+The schemaPath function returns the path of the schema file that writeFrame saves for a parquet or csv file.
+The schema files are kept in a Schemas folder next to the file.
+
+Args:
+    filePath: Specify the path of the parquet or csv file
+
+Returns:
+    The path of the schema file
+
+Doc Author:
+    Willem van der Schans, Trelent AI
+"""
+    filePath = Path(filePath)
+    return filePath.parent.joinpath("Schemas", f"{filePath.stem}.json")
+
+
+def writeFrame(dataframe, filePath, schema=None):
+    """
+The writeFrame function saves a dataframe or series in the format of the file extension. Parquet files keep the
+types of the columns and the index, so nothing has to be parsed or inferred when the file is read again. The file
+is written under a temporary name and renamed when it is complete. Arrow files are written uncompressed and in
+one chunk per column, so they can be memory mapped without a copy, and the Arrow files of data sets that no longer
+exist are removed from their folder. A file that is still mapped by another process is left in place.
+A schema is saved as a json file in the Schemas folder next to the file.
+
+Args:
+    dataframe: Pass the dataframe or series that needs to be saved
+    filePath: Specify the path of the parquet, arrow or csv file
+    schema: Pass the column types that were chosen for the dataframe
+
+Returns:
+    Nothing
+
+Doc Author:
+    Willem van der Schans, Trelent AI
+"""
+    filePath = Path(filePath)
+    tempPath = filePath.with_suffix(".tmp")
+
+    if isinstance(dataframe, pd.Series):
+        dataframe = dataframe.to_frame()
+
+    if filePath.suffix == ".parquet":
+        dataframe.to_parquet(tempPath, engine="pyarrow")
+    elif filePath.suffix == ".arrow":
+        filePath.parent.mkdir(parents=True, exist_ok=True)
+        feather.write_feather(dataframe, tempPath, compression="uncompressed", chunksize=max(len(dataframe), 1))
+    else:
+        dataframe.to_csv(tempPath)
+
+    os.replace(tempPath, filePath)
+
+    if schema is not None:
+        os.makedirs(schemaPath(filePath).parent, exist_ok=True)
+        with open(schemaPath(filePath), "w") as schemaFile:
+            json.dump(schema, schemaFile, indent=4)
+
+    if filePath.suffix == ".arrow":
+        dataPath = filePath.parent.parent
+        for storedFile in os.scandir(filePath.parent):
+            stem, suffix = os.path.splitext(storedFile.name)
+            if suffix == ".arrow" and not dataPath.joinpath(f"{stem}.parquet").exists() \
+                    and not dataPath.joinpath(f"{stem}.csv").exists():
+                try:
+                    os.remove(storedFile.path)
+                except OSError:
+                    pass
+
+
+def partPaths(filePath):
+    """
+The partPaths function returns the parquet parts of a data set in the order appendFrame added them. A data set
+that is a single file is its own only part.
+
+Args:
+    filePath: Specify the path of the parquet data set
+
+Returns:
+    A list with the paths of the parts
+
+Doc Author:
+    Willem van der Schans, Trelent AI
+"""
+    filePath = Path(filePath)
+    if filePath.is_dir():
+        return sorted(filePath.glob("part*.parquet"))
+    return [filePath]
+
+
+def appendFrame(dataframe, filePath, previousPath, schema=None):
+    """
+The appendFrame function saves the rows of a dataframe as a new part of the data set of previousPath, so only the
+new rows are written. The data set is kept as a folder named filePath with one parquet file per part, the file or
+folder of previousPath is moved into it without being read, a csv file is converted to parquet first. The new
+part gets the columns and the column types of the data set with schemaMerger and the schema of the data set is
+saved for filePath, so readFrame returns the parts with one type per column.
+
+Args:
+    dataframe: Pass the dataframe or series with the new rows
+    filePath: Specify the path of the parquet data set that is created
+    previousPath: Specify the path of the parquet or csv data set the rows are appended to
+    schema: Pass the column types that were chosen for the new rows
+
+Returns:
+    Nothing, a ValueError is raised when the new rows do not have the columns of the data set
+
+Doc Author:
+    Willem van der Schans, Trelent AI
+"""
+    filePath = Path(filePath)
+    previousPath = Path(previousPath)
+    parquetPath = previousPath.with_suffix(".parquet")
+
+    if isinstance(dataframe, pd.Series):
+        dataframe = dataframe.to_frame()
+
+    if schemaPath(previousPath).exists():
+        with open(schemaPath(previousPath), "r") as schemaFile:
+            previousSchema = json.load(schemaFile)
+        if not parquetPath.exists():
+            readFrame(previousPath)
+    else:
+        previousSchema = {}
+        for colName, dataType in readFrame(previousPath).dtypes.items():
+            previousSchema[str(colName)] = {"dtype": str(dataType)}
+            if isinstance(dataType, pd.CategoricalDtype):
+                previousSchema[str(colName)]["categories"] = dataType.categories.tolist()
+
+    dataframe, mergedSchema = schemaMerger(dataframe, previousSchema, schema)
+
+    if parquetPath.is_dir():
+        os.replace(parquetPath, filePath)
+    else:
+        os.makedirs(filePath)
+        os.replace(parquetPath, filePath.joinpath("part00000.parquet"))
+
+    writeFrame(dataframe, filePath.joinpath(f"part{len(partPaths(filePath)):05d}.parquet"))
+
+    os.makedirs(schemaPath(filePath).parent, exist_ok=True)
+    with open(schemaPath(filePath), "w") as schemaFile:
+        json.dump(mergedSchema, schemaFile, indent=4)
+    if schemaPath(previousPath).exists() and schemaPath(previousPath) != schemaPath(filePath):
+        os.remove(schemaPath(previousPath))
+
+
+def schemaMerger(dataframe, previousSchema, schema=None):
+    """
+The schemaMerger function gives the columns of a new part the order and the types of the schema of its data set.
+A column keeps the type of the data set when its values fit it without a change, otherwise the type widens to one
+that holds both, a categorical gets the new categories added after its own. The memory in the schema of the new
+part is added to the memory of the data set.
+
+Args:
+    dataframe: Pass the dataframe with the new rows
+    previousSchema: Pass the schema of the data set
+    schema: Pass the column types that were chosen for the new rows
+
+Returns:
+    The dataframe with the types of the merged schema and the merged schema, a ValueError is raised when the
+    columns differ from the columns of the data set
+
+Doc Author:
+    Willem van der Schans, Trelent AI
+"""
+    dataframe = dataframe.rename(columns=str)
+    if set(dataframe.columns) != set(previousSchema):
+        raise ValueError(f"The new rows have the columns {list(dataframe.columns)} instead of the columns "
+                         f"{list(previousSchema)} of the data set, the whole data set has to be written again")
+
+    dataframe = dataframe[list(previousSchema)].copy(deep=False)
+    mergedSchema = {}
+    for colName, value in previousSchema.items():
+        value = dict(value)
+        series = dataframe[colName]
+
+        if value["dtype"] == "category":
+            newValues = pd.Index(series.dropna().unique()).difference(value["categories"], sort=False)
+            value["categories"] = list(value["categories"]) + newValues.tolist()
+            dataType = pd.CategoricalDtype(value["categories"])
+        else:
+            dataType = pd.api.types.pandas_dtype(value["dtype"])
+            if series.dtype.kind in "biuf" and dataType.kind in "biuf" and series.dtype != dataType and \
+                    not np.array_equal(series.astype(dataType).to_numpy(dtype="float64"),
+                                       series.to_numpy(dtype="float64"), equal_nan=True):
+                dataType = np.promote_types(dataType, series.dtype)
+                value["dtype"] = str(dataType)
+
+        if series.dtype != dataType:
+            dataframe[colName] = series.astype(dataType)
+
+        for key in ["bytesBefore", "bytesAfter"]:
+            if key in value and schema is not None and key in schema.get(colName, {}):
+                value[key] += schema[colName][key]
+        mergedSchema[colName] = value
+
+    return dataframe, mergedSchema
@@ -0,0 +1,144 @@
+#  Copyright (C) 2022-2023 - Willem van der Schans - All Rights Reserved.
+#
+#  THE CONTENTS OF THIS PROJECT ARE PROPRIETARY AND CONFIDENTIAL.
+#  UNAUTHORIZED COPYING, TRANSFERRING OR REPRODUCTION OF THE CONTENTS OF THIS PROJECT, VIA ANY MEDIUM IS STRICTLY PROHIBITED.
+#  The receipt or possession of the source code and/or any parts thereof does not convey or imply any right to use them
+#  for any purpose other than the purpose for which they were provided to you.
+#
+#  The software is provided "AS IS", without warranty of any kind, express or implied, including but not limited to
+#  the warranties of merchantability, fitness for a particular purpose and non infringement.
+#  In no event shall the authors or copyright holders be liable for any claim, damages or other liability,
+#  whether in an action of contract, tort or otherwise, arising from, out of or in connection with the software
+#  or the use or other dealings in the software.
+#
+#  The above copyright notice and this permission notice shall be included in all copies or substantial portions of the Software.
+
+"""
+Times the target creation and label encoding of dataMLPrep against the row loop and LabelEncoder of the baseline on
+a generated dfClean frame and checks that both give the same dfTarget and encoded columns.
+
+    python benchmarks/dataMLPrepBenchmark.py --rows 1000000
+"""
+
+import argparse
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+from sklearn.preprocessing import LabelEncoder
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from PaymentPredictorUtility.Classes.DataPrep import dataMLPrep, encoderRegistry
+from PaymentPredictorUtility.Functions.Func import writeFrame
+from tests.conftest import cleanFrameMaker
+
+
+def baselineTarget(dataframe):
+    """
+The baselineTarget function creates the target of the baseline row by row.
+
+Args:
+    dataframe: Pass the dfClean dataframe as the baseline read it
+
+Returns:
+    The target list
+
+Doc Author:
+    Willem van der Schans, Trelent AI
+"""
+    targetList = []
+    for row in range(len(dataframe)):
+        if dataframe.date_due[row] <= dataframe.transaction_date[row]:
+            targetList.append(1)
+        else:
+            targetList.append(0)
+    return targetList
+
+
+def baselineEncoder(dataframe, colList):
+    """
+The baselineEncoder function label encodes the columns of the baseline with a LabelEncoder.
+
+Args:
+    dataframe: Pass the dfClean dataframe as the baseline read it
+    colList: Specify the columns that are encoded
+
+Returns:
+    The dataframe with the encoded columns
+
+Doc Author:
+    Willem van der Schans, Trelent AI
+"""
+    labelEncoder = LabelEncoder()
+    for colName in colList:
+        dataframe[colName] = labelEncoder.fit_transform(dataframe[colName])
+    return dataframe
+
+
+def timer(function, *args):
+    """
+The timer function runs a function once and measures its wall time.
+
+Args:
+    function: Pass the function that is timed
+    *args: Pass the arguments of the function
+
+Returns:
+    The wall time in seconds and the result of the function
+
+Doc Author:
+    Willem van der Schans, Trelent AI
+"""
+    startTime = time.perf_counter()
+    result = function(*args)
+    return time.perf_counter() - startTime, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="benchmark the dataMLPrep target creation and label encoding")
+    parser.add_argument("--rows", type=int, default=200000, help="the number of rows of the generated dfClean")
+    args = parser.parse_args()
+
+    cleanFrame = cleanFrameMaker(args.rows)
+    colList = ["transaction_description", "state", "reference", "next_due"]
+
+    with tempfile.TemporaryDirectory() as tempDir:
+        cleanFrame.to_csv(Path(tempDir).joinpath("baseline.csv"))
+        writeFrame(cleanFrame, Path(tempDir).joinpath("dfClean.parquet"))
+        baselineDf = pd.read_csv(Path(tempDir).joinpath("baseline.csv"), index_col=0)
+
+        targetBaseline, targetList = timer(baselineTarget, baselineDf)
+        encodeBaseline, baselineDf = timer(baselineEncoder, baselineDf, colList)
+
+        targetCurrent, targetSeries = timer(lambda: (cleanFrame['date_due'] <= cleanFrame['transaction_date'])
+                                            .astype("int64"))
+        encodeCurrent, encodedDf = timer(encoderRegistry().encode, cleanFrame.copy(), colList)
+        prepCurrent, prepObj = timer(dataMLPrep, "dfClean.parquet", "dfDummy.parquet", "dfTarget.parquet", None,
+                                     tempDir)
+
+    parity = np.array_equal(targetSeries.to_numpy(), np.asarray(targetList)) and \
+        np.array_equal(prepObj.targetDf["paid"].to_numpy(), np.asarray(targetList)) and \
+        all(np.array_equal(encodedDf[colName].to_numpy(), baselineDf[colName].to_numpy()) and
+            np.array_equal(prepObj.dummyDf[colName].to_numpy(dtype="int64"), baselineDf[colName].to_numpy())
+            for colName in colList)
+
+    benchmarkDf = pd.DataFrame({"Baseline (s)": [targetBaseline, encodeBaseline, targetBaseline + encodeBaseline],
+                                "Current (s)": [targetCurrent, encodeCurrent, prepCurrent]},
+                               index=["target", "label encoding", "dataMLPrep"])
+    benchmarkDf["Speedup"] = benchmarkDf["Baseline (s)"] / benchmarkDf["Current (s)"]
+
+    print(f"{args.rows} rows, identical dfTarget and encoded columns: {parity}")
+    print(benchmarkDf.round(2).to_string())
+    print("The dataMLPrep row times the whole run, reading, encoding, compacting and saving, against the baseline "
+          "target and encoding only")
+
+    if not parity:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
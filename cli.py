@@ -0,0 +1,209 @@
+#  Copyright (C) 2022-2023 - Willem van der Schans - All Rights Reserved.
+#
+#  THE CONTENTS OF THIS PROJECT ARE PROPRIETARY AND CONFIDENTIAL.
+#  UNAUTHORIZED COPYING, TRANSFERRING OR REPRODUCTION OF THE CONTENTS OF THIS PROJECT, VIA ANY MEDIUM IS STRICTLY PROHIBITED.
+#  The receipt or possession of the source code and/or any parts thereof does not convey or imply any right to use them
+#  for any purpose other than the purpose for which they were provided to you.
+#
+#  The software is provided "AS IS", without warranty of any kind, express or implied, including but not limited to
+#  the warranties of merchantability, fitness for a particular purpose and non infringement.
+#  In no event shall the authors or copyright holders be liable for any claim, damages or other liability,
+#  whether in an action of contract, tort or otherwise, arising from, out of or in connection with the software
+#  or the use or other dealings in the software.
+#
+#  The above copyright notice and this permission notice shall be included in all copies or substantial portions of the Software.
+
+import argparse
+import multiprocessing
+import sys
+
+from PaymentPredictorUtility.Classes.PaymentPredictor import PaymentPredictor
+from PaymentPredictorUtility.Functions.Func import accountListReader
+
+
+def commandParsers():
+    """
+The commandParsers function builds the argument parser of the options that apply to the whole run and one parser
+for every command. The commands are parsed separately, so several of them can follow each other on one command line
+and run in that order on the same PaymentPredictor.
+
+Args:
+
+Returns:
+    The main parser and a dictionary with the parser of every command
+
+Doc Author:
+    Willem van der Schans, Trelent AI
+"""
+    mainParser = argparse.ArgumentParser(
+        prog="cli.py",
+        description="Run the AvidPaymentPredictor without prompts. Commands can be chained, for example "
+                    "'cli.py prepare train --grid fast score-all --mode parallel', and every data set, scaler and "
+                    "model is loaded only once for all of them.",
+        epilog="commands: prepare, update, train, score-all, score-accounts, serve. Use '<command> -h' for the options "
+               "of a command.")
+    mainParser.add_argument("--path", default=None,
+                            help="the AvidPaymentPredictor folder, defaults to Documents/AvidPaymentPredictor")
+    mainParser.add_argument("--verbose", action="store_true", help="print out the progress of every command")
+
+    commandDict = {}
+
+    commandDict["prepare"] = argparse.ArgumentParser(
+        prog="cli.py prepare", description="rebuild dfClean, dfDummy and dfTarget from tblXmain_transactions")
+    commandDict["prepare"].add_argument("--source", default="tblXmain_transactions",
+                                        help="the name of the source table in the Data folder")
+    commandDict["prepare"].add_argument("--chunk-size", type=int, default=None,
+                                        help="read the source table in chunks of this many rows to bound memory")
+    commandDict["prepare"].add_argument("--incremental", action="store_true",
+                                        help="clean and prepare only the rows that are not in the latest dfClean and "
+                                             "append them to the latest dfClean, dfDummy and dfTarget")
+
+    commandDict["update"] = argparse.ArgumentParser(
+        prog="cli.py update", description="rebuild only the files whose inputs changed since they were built")
+    commandDict["update"].add_argument("--grid", choices=["fast", "optimal"], default=None,
+                                       help="the parameter grid of a rebuilt model, defaults to the previous grid")
+    commandDict["update"].add_argument("--force", action="store_true",
+                                       help="rebuild every file, also the files that are up to date")
+
+    commandDict["train"] = argparse.ArgumentParser(
+        prog="cli.py train", description="fit a new scaler and train a new model on the latest dfDummy and dfTarget")
+    commandDict["train"].add_argument("--grid", choices=["fast", "optimal", "custom"], default="fast",
+                                      help="the parameter grid, custom uses --n-estimators and --max-depth")
+    commandDict["train"].add_argument("--n-estimators", type=int, default=100)
+    commandDict["train"].add_argument("--max-depth", type=int, default=2)
+    commandDict["train"].add_argument("--workers", type=int, default=1,
+                                      help="the number of grid search fits that run at the same time, the cores are "
+                                           "split between them")
+
+    commandDict["score-all"] = argparse.ArgumentParser(
+        prog="cli.py score-all", description="score every account and save the results in a Full folder")
+    commandDict["score-all"].add_argument("--mode", choices=["single", "parallel", "incremental"],
+                                          default="single")
+    commandDict["score-all"].add_argument("--workers", type=int, default=None,
+                                          help="the number of worker processes, defaults to the number of cores")
+    commandDict["score-all"].add_argument("--chunk-size", type=int, default=25000,
+                                          help="the number of accounts per batch")
+    commandDict["score-all"].add_argument("--format", choices=["parquet", "csv", "feather"], default="parquet")
+
+    commandDict["score-accounts"] = argparse.ArgumentParser(
+        prog="cli.py score-accounts", description="score a list of accounts and save the results in the Individual "
+                                                  "folder of today")
+    commandDict["score-accounts"].add_argument("accounts",
+                                               help="the path of an account file or a comma separated list of "
+                                                    "account numbers")
+    commandDict["score-accounts"].add_argument("--no-save", action="store_true",
+                                               help="print the results instead of saving them")
+
+    commandDict["serve"] = argparse.ArgumentParser(
+        prog="cli.py serve", description="serve scoring requests on localhost until Ctrl+C is pressed")
+    commandDict["serve"].add_argument("--host", default="127.0.0.1")
+    commandDict["serve"].add_argument("--port", type=int, default=8765)
+
+    return mainParser, commandDict
+
+
+def commandSplitter(argumentList, commandList):
+    """
+The commandSplitter function splits the command line at every command name. The arguments in front of the first
+command belong to the main parser, the arguments after a command belong to that command.
+
+Args:
+    argumentList: Pass the command line arguments
+    commandList: Pass the names of the commands
+
+Returns:
+    The main arguments and a list of command names with their arguments
+
+Doc Author:
+    Willem van der Schans, Trelent AI
+"""
+    mainList = []
+    commandSplitList = []
+
+    for argument in argumentList:
+        if argument in commandList:
+            commandSplitList.append((argument, []))
+        elif len(commandSplitList) == 0:
+            mainList.append(argument)
+        else:
+            commandSplitList[-1][1].append(argument)
+
+    return mainList, commandSplitList
+
+
+def commandRunner(predictorObj, command, args):
+    """
+The commandRunner function runs one command on the PaymentPredictor.
+
+Args:
+    predictorObj: Pass the PaymentPredictor that holds the loaded data and models
+    command: Pass the name of the command
+    args: Pass the parsed arguments of the command
+
+Returns:
+    Nothing
+
+Doc Author:
+    Willem van der Schans, Trelent AI
+"""
+    if command == "prepare":
+        cleanName, dummyName, targetName, encoderName = predictorObj.prepare(sourceName=args.source,
+                                                                             chunkSize=args.chunk_size,
+                                                                             incremental=args.incremental)
+        print(f"Created {cleanName}, {dummyName}, {targetName} and {encoderName}")
+
+    elif command == "update":
+        rebuiltList = predictorObj.update(paramGrid=args.grid, force=args.force)
+        print(f"Rebuilt {', '.join(rebuiltList) if len(rebuiltList) > 0 else 'nothing, all files are up to date'}")
+
+    elif command == "train":
+        if args.grid == "custom":
+            paramGrid = {"n_estimators": [args.n_estimators],
+                         "max_depth": [args.max_depth],
+                         "alpha": [1],
+                         "learning_rate": [0.1],
+                         "colsample_bytree": [0.8],
+                         "lambda": [1],
+                         "subsample": [1]}
+        else:
+            paramGrid = args.grid
+        scalerName, modelName = predictorObj.train(paramGrid=paramGrid, workers=args.workers)
+        print(f"Created {scalerName} and {modelName}")
+
+    elif command == "score-all":
+        runPath = predictorObj.scoreAll(mode=args.mode, workers=args.workers, chunkSize=args.chunk_size,
+                                        fileFormat=args.format)
+        print(f"Output saved in {runPath}")
+
+    elif command == "score-accounts":
+        accountList, invalidList = accountListReader(args.accounts)
+        df, dfError, unknownList = predictorObj.scoreAccounts(accountList, save=not args.no_save)
+        unknownList = invalidList + unknownList
+        if args.no_save:
+            print(df.to_string())
+        print(f"Scored {len(df)} accounts, {len(dfError)} errors and {len(unknownList)} unknown account numbers"
+              f"{': ' + str(unknownList[:20]) if len(unknownList) > 0 else ''}")
+
+    elif command == "serve":
+        serverObj = predictorObj.serve(host=args.host, port=args.port, block=True)
+        for key, value in serverObj.getStats().items():
+            print(f"{key} = {value}")
+
+
+if __name__ == '__main__':
+    multiprocessing.freeze_support()
+
+    mainParser, commandDict = commandParsers()
+    mainList, commandSplitList = commandSplitter(sys.argv[1:], list(commandDict.keys()))
+    mainArgs = mainParser.parse_args(mainList)
+
+    if len(commandSplitList) == 0:
+        mainParser.print_help()
+        sys.exit(2)
+
+    parsedList = [(command, commandDict[command].parse_args(argumentList))
+                  for command, argumentList in commandSplitList]
+
+    predictorObj = PaymentPredictor(docPath=mainArgs.path, verbose=mainArgs.verbose)
+    for command, args in parsedList:
+        commandRunner(predictorObj, command, args)
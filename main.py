@@ -13,6 +13,8 @@
 #
 #  The above copyright notice and this permission notice shall be included in all copies or substantial portions of the Software.
 
+import argparse
+import multiprocessing
 import sys
 import traceback
 
@@ -31,7 +33,11 @@ except:
 
 
 if __name__ == '__main__':
-    graphObj = GraphicalUserInterface()
+    multiprocessing.freeze_support()
+    argParser = argparse.ArgumentParser(description="AvidPaymentPredictor")
+    argParser.add_argument("--accounts", default=None,
+                           help="the path of an account file that the individual mode scores without asking")
+    graphObj = GraphicalUserInterface(accountFile=argParser.parse_args().accounts)
     try:
         graphObj.showGui()
         print()
@@ -0,0 +1,61 @@
+#  Copyright (C) 2022-2023 - Willem van der Schans - All Rights Reserved.
+#
+#  THE CONTENTS OF THIS PROJECT ARE PROPRIETARY AND CONFIDENTIAL.
+#  UNAUTHORIZED COPYING, TRANSFERRING OR REPRODUCTION OF THE CONTENTS OF THIS PROJECT, VIA ANY MEDIUM IS STRICTLY PROHIBITED.
+#  The receipt or possession of the source code and/or any parts thereof does not convey or imply any right to use them
+#  for any purpose other than the purpose for which they were provided to you.
+#
+#  The software is provided "AS IS", without warranty of any kind, express or implied, including but not limited to
+#  the warranties of merchantability, fitness for a particular purpose and non infringement.
+#  In no event shall the authors or copyright holders be liable for any claim, damages or other liability,
+#  whether in an action of contract, tort or otherwise, arising from, out of or in connection with the software
+#  or the use or other dealings in the software.
+#
+#  The above copyright notice and this permission notice shall be included in all copies or substantial portions of the Software.
+
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+
+def cleanFrameMaker(rowCount, seed=21):
+    """
+The cleanFrameMaker function builds a dfClean frame with the columns and types the DataCleaner writes, so the
+tests do not need the proprietary tblXmain_transactions file. The due and transaction dates share days, so the
+target has ties, and the text columns hold values that sort differently as numbers and as text.
+
+Args:
+    rowCount: Set the number of rows of the frame
+    seed: Set the seed of the random values
+
+Returns:
+    A dfClean dataframe
+
+Doc Author:
+    Willem van der Schans, Trelent AI
+"""
+    generator = np.random.default_rng(seed)
+    startDate = pd.Timestamp("2021-01-01")
+
+    return pd.DataFrame({
+        "acctrefno": np.repeat(np.arange(1000, 1000 + rowCount // 10 + 1), 10)[:rowCount],
+        "payment_number": np.tile(np.arange(1, 11), rowCount // 10 + 1)[:rowCount],
+        "transaction_code": generator.choice([204, 206], rowCount),
+        "transaction_description": generator.choice(["P+I Principal Payment", "P+I Interest Payment"], rowCount),
+        "date_due": startDate + pd.to_timedelta(generator.integers(0, 60, rowCount), "D"),
+        "transaction_date": startDate + pd.to_timedelta(generator.integers(0, 60, rowCount), "D"),
+        "transaction_amount": generator.random(rowCount).round(2) * 500,
+        "state": generator.choice(["NV", "UT", "CA", "az", "Ut"], rowCount),
+        "reference": generator.choice(["10", "9", "100", "x7", "07"], rowCount),
+        "disable_NCOA": generator.integers(0, 2, rowCount),
+        "next_due": startDate + pd.to_timedelta(generator.integers(30, 90, rowCount), "D")})
+
+
+@pytest.fixture
+def cleanFrame():
+    return cleanFrameMaker(600)
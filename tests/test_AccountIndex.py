@@ -0,0 +1,45 @@
+#  Copyright (C) 2022-2023 - Willem van der Schans - All Rights Reserved.
+#
+#  THE CONTENTS OF THIS PROJECT ARE PROPRIETARY AND CONFIDENTIAL.
+#  UNAUTHORIZED COPYING, TRANSFERRING OR REPRODUCTION OF THE CONTENTS OF THIS PROJECT, VIA ANY MEDIUM IS STRICTLY PROHIBITED.
+#  The receipt or possession of the source code and/or any parts thereof does not convey or imply any right to use them
+#  for any purpose other than the purpose for which they were provided to you.
+#
+#  The software is provided "AS IS", without warranty of any kind, express or implied, including but not limited to
+#  the warranties of merchantability, fitness for a particular purpose and non infringement.
+#  In no event shall the authors or copyright holders be liable for any claim, damages or other liability,
+#  whether in an action of contract, tort or otherwise, arising from, out of or in connection with the software
+#  or the use or other dealings in the software.
+#
+#  The above copyright notice and this permission notice shall be included in all copies or substantial portions of the Software.
+
+import numpy as np
+import pandas as pd
+
+from PaymentPredictorUtility.Classes.AccountIndex import AccountIndex
+
+
+def test_listPositionsMatchIsinMask():
+    randomGen = np.random.default_rng(9)
+    dataframe = pd.DataFrame({"acctrefno": randomGen.integers(1000, 1200, 5000),
+                              "payment_number": randomGen.integers(0, 60, 5000)})
+    indexObj = AccountIndex(dataframe)
+    accountList = [1150, 1003, 1003, 99999, 1199, 1000]
+
+    positions = indexObj.getListPositions(accountList)
+
+    assert np.array_equal(positions, np.flatnonzero(dataframe["acctrefno"].isin(accountList).to_numpy()))
+
+
+def test_listPositionsOfUnknownAccountsAreEmpty():
+    indexObj = AccountIndex(pd.DataFrame({"acctrefno": [5, 3, 5], "payment_number": [2, 1, 1]}))
+
+    assert len(indexObj.getListPositions([4, 99999])) == 0
+    assert len(indexObj.getListPositions([])) == 0
+
+
+def test_listPositionsSkipAccountsOutsideCompactedType():
+    indexObj = AccountIndex(pd.DataFrame({"acctrefno": np.array([5000, 4464, 5000], dtype=np.int16),
+                                          "payment_number": [2, 1, 1]}))
+
+    assert np.array_equal(np.sort(indexObj.getListPositions([5000, 70000])), [0, 2])
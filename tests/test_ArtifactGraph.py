@@ -0,0 +1,43 @@
+#  Copyright (C) 2022-2023 - Willem van der Schans - All Rights Reserved.
+#
+#  THE CONTENTS OF THIS PROJECT ARE PROPRIETARY AND CONFIDENTIAL.
+#  UNAUTHORIZED COPYING, TRANSFERRING OR REPRODUCTION OF THE CONTENTS OF THIS PROJECT, VIA ANY MEDIUM IS STRICTLY PROHIBITED.
+#  The receipt or possession of the source code and/or any parts thereof does not convey or imply any right to use them
+#  for any purpose other than the purpose for which they were provided to you.
+#
+#  The software is provided "AS IS", without warranty of any kind, express or implied, including but not limited to
+#  the warranties of merchantability, fitness for a particular purpose and non infringement.
+#  In no event shall the authors or copyright holders be liable for any claim, damages or other liability,
+#  whether in an action of contract, tort or otherwise, arising from, out of or in connection with the software
+#  or the use or other dealings in the software.
+#
+#  The above copyright notice and this permission notice shall be included in all copies or substantial portions of the Software.
+
+import os
+import time
+
+import pytest
+
+from PaymentPredictorUtility.Classes.ArtifactGraph import ArtifactGraph
+from PaymentPredictorUtility.Functions.Func import writeFrame
+
+
+@pytest.fixture
+def dataPath(cleanFrame, tmp_path):
+    os.makedirs(tmp_path.joinpath("Data"))
+    cleanFrame.to_csv(tmp_path.joinpath("Data", "tblXmain_transactions.csv"))
+    writeFrame(cleanFrame, tmp_path.joinpath("Data", "dfClean.parquet"))
+    return tmp_path.joinpath("Data")
+
+
+def test_cleanWithoutManifestIsAdopted(dataPath):
+    os.utime(dataPath.joinpath("dfClean.parquet"), (time.time(), time.time() + 10))
+
+    assert "dfClean" not in ArtifactGraph(dataPath.parent).staleStages()
+    assert dataPath.joinpath("Manifests", "dfClean.json").exists()
+
+
+def test_newerSourceWithoutManifestIsStale(dataPath):
+    os.utime(dataPath.joinpath("tblXmain_transactions.csv"), (time.time(), time.time() + 10))
+
+    assert "dfClean" in ArtifactGraph(dataPath.parent).staleStages()
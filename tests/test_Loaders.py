@@ -0,0 +1,44 @@
+#  Copyright (C) 2022-2023 - Willem van der Schans - All Rights Reserved.
+#
+#  THE CONTENTS OF THIS PROJECT ARE PROPRIETARY AND CONFIDENTIAL.
+#  UNAUTHORIZED COPYING, TRANSFERRING OR REPRODUCTION OF THE CONTENTS OF THIS PROJECT, VIA ANY MEDIUM IS STRICTLY PROHIBITED.
+#  The receipt or possession of the source code and/or any parts thereof does not convey or imply any right to use them
+#  for any purpose other than the purpose for which they were provided to you.
+#
+#  The software is provided "AS IS", without warranty of any kind, express or implied, including but not limited to
+#  the warranties of merchantability, fitness for a particular purpose and non infringement.
+#  In no event shall the authors or copyright holders be liable for any claim, damages or other liability,
+#  whether in an action of contract, tort or otherwise, arising from, out of or in connection with the software
+#  or the use or other dealings in the software.
+#
+#  The above copyright notice and this permission notice shall be included in all copies or substantial portions of the Software.
+
+import pickle
+
+import pandas as pd
+import pyarrow as pa
+import pytest
+
+from PaymentPredictorUtility.Classes.dataFrameLoader import dataFrameLoader
+from PaymentPredictorUtility.Classes.modelLoader import modelLoader
+from PaymentPredictorUtility.Functions.Func import writeFrame
+
+
+def test_lazyModelLoaderFindsCutOffPickle(tmp_path):
+    pickle.dump({"n_estimators": 100}, open(tmp_path.joinpath("model.sav"), "wb"))
+    modelBytes = tmp_path.joinpath("model.sav").read_bytes()
+    tmp_path.joinpath("cut.sav").write_bytes(modelBytes[:-4])
+
+    assert modelLoader("model.sav", tmp_path, lazy=True).getModel() == {"n_estimators": 100}
+    with pytest.raises(pickle.UnpicklingError):
+        modelLoader("cut.sav", tmp_path, lazy=True)
+
+
+def test_lazyDataFrameLoaderFindsCorruptedParquet(tmp_path):
+    writeFrame(pd.DataFrame({"acctrefno": [1, 2, 3]}), tmp_path.joinpath("dfClean.parquet"))
+    parquetBytes = tmp_path.joinpath("dfClean.parquet").read_bytes()
+    tmp_path.joinpath("dfCut.parquet").write_bytes(parquetBytes[:len(parquetBytes) // 2])
+
+    assert len(dataFrameLoader("dfClean.parquet", tmp_path, lazy=True).getDf()) == 3
+    with pytest.raises(pa.ArrowInvalid):
+        dataFrameLoader("dfCut.parquet", tmp_path, lazy=True)
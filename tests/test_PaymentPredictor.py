@@ -0,0 +1,70 @@
+#  Copyright (C) 2022-2023 - Willem van der Schans - All Rights Reserved.
+#
+#  THE CONTENTS OF THIS PROJECT ARE PROPRIETARY AND CONFIDENTIAL.
+#  UNAUTHORIZED COPYING, TRANSFERRING OR REPRODUCTION OF THE CONTENTS OF THIS PROJECT, VIA ANY MEDIUM IS STRICTLY PROHIBITED.
+#  The receipt or possession of the source code and/or any parts thereof does not convey or imply any right to use them
+#  for any purpose other than the purpose for which they were provided to you.
+#
+#  The software is provided "AS IS", without warranty of any kind, express or implied, including but not limited to
+#  the warranties of merchantability, fitness for a particular purpose and non infringement.
+#  In no event shall the authors or copyright holders be liable for any claim, damages or other liability,
+#  whether in an action of contract, tort or otherwise, arising from, out of or in connection with the software
+#  or the use or other dealings in the software.
+#
+#  The above copyright notice and this permission notice shall be included in all copies or substantial portions of the Software.
+
+import time
+
+import pytest
+
+import PaymentPredictorUtility.Classes.PaymentPredictor as PaymentPredictorModule
+from PaymentPredictorUtility.Classes.DataPrep import dataMLPrep
+from PaymentPredictorUtility.Classes.PaymentPredictor import PaymentPredictor
+from PaymentPredictorUtility.Classes.PortfolioScorer import PortfolioScorer
+from PaymentPredictorUtility.Functions.Func import writeFrame
+
+
+class interruptingScorer(PortfolioScorer):
+
+    callCount = 0
+
+    def __init__(self, *args, **kwargs):
+        interruptingScorer.callCount += 1
+        if interruptingScorer.callCount > 1:
+            raise KeyboardInterrupt
+        super().__init__(*args, **kwargs)
+
+
+@pytest.fixture
+def predictor(cleanFrame, tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    predictorObj = PaymentPredictor(tmp_path)
+    writeFrame(cleanFrame, tmp_path.joinpath("Data", "dfClean.parquet"))
+    dataMLPrep("dfClean.parquet", "dfDummy.parquet", "dfTarget.parquet", "Data", tmp_path)
+    predictorObj.train()
+    return predictorObj
+
+
+def test_trainingBeforeResumeStartsNewRun(predictor, tmp_path, monkeypatch):
+    monkeypatch.setattr(PaymentPredictorModule, "PortfolioScorer", interruptingScorer)
+    with pytest.raises(KeyboardInterrupt):
+        predictor.scoreAll(chunkSize=20)
+    monkeypatch.setattr(PaymentPredictorModule, "PortfolioScorer", PortfolioScorer)
+
+    assert len(list(tmp_path.joinpath("Output", "Checkpoints").glob("Journal*.txt"))) == 1
+    interruptedPath = next(tmp_path.joinpath("Output").glob("Full*"))
+
+    time.sleep(1)
+    predictor.train()
+    runPath = predictor.scoreAll(chunkSize=20)
+
+    assert runPath != interruptedPath
+    assert predictor.runSummary["resumedCount"] == 0
+    assert predictor.runSummary["accountCount"] + predictor.runSummary["errorCount"] == 60
+
+
+def test_chainedRunsGetTheirOwnFolder(predictor):
+    runPathList = [predictor.scoreAll(), predictor.scoreAll(fileFormat="feather"),
+                   predictor.scoreAll(mode="incremental")]
+
+    assert len(set(runPathList)) == 3
@@ -0,0 +1,107 @@
+#  Copyright (C) 2022-2023 - Willem van der Schans - All Rights Reserved.
+#
+#  THE CONTENTS OF THIS PROJECT ARE PROPRIETARY AND CONFIDENTIAL.
+#  UNAUTHORIZED COPYING, TRANSFERRING OR REPRODUCTION OF THE CONTENTS OF THIS PROJECT, VIA ANY MEDIUM IS STRICTLY PROHIBITED.
+#  The receipt or possession of the source code and/or any parts thereof does not convey or imply any right to use them
+#  for any purpose other than the purpose for which they were provided to you.
+#
+#  The software is provided "AS IS", without warranty of any kind, express or implied, including but not limited to
+#  the warranties of merchantability, fitness for a particular purpose and non infringement.
+#  In no event shall the authors or copyright holders be liable for any claim, damages or other liability,
+#  whether in an action of contract, tort or otherwise, arising from, out of or in connection with the software
+#  or the use or other dealings in the software.
+#
+#  The above copyright notice and this permission notice shall be included in all copies or substantial portions of the Software.
+
+import datetime
+
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.preprocessing import LabelEncoder
+
+from PaymentPredictorUtility.Classes.DataPrep import dataMLPrep, encoderRegistry
+from PaymentPredictorUtility.Functions.Func import writeFrame
+
+
+def baselinePrep(csvPath):
+    """
+The baselinePrep function is the dataMLPrep of the baseline, the target is created row by row and every object
+column is encoded with a LabelEncoder after the dfClean csv file is read back.
+
+Args:
+    csvPath: Specify the path of the dfClean csv file
+
+Returns:
+    The encoded dataframe and the target list
+
+Doc Author:
+    Willem van der Schans, Trelent AI
+"""
+    dataframe = pd.read_csv(csvPath, index_col=0)
+
+    targetList = []
+    for row in range(len(dataframe)):
+        if dataframe.date_due[row] <= dataframe.transaction_date[row]:
+            targetList.append(1)
+        else:
+            targetList.append(0)
+    dataframe = dataframe.drop(['date_due', 'transaction_date'], axis=1)
+
+    labelEncoder = LabelEncoder()
+    for colName in list(dataframe.select_dtypes(include=['object']).columns):
+        dataframe[colName] = labelEncoder.fit_transform(dataframe[colName])
+
+    return dataframe, targetList
+
+
+@pytest.fixture
+def preparedPair(cleanFrame, tmp_path):
+    cleanFrame.to_csv(tmp_path.joinpath("baseline.csv"))
+    writeFrame(cleanFrame, tmp_path.joinpath("dfClean.parquet"))
+    prepObj = dataMLPrep("dfClean.parquet", "dfDummy.parquet", "dfTarget.parquet", path=tmp_path)
+    return prepObj, baselinePrep(tmp_path.joinpath("baseline.csv"))
+
+
+def test_targetMatchesBaselineLoop(cleanFrame, preparedPair):
+    prepObj, (baselineDf, baselineTarget) = preparedPair
+
+    expected = (cleanFrame["date_due"] <= cleanFrame["transaction_date"]).astype("int64").to_numpy()
+    assert np.array_equal(prepObj.targetDf["paid"].to_numpy(), expected)
+    assert np.array_equal(prepObj.targetDf["paid"].to_numpy(), np.asarray(baselineTarget))
+    assert 0 < expected.sum() < len(expected)
+
+
+def test_encodedColumnsMatchLabelEncoder(cleanFrame, preparedPair):
+    prepObj, (baselineDf, baselineTarget) = preparedPair
+
+    assert list(prepObj.dummyDf.columns) == list(baselineDf.columns)
+    for colName in ["transaction_description", "state", "reference", "next_due"]:
+        expected = pd.factorize(cleanFrame[colName], sort=True)[0]
+        assert np.array_equal(prepObj.dummyDf[colName].to_numpy(dtype="int64"), expected), colName
+        assert np.array_equal(prepObj.dummyDf[colName].to_numpy(dtype="int64"), baselineDf[colName].to_numpy()), \
+            colName
+
+
+def test_datetimeObjectColumnMatchesLabelEncoder():
+    series = pd.Series([datetime.datetime(2021, 3, 1), datetime.datetime(2020, 1, 5, 12),
+                        pd.Timestamp("2021-01-01"), datetime.datetime(2020, 1, 5, 12), datetime.datetime(2019, 7, 4)],
+                       dtype=object)
+
+    encoded = encoderRegistry().encode(pd.DataFrame({"closed_date": series}), ["closed_date"])["closed_date"]
+
+    assert np.array_equal(encoded.to_numpy(), pd.factorize(series, sort=True)[0])
+    assert np.array_equal(encoded.to_numpy(), LabelEncoder().fit_transform(series))
+
+
+def test_mixedTypeColumnFollowsFactorize():
+    series = pd.Series([3, "b", 1, "a", 2.5, "b", "10", 1], dtype=object)
+
+    encoded = encoderRegistry().encode(pd.DataFrame({"reference": series}), ["reference"])["reference"]
+
+    # The LabelEncoder of the baseline cannot order numbers and text, factorize puts the numbers first
+    with pytest.raises(TypeError):
+        LabelEncoder().fit_transform(series)
+    assert np.array_equal(encoded.to_numpy(), pd.factorize(series, sort=True)[0])
+    assert list(encoded) == [2, 5, 0, 4, 1, 5, 3, 0]
+
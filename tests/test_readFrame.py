@@ -0,0 +1,94 @@
+#  Copyright (C) 2022-2023 - Willem van der Schans - All Rights Reserved.
+#
+#  THE CONTENTS OF THIS PROJECT ARE PROPRIETARY AND CONFIDENTIAL.
+#  UNAUTHORIZED COPYING, TRANSFERRING OR REPRODUCTION OF THE CONTENTS OF THIS PROJECT, VIA ANY MEDIUM IS STRICTLY PROHIBITED.
+#  The receipt or possession of the source code and/or any parts thereof does not convey or imply any right to use them
+#  for any purpose other than the purpose for which they were provided to you.
+#
+#  The software is provided "AS IS", without warranty of any kind, express or implied, including but not limited to
+#  the warranties of merchantability, fitness for a particular purpose and non infringement.
+#  In no event shall the authors or copyright holders be liable for any claim, damages or other liability,
+#  whether in an action of contract, tort or otherwise, arising from, out of or in connection with the software
+#  or the use or other dealings in the software.
+#
+#  The above copyright notice and this permission notice shall be included in all copies or substantial portions of the Software.
+
+import os
+import time
+
+import pandas as pd
+import pytest
+
+from PaymentPredictorUtility.Functions.Func import appendFrame, partPaths, readFrame, schemaPath, writeFrame
+
+schema = {"amount": {"dtype": "float32"}, "state": {"dtype": "category", "categories": ["NV", "UT"]}}
+
+
+def frameMaker(values):
+    return pd.DataFrame({"amount": values, "state": ["NV", "UT", "NV"]})
+
+
+def test_csvIsArchivedNotRemoved(tmp_path):
+    writeFrame(frameMaker([1.5, 2.5, 3.5]), tmp_path.joinpath("dfClean.csv"), schema=schema)
+    csvBytes = tmp_path.joinpath("dfClean.csv").read_bytes()
+
+    dataframe = readFrame(tmp_path.joinpath("dfClean.csv"))
+
+    assert not tmp_path.joinpath("dfClean.csv").exists()
+    assert tmp_path.joinpath("dfClean.parquet").exists()
+    assert tmp_path.joinpath("Archive", "dfClean.csv").read_bytes() == csvBytes
+    assert dataframe["amount"].dtype == "float32"
+    assert isinstance(dataframe["state"].dtype, pd.CategoricalDtype)
+
+
+def test_newerCsvIsConvertedAgain(tmp_path):
+    writeFrame(frameMaker([1.5, 2.5, 3.5]), tmp_path.joinpath("dfClean.csv"), schema=schema)
+    readFrame(tmp_path.joinpath("dfClean.csv"))
+
+    writeFrame(frameMaker([4.5, 5.5, 6.5]), tmp_path.joinpath("dfClean.csv"))
+    parquetTime = tmp_path.joinpath("dfClean.parquet").stat().st_mtime
+    os.utime(tmp_path.joinpath("dfClean.csv"), (time.time(), parquetTime + 10))
+
+    assert readFrame(tmp_path.joinpath("dfClean.parquet"))["amount"].tolist() == [4.5, 5.5, 6.5]
+    assert len(os.listdir(tmp_path.joinpath("Archive"))) == 2
+
+
+def test_schemaAppliesToParquet(tmp_path):
+    writeFrame(frameMaker([1.5, 2.5, 3.5]), tmp_path.joinpath("dfClean.parquet"))
+    writeFrame(frameMaker([1.5, 2.5, 3.5]), tmp_path.joinpath("other.parquet"), schema=schema)
+    os.replace(schemaPath(tmp_path.joinpath("other.parquet")), schemaPath(tmp_path.joinpath("dfClean.parquet")))
+
+    for dataframe in [readFrame(tmp_path.joinpath("dfClean.parquet")),
+                      readFrame(tmp_path.joinpath("dfClean.parquet"), memoryMap=True)]:
+        assert dataframe["amount"].dtype == "float32"
+        assert dataframe["state"].dtype == pd.CategoricalDtype(["NV", "UT"])
+
+
+def test_appendedPartsWidenTypes(tmp_path):
+    writeFrame(frameMaker([1.5, 2.5, 3.5]), tmp_path.joinpath("dfClean1.parquet"), schema=schema)
+    newFrame = pd.DataFrame({"state": ["AZ", "NV"], "amount": [1e40, 4.5]})
+    appendFrame(newFrame, tmp_path.joinpath("dfClean2.parquet"), tmp_path.joinpath("dfClean1.parquet"))
+
+    assert not tmp_path.joinpath("dfClean1.parquet").exists()
+    assert not schemaPath(tmp_path.joinpath("dfClean1.parquet")).exists()
+    assert len(partPaths(tmp_path.joinpath("dfClean2.parquet"))) == 2
+
+    for dataframe in [readFrame(tmp_path.joinpath("dfClean2.parquet")),
+                      readFrame(tmp_path.joinpath("dfClean2.parquet"), memoryMap=True)]:
+        assert dataframe["amount"].tolist() == [1.5, 2.5, 3.5, 1e40, 4.5]
+        assert dataframe["amount"].dtype == "float64"
+        assert dataframe["state"].dtype == pd.CategoricalDtype(["NV", "UT", "AZ"])
+        assert dataframe.index.tolist() == list(range(5))
+
+
+def test_appendToCsvWithoutSchema(tmp_path):
+    writeFrame(frameMaker([1.5, 2.5, 3.5]), tmp_path.joinpath("dfClean1.csv"))
+    appendFrame(frameMaker([4.5, 5.5, 6.5]), tmp_path.joinpath("dfClean2.parquet"), tmp_path.joinpath("dfClean1.csv"))
+    appendFrame(frameMaker([7.5, 8.5, 9.5]), tmp_path.joinpath("dfClean3.parquet"),
+                tmp_path.joinpath("dfClean2.parquet"))
+
+    assert readFrame(tmp_path.joinpath("dfClean3.parquet"))["amount"].tolist() == [1.5, 2.5, 3.5, 4.5, 5.5, 6.5, 7.5,
+                                                                                   8.5, 9.5]
+    with pytest.raises(ValueError):
+        appendFrame(frameMaker([1.5, 2.5, 3.5]).drop(columns="state"), tmp_path.joinpath("dfClean4.parquet"),
+                    tmp_path.joinpath("dfClean3.parquet"))